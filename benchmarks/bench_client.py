@@ -0,0 +1,30 @@
+"""
+Benchmark for creating clients, like one client for each token in a multi-tenant worker.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_client
+"""
+
+import timeit
+
+from pyfacebook import FacebookApi, IGBusinessApi
+
+
+def main(number: int = 2000):
+    for client_class in (FacebookApi, IGBusinessApi):
+        seconds = timeit.timeit(
+            lambda: client_class(access_token="token"), number=number
+        )
+        # access one resource, like handling a request.
+        seconds_with_resource = timeit.timeit(
+            lambda: client_class(access_token="token").user, number=number
+        )
+        print(
+            f"{client_class.__name__:>15}: {seconds / number * 1e6:8.1f} us per client, "
+            f"{seconds_with_resource / number * 1e6:8.1f} us with one resource"
+        )
+
+
+if __name__ == "__main__":
+    main()
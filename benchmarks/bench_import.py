@@ -0,0 +1,39 @@
+"""
+Benchmark for import time, each statement runs in new interpreters.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_import
+"""
+
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import pyfacebook",
+    "from pyfacebook import GraphAPI",
+    "from pyfacebook import FacebookApi",
+    "from pyfacebook.models import Post",
+]
+
+
+def measure(statement: str, number: int) -> float:
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)"
+    )
+    return min(
+        float(subprocess.check_output([sys.executable, "-c", code]))
+        for _ in range(number)
+    )
+
+
+def main(number: int = 5):
+    for statement in STATEMENTS:
+        print(f"{statement:>40}: {measure(statement, number) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark for decoding models, compare ``from_dict``, the precompiled decoder and lazy mode.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_model_decode
+"""
+
+import json
+import timeit
+
+import pyfacebook.models as md
+from pyfacebook.models.decoder import decode
+
+
+def load_feed(count: int = 100) -> dict:
+    with open("testdata/facebook/models/post.json", "rb") as f:
+        post = json.loads(f.read().decode("utf-8"))
+    return {
+        "data": [dict(post, id=f"{post['id']}{i}") for i in range(count)],
+        "paging": {
+            "cursors": {"before": "before", "after": "after"},
+            "next": "https://graph.facebook.com/v21.0/19292868552/feed?after=after",
+        },
+    }
+
+
+def main(number: int = 20):
+    data = load_feed()
+    # generate decoders before timing.
+    decode(md.FeedResponse, data)
+
+    results = {
+        "from_dict": timeit.timeit(
+            lambda: md.FeedResponse.from_dict(data), number=number
+        ),
+        "decoder": timeit.timeit(lambda: decode(md.FeedResponse, data), number=number),
+        # lazy mode, only read few fields of posts.
+        "lazy": timeit.timeit(
+            lambda: [
+                (p.id, p.created_time, p.message)
+                for p in decode(md.FeedResponse, data, lazy=True).data
+            ],
+            number=number,
+        ),
+    }
+    for name, seconds in results.items():
+        print(f"{name:>10}: {seconds / number * 1000:8.2f} ms per feed of 100 posts")
+    for name in ("decoder", "lazy"):
+        speedup = results["from_dict"] / results[name]
+        print(f"{name:>10}: {speedup:8.1f}x faster than from_dict")
+
+
+if __name__ == "__main__":
+    main()
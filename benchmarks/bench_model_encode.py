@@ -0,0 +1,57 @@
+"""
+Benchmark for encoding models, compare ``to_dict`` of dataclasses_json with None values removed by deepcopy,
+and the encoder.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_model_encode
+"""
+
+import json
+import timeit
+from copy import deepcopy
+
+from dataclasses_json import DataClassJsonMixin
+
+import pyfacebook.models as md
+
+from benchmarks.bench_model_decode import load_feed
+
+
+def dict_minus_none_values(obj):
+    # previous implementation, copies the result for each level.
+    if obj is None:
+        return None
+    for key in list(obj.keys()):
+        value = obj[key]
+        if value is None:
+            obj.pop(key)
+        if isinstance(value, (list, tuple)):
+            obj[key] = type(value)([dict_minus_none_values(v) for v in value])
+        if isinstance(value, dict):
+            obj[key] = dict_minus_none_values(value)
+    return deepcopy(obj)
+
+
+def main(number: int = 10):
+    feed = md.FeedResponse.new_from_json_dict(load_feed())
+
+    results = {
+        "previous": timeit.timeit(
+            lambda: json.dumps(
+                dict_minus_none_values(DataClassJsonMixin.to_dict(feed))
+            ),
+            number=number,
+        ),
+        "to_json": timeit.timeit(lambda: feed.to_json(), number=number),
+        "to_bytes": timeit.timeit(lambda: feed.to_bytes(), number=number),
+    }
+    for name, seconds in results.items():
+        print(f"{name:>10}: {seconds / number * 1000:8.2f} ms per feed of 100 posts")
+    for name in ("to_json", "to_bytes"):
+        speedup = results["previous"] / results[name]
+        print(f"{name:>10}: {speedup:8.1f}x faster than previous")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark for memory of models, compare default and compact mode.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_model_memory
+"""
+
+import json
+import tracemalloc
+
+import pyfacebook.models as md
+
+SAMPLES = [
+    (md.Comment, "testdata/facebook/models/comment.json"),
+    (md.Post, "testdata/facebook/models/post.json"),
+    (md.Page, "testdata/facebook/models/page.json"),
+    (md.IgBusMedia, "testdata/instagram/models/ig_media.json"),
+    (md.CommentsResponse, "testdata/facebook/apidata/comments/comments_p1.json"),
+]
+
+
+def measure(model, data: dict, compact: bool, number: int) -> float:
+    # generate decoders before measure.
+    model.new_from_json_dict(data, compact=compact)
+    tracemalloc.start()
+    objs = [model.new_from_json_dict(data, compact=compact) for _ in range(number)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return size / number
+
+
+def main(number: int = 2000):
+    print(f"{'model':>20} {'default':>10} {'compact':>10} {'saved':>8}")
+    for model, filename in SAMPLES:
+        with open(filename, "rb") as f:
+            data = json.loads(f.read().decode("utf-8"))
+        default = measure(model, data, False, number)
+        compact = measure(model, data, True, number)
+        print(
+            f"{model.__name__:>20} {default:>9.0f}B {compact:>9.0f}B "
+            f"{1 - compact / default:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,56 @@
-from pyfacebook.models import *
-from pyfacebook.ratelimit import RateLimitHeader, RateLimit, PercentSecond
-from pyfacebook.exceptions import PyFacebookException, FacebookError, LibraryError
-from pyfacebook.api import (
-    GraphAPI,
-    BasicDisplayAPI,
-    ThreadsGraphAPI,
-    ServerSentEventAPI,
+from pyfacebook import models
+from pyfacebook.utils.lazy_import import attach
+
+# Attributes are imported at first access, importing pyfacebook only loads the modules used.
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        **{name: "pyfacebook.models" for name in models.__all__},
+        "RateLimitHeader": "pyfacebook.ratelimit",
+        "RateLimit": "pyfacebook.ratelimit",
+        "PercentSecond": "pyfacebook.ratelimit",
+        "RateLimitScheduler": "pyfacebook.ratelimit",
+        "RateLimitStore": "pyfacebook.ratelimit_store",
+        "MemoryRateLimitStore": "pyfacebook.ratelimit_store",
+        "FileRateLimitStore": "pyfacebook.ratelimit_store",
+        "RedisRateLimitStore": "pyfacebook.ratelimit_store",
+        "JsonCodec": "pyfacebook.codec",
+        "OrjsonCodec": "pyfacebook.codec",
+        "UjsonCodec": "pyfacebook.codec",
+        "SimdjsonCodec": "pyfacebook.codec",
+        "get_codec": "pyfacebook.codec",
+        "get_default_codec": "pyfacebook.codec",
+        "set_default_codec": "pyfacebook.codec",
+        "CacheStore": "pyfacebook.cache",
+        "MemoryCacheStore": "pyfacebook.cache",
+        "DiskCacheStore": "pyfacebook.cache",
+        "RetryPolicy": "pyfacebook.retry",
+        "RetryBudget": "pyfacebook.retry",
+        "RetryMetrics": "pyfacebook.retry",
+        "TokenPool": "pyfacebook.token_pool",
+        "TokenInfo": "pyfacebook.token_cache",
+        "TokenCache": "pyfacebook.token_cache",
+        "Field": "pyfacebook.utils.field_utils",
+        "compile_fields": "pyfacebook.utils.field_utils",
+        "PyFacebookException": "pyfacebook.exceptions",
+        "FacebookError": "pyfacebook.exceptions",
+        "LibraryError": "pyfacebook.exceptions",
+        "PartialResultError": "pyfacebook.exceptions",
+        "RateLimitError": "pyfacebook.exceptions",
+        "GraphAPI": "pyfacebook.api",
+        "BasicDisplayAPI": "pyfacebook.api",
+        "ThreadsGraphAPI": "pyfacebook.api",
+        "ServerSentEventAPI": "pyfacebook.api",
+        "AsyncGraphAPI": "pyfacebook.api",
+        "AsyncBasicDisplayAPI": "pyfacebook.api",
+        "AsyncThreadsGraphAPI": "pyfacebook.api",
+        "FacebookApi": "pyfacebook.api.facebook.client",
+        "AsyncFacebookApi": "pyfacebook.api.async_client",
+        "IGBusinessApi": "pyfacebook.api.instagram_business.client",
+        "AsyncIGBusinessApi": "pyfacebook.api.async_client",
+        "IGBasicDisplayApi": "pyfacebook.api.instagram_basic.client",
+        "AsyncIGBasicDisplayApi": "pyfacebook.api.async_client",
+    },
 )
-from pyfacebook.api.facebook.client import FacebookApi
-from pyfacebook.api.instagram_business.client import IGBusinessApi
-from pyfacebook.api.instagram_basic.client import IGBasicDisplayApi
 
 __version__ = "0.24.0"
@@ -1 +1,14 @@
-from .graph import GraphAPI, BasicDisplayAPI, ThreadsGraphAPI, ServerSentEventAPI
+from pyfacebook.utils.lazy_import import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "GraphAPI": ".graph",
+        "BasicDisplayAPI": ".graph",
+        "ThreadsGraphAPI": ".graph",
+        "ServerSentEventAPI": ".graph",
+        "AsyncGraphAPI": ".async_graph",
+        "AsyncBasicDisplayAPI": ".async_graph",
+        "AsyncThreadsGraphAPI": ".async_graph",
+    },
+)
@@ -0,0 +1,138 @@
+"""
+HTTP adapter for the session of graph api client, which counts the usage of the connection pools.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+from requests.adapters import (
+    DEFAULT_POOLBLOCK,
+    DEFAULT_POOLSIZE,
+    DEFAULT_RETRIES,
+    HTTPAdapter,
+)
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, ProxyManager
+
+
+@dataclass
+class PoolStats:
+    """
+    A class representing the statistics for connection pools.
+
+    requests: Count of connections got from pools.
+    created: Count of new connections.
+    reused: Count of kept alive connections used again.
+    waited: Count of requests waited for a free connection, only with blocking pool.
+    wait_seconds: Total seconds waited for free connections.
+    """
+
+    requests: int = 0
+    created: int = 0
+    reused: int = 0
+    waited: int = 0
+    wait_seconds: float = 0.0
+
+
+class PoolStatsCounter:
+    """
+    Thread safe counter for connection pools.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._created = 0
+        self._waited = 0
+        self._wait_seconds = 0.0
+
+    def on_get(self, waited: bool, seconds: float) -> None:
+        with self._lock:
+            self._requests += 1
+            if waited:
+                self._waited += 1
+                self._wait_seconds += seconds
+
+    def on_new(self) -> None:
+        with self._lock:
+            self._created += 1
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                requests=self._requests,
+                created=self._created,
+                reused=max(self._requests - self._created, 0),
+                waited=self._waited,
+                wait_seconds=self._wait_seconds,
+            )
+
+
+class _StatsPoolMixin:
+    counter: PoolStatsCounter = None
+
+    def _get_conn(self, timeout=None):
+        # Pool has no free connection, blocking pool will wait for one.
+        waited = bool(self.block and self.pool is not None and self.pool.empty())
+        start = time.monotonic()
+        conn = super()._get_conn(timeout=timeout)
+        self.counter.on_get(waited=waited, seconds=time.monotonic() - start)
+        return conn
+
+    def _new_conn(self):
+        self.counter.on_new()
+        return super()._new_conn()
+
+
+class PoolStatsAdapter(HTTPAdapter):
+    """
+    HTTP adapter which counts connections created, reused and waited for its pools.
+
+    :param pool_connections: The number of hosts to cache connection pools.
+    :param pool_maxsize: Max connections to keep alive for each host.
+    :param max_retries: Max retries for each connection.
+    :param pool_block: Whether to wait for a free connection when the pool is exhausted,
+        otherwise a new connection is created and discarded after used.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOLSIZE,
+        pool_maxsize: int = DEFAULT_POOLSIZE,
+        max_retries: int = DEFAULT_RETRIES,
+        pool_block: bool = DEFAULT_POOLBLOCK,
+    ):
+        self.counter = PoolStatsCounter()
+        self._pool_classes = {
+            "http": type(
+                "StatsHTTPConnectionPool",
+                (_StatsPoolMixin, HTTPConnectionPool),
+                {"counter": self.counter},
+            ),
+            "https": type(
+                "StatsHTTPSConnectionPool",
+                (_StatsPoolMixin, HTTPSConnectionPool),
+                {"counter": self.counter},
+            ),
+        }
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+
+    @property
+    def stats(self) -> PoolStats:
+        return self.counter.snapshot()
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        # socks proxy manager has its own pool classes.
+        if isinstance(manager, ProxyManager):
+            manager.pool_classes_by_scheme = self._pool_classes
+        return manager
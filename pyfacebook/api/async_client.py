@@ -0,0 +1,33 @@
+"""
+Async clients for facebook and instagram, kept apart from the sync clients,
+so importing the sync clients does not load httpx.
+"""
+
+from pyfacebook.api.async_graph import AsyncGraphAPI, AsyncBasicDisplayAPI
+from pyfacebook.api.facebook.client import FacebookApi
+from pyfacebook.api.instagram_basic.client import IGBasicDisplayApi
+from pyfacebook.api.instagram_business.client import IGBusinessApi
+
+
+class AsyncFacebookApi(AsyncGraphAPI):
+    """
+    Async api class for facebook graph api, resource methods are awaitable.
+    """
+
+    sync_class = FacebookApi
+
+
+class AsyncIGBusinessApi(AsyncGraphAPI):
+    """
+    Async api class for Instagram Business, resource methods are awaitable.
+    """
+
+    sync_class = IGBusinessApi
+
+
+class AsyncIGBasicDisplayApi(AsyncBasicDisplayAPI):
+    """
+    Async api class for Instagram basic display api, resource methods are awaitable.
+    """
+
+    sync_class = IGBasicDisplayApi
@@ -0,0 +1,712 @@
+"""
+This module contains the async clients for graph api, which send requests with httpx on asyncio.
+
+The async clients reuse the sync clients, resources and models. Basic methods like ``get_object``
+and ``get_objects`` send requests on the event loop directly. Other methods, like resources methods,
+run the sync method in a worker thread, while the HTTP requests, which the method sends, are executed
+on the event loop with a shared ``httpx.AsyncClient`` connection pool.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Type, Union
+
+import requests
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from pyfacebook.api.base_resource import BaseResource
+from pyfacebook.api.graph import GraphAPI, BasicDisplayAPI, ThreadsGraphAPI
+from pyfacebook.exceptions import LibraryError, PartialResultError, PyFacebookException
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+# The event loop for the worker thread which runs sync method for async client.
+_bridge_loop_var = contextvars.ContextVar("pyfacebook_bridge_loop", default=None)
+
+
+class AsyncTransportMixin:
+    """
+    Mixin for sync client, which sends requests by the async client when running in worker thread.
+    Waits for rate limit and retries are also done on the event loop.
+    """
+
+    _async_client: "AsyncGraphAPI" = None
+
+    @staticmethod
+    def _bridge_loop() -> Optional[asyncio.AbstractEventLoop]:
+        return _bridge_loop_var.get()
+
+    def _send_with_retry(
+        self,
+        verb: str,
+        url: str,
+        args: Optional[dict] = None,
+        post_args: Optional[dict] = None,
+        files: Optional[dict] = None,
+        **kwargs,
+    ) -> Response:
+        loop = self._bridge_loop()
+        if loop is None or self._async_client is None:
+            # Not called by async client, like initial with application only auth.
+            return super()._send_with_retry(
+                verb=verb,
+                url=url,
+                args=args,
+                post_args=post_args,
+                files=files,
+                **kwargs,
+            )
+        future = asyncio.run_coroutine_threadsafe(
+            self._async_client._send_with_retry(
+                verb=verb,
+                url=url,
+                args=args,
+                post_args=post_args,
+                files=files,
+                **kwargs,
+            ),
+            loop,
+        )
+        return future.result()
+
+
+_bridged_classes: Dict[type, type] = {}
+
+
+def _bridged_class(sync_class: Type[GraphAPI]) -> Type[GraphAPI]:
+    """
+    Get the subclass for sync client class, which sends requests by async client.
+
+    :param sync_class: Sync client class.
+    :return: Subclass for sync client class.
+    """
+    if sync_class not in _bridged_classes:
+        _bridged_classes[sync_class] = type(
+            sync_class.__name__, (AsyncTransportMixin, sync_class), {}
+        )
+    return _bridged_classes[sync_class]
+
+
+def _async_method(sync_method: Callable) -> Callable:
+    """
+    Build async method for client, which run the sync method with same name in worker thread.
+
+    :param sync_method: Sync method for the client.
+    :return: async method.
+    """
+    name = sync_method.__name__
+
+    @functools.wraps(sync_method)
+    async def method(self, *args, **kwargs):
+        return await self._run(getattr(self.api, name), *args, **kwargs)
+
+    return method
+
+
+def _async_iter_method(sync_method: Callable) -> Callable:
+    """
+    Build async generator method for client, which iterate the sync generator in worker thread.
+
+    :param sync_method: Sync generator method for the client.
+    :return: async generator method.
+    """
+    name = sync_method.__name__
+
+    @functools.wraps(sync_method)
+    def method(self, *args, **kwargs):
+        return self._iterate(getattr(self.api, name)(*args, **kwargs))
+
+    return method
+
+
+class AsyncResource:
+    """
+    Async wrapper for resource, every resource method is awaitable.
+    """
+
+    def __init__(self, resource: BaseResource, client: "AsyncGraphAPI"):
+        self._resource = resource
+        self._client = client
+
+    @property
+    def client(self) -> "AsyncGraphAPI":
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._resource, name)
+        if not callable(attr):
+            return attr
+
+        if name.startswith("iter_"):
+
+            @functools.wraps(attr)
+            def method(*args, **kwargs):
+                return self._client._iterate(attr(*args, **kwargs))
+
+        else:
+
+            @functools.wraps(attr)
+            async def method(*args, **kwargs):
+                return await self._client._run(attr, *args, **kwargs)
+
+        setattr(self, name, method)
+        return method
+
+
+class AsyncGraphAPI:
+    """
+    Async client for graph api. Accept the same parameters as ``GraphAPI``, and
+
+    :param max_workers: Max threads to run the methods not awaitable natively, like resources methods,
+        at same time. Default is ``max_connections``. Also used as max concurrent chunks for get_objects,
+        default is the same as ``GraphAPI``.
+    :param max_connections: Max connections for the connection pool.
+    :param max_keepalive_connections: Max keep alive connections for the connection pool.
+    :param http_client: A ``httpx.AsyncClient`` to share connection pool with other clients.
+
+    Usage:
+
+        async with AsyncGraphAPI(access_token="token") as api:
+            await api.get_object(object_id="20531316728")
+    """
+
+    sync_class: Type[GraphAPI] = GraphAPI
+    # threads when the connection pool has no limit.
+    DEFAULT_MAX_WORKERS = 100
+
+    def __init__(
+        self,
+        *args,
+        max_workers: Optional[int] = None,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        http_client: Optional["httpx.AsyncClient"] = None,
+        **kwargs,
+    ):
+        if httpx is None:
+            raise LibraryError(
+                {
+                    "message": "Async client need httpx. "
+                    "You can install it by `pip install python-facebook-api[async]`"
+                }
+            )
+
+        self.api = _bridged_class(self.sync_class)(
+            *args, max_workers=max_workers, **kwargs
+        )
+        self.api._async_client = self
+
+        self._own_http_client = http_client is None
+        if http_client is None:
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            )
+            http_client = httpx.AsyncClient(
+                timeout=self.api.timeout,
+                limits=limits,
+                mounts=self._build_proxy_mounts(self.api.proxies, limits),
+            )
+        self.http_client = http_client
+        # Methods not awaitable natively, like resources methods, each holds a thread while running,
+        # so at most max_workers of them run at same time.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max_connections or self.DEFAULT_MAX_WORKERS,
+            thread_name_prefix="pyfacebook",
+        )
+        self._resources: Dict[str, AsyncResource] = {}
+
+    @staticmethod
+    def _build_proxy_mounts(
+        proxies: Optional[dict], limits: "httpx.Limits"
+    ) -> Optional[dict]:
+        """
+        Convert requests proxies to httpx mounts.
+
+        :param proxies: proxies like {"https": "http://10.10.1.10:1080"}
+        :param limits: Limits for the connection pool.
+        :return: mounts for httpx
+        """
+        if not proxies:
+            return None
+        return {
+            f"{scheme}://": httpx.AsyncHTTPTransport(proxy=proxy, limits=limits)
+            for scheme, proxy in proxies.items()
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when the attribute not found, delegate to the sync client.
+        if name in ("api", "_resources"):
+            raise AttributeError(name)
+        attr = getattr(self.api, name)
+        if isinstance(attr, BaseResource):
+            if name not in self._resources:
+                self._resources[name] = AsyncResource(resource=attr, client=self)
+            return self._resources[name]
+        return attr
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self.api.access_token
+
+    @access_token.setter
+    def access_token(self, value: Optional[str]):
+        self.api.access_token = value
+
+    async def __aenter__(self) -> "AsyncGraphAPI":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close the connection pool and worker threads.
+        """
+        if self._own_http_client:
+            await self.http_client.aclose()
+        self._executor.shutdown(wait=False)
+
+    def _call_in_worker(
+        self, loop: asyncio.AbstractEventLoop, func: Callable, args, kwargs
+    ) -> Any:
+        token = _bridge_loop_var.set(loop)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _bridge_loop_var.reset(token)
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run the sync function in worker thread, requests in it will be sent by the event loop.
+
+        :param func: Sync function.
+        :return: Result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._call_in_worker, loop, func, args, kwargs
+        )
+
+    async def _run_blocking(
+        self, blocking: bool, func: Callable, *args, **kwargs
+    ) -> Any:
+        """
+        Run the function which may block on I/O of stores, like the shared rate limit store and the cache,
+        in the default executor of the loop. Not in the executor for methods, whose threads may all wait for
+        the loop to send requests.
+
+        :param blocking: Whether the function may block, else run it on the loop directly.
+        :param func: Sync function.
+        :return: Result of the function.
+        """
+        if not blocking:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(contextvars.copy_context().run, func, *args, **kwargs),
+        )
+
+    async def _iterate(self, iterator: Iterator) -> AsyncIterator:
+        """
+        Iterate the sync generator, each item is produced in worker thread.
+
+        :param iterator: Sync generator.
+        :return: Async generator.
+        """
+        sentinel = object()
+        try:
+            while True:
+                item = await self._run(next, iterator, sentinel)
+                if item is sentinel:
+                    break
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    async def _request(
+        self,
+        url: str,
+        args: Optional[dict] = None,
+        post_args: Optional[dict] = None,
+        files: Optional[dict] = None,
+        verb: str = "GET",
+        auth_need: bool = True,
+        **kwargs,
+    ) -> Response:
+        """
+        Same as ``GraphAPI._request``, but send the request on the event loop.
+
+        :param url: Resource url for Graph.
+        :param args: Query parameters.
+        :param post_args: Form parameters.
+        :param files:  Dictionary of ``'filename': file-like-objects``
+            for multipart encoding upload.
+        :param verb: HTTP method
+        :param auth_need: Whether request need access token.
+        :param kwargs: Additional parameters.
+        :return: Response
+        """
+        url, args, post_args, kwargs, cached = await self._run_blocking(
+            self.api.cache is not None and verb == "GET",
+            self.api._prepare_request,
+            url=url,
+            args=args,
+            post_args=post_args,
+            verb=verb,
+            auth_need=auth_need,
+            **kwargs,
+        )
+        response = await self._send_with_retry(
+            verb=verb,
+            url=url,
+            args=args,
+            post_args=post_args,
+            files=files,
+            **kwargs,
+        )
+        return await self._run_blocking(
+            cached is not None,
+            self.api._cache_response,
+            response=response,
+            cached=cached,
+        )
+
+    async def _send_with_retry(
+        self,
+        verb: str,
+        url: str,
+        args: Optional[dict] = None,
+        post_args: Optional[dict] = None,
+        files: Optional[dict] = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Send request when the rate limit allows, and retry for transient errors by the retry policy.
+        Same as ``GraphAPI._send_with_retry``, but waits with ``asyncio.sleep``,
+        and the shared rate limit store is accessed in the default executor.
+
+        :param verb: HTTP method
+        :param url: Full url for the request.
+        :param args: Query parameters.
+        :param post_args: Form parameters.
+        :param files: Dictionary of ``'filename': file-like-objects``
+            for multipart encoding upload.
+        :param kwargs: Additional parameters.
+        :return: Response
+        :raises requests.ConnectionError: Connection failed, same as ``GraphAPI``.
+        :raises requests.Timeout: Request timed out, same as ``GraphAPI``.
+        """
+        api = self.api
+        shared = api.rate_limit.shared
+        object_key = api._get_object_key(url=url)
+        if api.retry_policy is not None:
+            api.retry_policy.start()
+        retries = 0
+        while True:
+            if api.scheduler is not None:
+                await self._run_blocking(
+                    shared, api._refresh_rate_limit, object_key=object_key
+                )
+                await api.scheduler.acquire_async(key=object_key)
+            response, error, business_ids = None, None, []
+            try:
+                response = await self._send(
+                    verb=verb,
+                    url=url,
+                    args=args,
+                    post_args=post_args,
+                    files=files,
+                    **kwargs,
+                )
+            except (requests.ConnectionError, requests.Timeout) as ex:
+                if api.retry_policy is None:
+                    raise
+                error = ex
+            else:
+                business_ids = await self._run_blocking(
+                    shared,
+                    api._update_rate_limit,
+                    response=response,
+                    verb=verb,
+                    args=args,
+                    post_args=post_args,
+                    object_key=object_key,
+                )
+                if api.retry_policy is None:
+                    return response
+                error = api.retry_policy.get_error(response, json_codec=api.json_codec)
+
+            wait = api._get_retry_wait(
+                verb=verb,
+                retries=retries,
+                error=error,
+                business_ids=business_ids,
+                object_key=object_key,
+            )
+            if wait is None:
+                if response is None:
+                    raise error
+                return response
+            retries += 1
+            await asyncio.sleep(wait)
+
+    async def _send(
+        self,
+        verb: str,
+        url: str,
+        args: Optional[dict] = None,
+        post_args: Optional[dict] = None,
+        files: Optional[dict] = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Send request by httpx, and convert the response to requests response.
+
+        :param verb: HTTP method
+        :param url: Full url for the request.
+        :param args: Query parameters.
+        :param post_args: Form parameters.
+        :param files: Dictionary of ``'filename': file-like-objects``
+            for multipart encoding upload.
+        :param kwargs: Additional parameters.
+        :return: Response
+        :raises requests.ConnectionError: Connection failed, same as ``GraphAPI``.
+        :raises requests.Timeout: Request timed out, same as ``GraphAPI``.
+        """
+        # requests will ignore parameters with None value.
+        if args:
+            args = {k: v for k, v in args.items() if v is not None}
+        if post_args:
+            post_args = {k: v for k, v in post_args.items() if v is not None}
+
+        try:
+            resp = await self.http_client.request(
+                method=verb,
+                url=url,
+                params=args,
+                data=post_args,
+                files=files,
+                headers=kwargs.get("headers"),
+            )
+        except httpx.TimeoutException as ex:
+            # same errors as requests, may be retried by the retry policy.
+            raise requests.Timeout(*ex.args) from ex
+        except httpx.TransportError as ex:
+            raise requests.ConnectionError(*ex.args) from ex
+        except httpx.HTTPError as ex:
+            raise LibraryError({"message": ex.args})
+
+        response = Response()
+        response.status_code = resp.status_code
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response._content = resp.content
+        response.encoding = resp.encoding
+        response.reason = resp.reason_phrase
+        response.url = str(resp.url)
+        return response
+
+    async def get(self, path, args):
+        """
+        Send GET request.
+
+        :param path: path for resource.
+        :param args: args for request.
+        :return: Response data
+        """
+        resp = await self._request(url=f"{self.api.version}/{path}", args=args)
+        return self.api._parse_response(resp)
+
+    async def get_object(self, object_id: str, fields: str = "", **kwargs) -> dict:
+        """
+        Get object information by object id.
+
+        :param object_id: ID for object(user,page,event...).
+        :param fields: Comma-separated string for object fields which you want.
+        :param kwargs: Additional parameters for object.
+        :return: Response data
+        """
+        args = {"fields": fields}
+        if kwargs:
+            args.update(kwargs)
+
+        resp = await self._request(url=f"{self.api.version}/{object_id}", args=args)
+        return self.api._parse_response(resp)
+
+    async def get_objects(
+        self,
+        ids: Union[str, list, tuple],
+        fields: str = "",
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> dict:
+        """
+        Get objects information by multi object ids.
+        Graph only accept 50 ids for each request, so ids will be split into chunks,
+        and chunks are requested concurrently.
+
+        :param ids: Comma-separated string for object ids which you want.
+            You can also pass this with an id list, tuple.
+        :param fields: Comma-separated string for object fields which you want.
+        :param max_workers: Max chunks to request at same time. Default is the client's max_workers.
+        :param kwargs: Additional parameters for object.
+        :return: Response data
+        :raises PartialResultError: Some chunks failed, the data for successful chunks is in its data.
+        """
+        chunks = self.api._chunk_ids(ids)
+        if len(chunks) <= 1:
+            return await self._get_objects_chunk(
+                ids=",".join(chunks), fields=fields, **kwargs
+            )
+
+        if max_workers is None:
+            max_workers = self.api.max_workers
+        semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+        async def get_chunk(chunk: str) -> dict:
+            async with semaphore:
+                return await self._get_objects_chunk(ids=chunk, fields=fields, **kwargs)
+
+        results = await asyncio.gather(
+            *[get_chunk(chunk) for chunk in chunks], return_exceptions=True
+        )
+        # merge with the ids order.
+        data, errors = {}, {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, PyFacebookException):
+                errors[chunk] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                data.update(result)
+        if errors:
+            raise PartialResultError(data=data, errors=errors)
+        return data
+
+    async def _get_objects_chunk(self, ids: str, fields: str = "", **kwargs) -> dict:
+        """
+        :param ids: Comma-separated string for object ids, no more than 50.
+        :param fields: Comma-separated string for object fields which you want.
+        :param kwargs: Additional parameters for object.
+        :return: Response data
+        """
+        args = {"ids": ids, "fields": fields}
+        if kwargs:
+            args.update(kwargs)
+
+        resp = await self._request(url=f"{self.api.version}", args=args)
+        return self.api._parse_response(resp)
+
+    async def get_connection(self, object_id: str, connection: str, **kwargs) -> dict:
+        """
+        Get connections objects for object by id. Like get page medias by page id.
+
+        :param object_id: ID for object(user,page,event...).
+        :param connection: Connection name for object, Like(posts,comments...).
+        :param kwargs: Additional parameters for different connections.
+        :return: Response data
+        """
+        resp = await self._request(
+            url=f"{self.api.version}/{object_id}/{connection}", args=kwargs
+        )
+        return self.api._parse_response(resp)
+
+    async def post_object(
+        self,
+        object_id: str,
+        connection: Optional[str] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        **kwargs,
+    ) -> dict:
+        """
+        Create or update data for a facebook object, or it's edge.
+
+        :param object_id: ID for the facebook object(page,user.. and so on).
+        :param connection: Edge for the object.
+        :param params: Parameters for url path.
+        :param data: Parameters for Form data.
+        :param files: Dictionary of ``'filename': file-like-objects``
+            for multipart encoding upload.
+        :param kwargs: Additional parameters.
+        :return: Response data.
+        """
+        path = f"{self.api.version}/{object_id}"
+        if connection:
+            path += f"/{connection}"
+
+        resp = await self._request(
+            url=path,
+            args=params,
+            post_args=data,
+            files=files,
+            verb="POST",
+            **kwargs,
+        )
+        return self.api._parse_response(resp)
+
+    async def delete_object(
+        self, object_id: str, connection: Optional[str] = None, **kwargs
+    ) -> dict:
+        """
+        Delete the facebook object, or it's edge
+
+        :param object_id: ID for the facebook object(page,user..and so on)
+        :param connection: Edge for the object.
+        :param kwargs: Additional parameters.
+        :return: Delete status.
+        """
+        path = f"{self.api.version}/{object_id}"
+        if connection:
+            path += f"/{connection}"
+
+        resp = await self._request(url=path, verb="DELETE", **kwargs)
+        return self.api._parse_response(resp)
+
+    # Methods below run in worker threads, and send requests on the event loop.
+    get_full_connections = _async_method(GraphAPI.get_full_connections)
+    drain_nested_connections = _async_method(GraphAPI.drain_nested_connections)
+    iter_connection_pages = _async_iter_method(GraphAPI.iter_connection_pages)
+    iter_connections = _async_iter_method(GraphAPI.iter_connections)
+    discovery_user_media = _async_method(GraphAPI.discovery_user_media)
+    execute_batch = _async_method(GraphAPI.execute_batch)
+    exchange_user_access_token = _async_method(GraphAPI.exchange_user_access_token)
+    exchange_page_access_token = _async_method(GraphAPI.exchange_page_access_token)
+    exchange_long_lived_user_access_token = _async_method(
+        GraphAPI.exchange_long_lived_user_access_token
+    )
+    exchange_long_lived_page_access_token = _async_method(
+        GraphAPI.exchange_long_lived_page_access_token
+    )
+    get_app_token = _async_method(GraphAPI.get_app_token)
+    debug_token = _async_method(GraphAPI.debug_token)
+
+
+class AsyncBasicDisplayAPI(AsyncGraphAPI):
+    """
+    Async client for instagram basic display api.
+    """
+
+    sync_class = BasicDisplayAPI
+
+    refresh_access_token = _async_method(BasicDisplayAPI.refresh_access_token)
+
+
+class AsyncThreadsGraphAPI(AsyncGraphAPI):
+    """
+    Async client for threads graph api.
+    """
+
+    sync_class = ThreadsGraphAPI
+
+    refresh_access_token = _async_method(ThreadsGraphAPI.refresh_access_token)
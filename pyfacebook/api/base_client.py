@@ -2,25 +2,67 @@
 Base client for API.
 """
 
-import inspect
+import importlib
+import threading
+from typing import Optional, Type, Union
 
 from pyfacebook import GraphAPI, BasicDisplayAPI
 from pyfacebook.api.base_resource import BaseResource
 
 
-def _is_resource_cls(obj):
-    return isinstance(obj, BaseResource)
+class LazyResource:
+    """
+    Descriptor for resource of client, the resource is created at first access for each client,
+    and saved on the client, then the descriptor is not used for the client any more.
+
+    Usage:
+
+        class FacebookApi(BaseApi):
+            page = LazyResource("pyfacebook.api.facebook.resource.FacebookPage")
+    """
+
+    def __init__(
+        self, resource: Union[str, Type[BaseResource]], name: Optional[str] = None
+    ):
+        """
+        :param resource: Resource class, or the import path for the class, which is imported at first access.
+        :param name: Attribute name for the resource, set by the owner class by default.
+        """
+        self._resource = resource
+        self.name = name
+        self._lock = threading.Lock()
+
+    def __set_name__(self, owner, name):
+        if self.name is None:
+            self.name = name
+
+    @property
+    def resource_class(self) -> Type[BaseResource]:
+        """
+        :return: Resource class, imported once for the class.
+        """
+        if isinstance(self._resource, str):
+            with self._lock:
+                if isinstance(self._resource, str):
+                    module, _, name = self._resource.rpartition(".")
+                    self._resource = getattr(importlib.import_module(module), name)
+        return self._resource
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        resource = self.resource_class(obj)
+        # another thread may create the resource too, keep the first one.
+        return obj.__dict__.setdefault(self.name, resource)
 
 
 class BaseApi(GraphAPI):
-    def __new__(cls, *args, **kwargs):
-        self = super().__new__(cls)
-        resources = inspect.getmembers(cls, _is_resource_cls)
-        for name, resource in resources:
-            resource_cls = type(resource)
-            resource = resource_cls(self)
-            setattr(self, name, resource)
-        return self
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # resources defined by instances, like `page = FacebookPage()`, are also created for each client lazily.
+        for name, value in list(vars(cls).items()):
+            if isinstance(value, BaseResource):
+                setattr(cls, name, LazyResource(type(value), name=name))
 
 
 class BaseBasicDisplayApi(BasicDisplayAPI, BaseApi):
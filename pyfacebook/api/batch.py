@@ -0,0 +1,266 @@
+"""
+Helper to collect requests and send them with one Graph API batch request.
+
+Refer: https://developers.facebook.com/docs/graph-api/batch-requests
+"""
+
+from typing import Any, List, Optional, Union
+from urllib.parse import urlencode
+
+from pyfacebook.exceptions import LibraryError, PyFacebookException
+
+# Keep JSONPath expressions like `{result=name:$.data.*.id}` readable for graph.
+BATCH_SAFE_CHARS = ",{}:$*=[]"
+
+
+def build_relative_url(path: str, args: Optional[dict] = None) -> str:
+    """
+    Build relative url for batch operation.
+
+    :param path: Path for the resource, include version.
+    :param args: Query parameters, None values will be dropped.
+    :return: relative url
+    """
+    args = {k: v for k, v in (args or {}).items() if v is not None}
+    if not args:
+        return path
+    return f"{path}?{urlencode(args, safe=BATCH_SAFE_CHARS)}"
+
+
+class GraphBatch:
+    """
+    Collect operations and send them to graph with one request.
+
+    Usage:
+
+        with api.batch() as batch:
+            posts = batch.get_connection("20531316728", "posts", name="posts")
+            batch.get_objects(ids="{result=posts:$.data.*.id}", fields="id,message")
+        batch.results[posts]
+    """
+
+    def __init__(self, client, include_headers: bool = True):
+        """
+        :param client: The GraphAPI instance to send batch request.
+        :param include_headers: Whether response include headers for each operation.
+        """
+        self.client = client
+        self.include_headers = include_headers
+        self.operations: List[dict] = []
+        self.results: Optional[List[Union[dict, PyFacebookException, None]]] = None
+
+    def __len__(self):
+        return len(self.operations)
+
+    def __enter__(self) -> "GraphBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    def add(
+        self,
+        method: str,
+        relative_url: str,
+        body: Optional[Union[dict, str]] = None,
+        name: Optional[str] = None,
+        depends_on: Optional[str] = None,
+        omit_response_on_success: Optional[bool] = None,
+    ) -> int:
+        """
+        Add an operation for the batch.
+
+        :param method: HTTP method, GET/POST/DELETE.
+        :param relative_url: Url relative to graph host, include version.
+        :param body: Form parameters for POST operation.
+        :param name: Name for the operation, other operations can refer its result by JSONPath.
+        :param depends_on: Name of operation which this operation depends on.
+        :param omit_response_on_success: Whether omit the response for named operation.
+        :return: Index for the operation result in results.
+        """
+        if len(self.operations) >= self.client.MAX_BATCH_SIZE:
+            raise LibraryError(
+                {
+                    "message": f"Batch request can only include {self.client.MAX_BATCH_SIZE} operations"
+                }
+            )
+
+        operation: dict = {"method": method.upper(), "relative_url": relative_url}
+        if body:
+            operation["body"] = body if isinstance(body, str) else urlencode(body)
+        if name is not None:
+            operation["name"] = name
+        if depends_on is not None:
+            operation["depends_on"] = depends_on
+        if omit_response_on_success is not None:
+            operation["omit_response_on_success"] = omit_response_on_success
+
+        self.operations.append(operation)
+        return len(self.operations) - 1
+
+    def get(self, path: str, args: Optional[dict] = None, **kwargs) -> int:
+        """
+        Add GET operation for path.
+
+        :param path: path for resource.
+        :param args: args for request.
+        :param kwargs: Additional parameters for operation, name, depends_on and so on.
+        :return: Index for the operation result.
+        """
+        return self.add(
+            method="GET",
+            relative_url=build_relative_url(f"{self.client.version}/{path}", args),
+            **kwargs,
+        )
+
+    def get_object(
+        self,
+        object_id: str,
+        fields: str = "",
+        name: Optional[str] = None,
+        depends_on: Optional[str] = None,
+        **kwargs,
+    ) -> int:
+        """
+        Add operation to get object information by object id.
+
+        :param object_id: ID for object(user,page,event...).
+        :param fields: Comma-separated string for object fields which you want.
+        :param name: Name for the operation.
+        :param depends_on: Name of operation which this operation depends on.
+        :param kwargs: Additional parameters for object.
+        :return: Index for the operation result.
+        """
+        return self.get(
+            path=object_id,
+            args={"fields": fields or None, **kwargs},
+            name=name,
+            depends_on=depends_on,
+        )
+
+    def get_objects(
+        self,
+        ids: str,
+        fields: str = "",
+        name: Optional[str] = None,
+        depends_on: Optional[str] = None,
+        **kwargs,
+    ) -> int:
+        """
+        Add operation to get objects information by multi object ids.
+
+        :param ids: Comma-separated string for object ids, or a JSONPath expression.
+        :param fields: Comma-separated string for object fields which you want.
+        :param name: Name for the operation.
+        :param depends_on: Name of operation which this operation depends on.
+        :param kwargs: Additional parameters for object.
+        :return: Index for the operation result.
+        """
+        return self.get(
+            path="",
+            args={"ids": ids, "fields": fields or None, **kwargs},
+            name=name,
+            depends_on=depends_on,
+        )
+
+    def get_connection(
+        self,
+        object_id: str,
+        connection: str,
+        name: Optional[str] = None,
+        depends_on: Optional[str] = None,
+        **kwargs,
+    ) -> int:
+        """
+        Add operation to get connections objects for object by id.
+
+        :param object_id: ID for object(user,page,event...).
+        :param connection: Connection name for object, Like(posts,comments...).
+        :param name: Name for the operation.
+        :param depends_on: Name of operation which this operation depends on.
+        :param kwargs: Additional parameters for different connections.
+        :return: Index for the operation result.
+        """
+        return self.get(
+            path=f"{object_id}/{connection}",
+            args=kwargs,
+            name=name,
+            depends_on=depends_on,
+        )
+
+    def post_object(
+        self,
+        object_id: str,
+        connection: Optional[str] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        **kwargs,
+    ) -> int:
+        """
+        Add operation to create or update data for a facebook object, or it's edge.
+
+        :param object_id: ID for the facebook object(page,user.. and so on).
+        :param connection: Edge for the object.
+        :param params: Parameters for url path.
+        :param data: Parameters for Form data.
+        :param kwargs: Additional parameters for operation, name, depends_on and so on.
+        :return: Index for the operation result.
+        """
+        path = f"{self.client.version}/{object_id}"
+        if connection:
+            path += f"/{connection}"
+        return self.add(
+            method="POST",
+            relative_url=build_relative_url(path, params),
+            body=data,
+            **kwargs,
+        )
+
+    def delete_object(
+        self,
+        object_id: str,
+        connection: Optional[str] = None,
+        **kwargs,
+    ) -> int:
+        """
+        Add operation to delete the facebook object, or it's edge
+
+        :param object_id: ID for the facebook object(page,user..and so on)
+        :param connection: Edge for the object.
+        :param kwargs: Additional parameters for operation, name, depends_on and so on.
+        :return: Index for the operation result.
+        """
+        path = f"{self.client.version}/{object_id}"
+        if connection:
+            path += f"/{connection}"
+        return self.add(method="DELETE", relative_url=path, **kwargs)
+
+    def execute(self) -> List[Union[dict, PyFacebookException, None]]:
+        """
+        Send all operations with one batch request.
+
+        :return: Results for each operation, same order as added.
+        """
+        if not self.operations:
+            self.results = []
+        else:
+            self.results = self.client.execute_batch(
+                operations=self.operations,
+                include_headers=self.include_headers,
+            )
+        return self.results
+
+    def result(self, index: int) -> Any:
+        """
+        Get result for operation, raise the error if operation failed.
+
+        :param index: Index returned when added the operation.
+        :return: Response data for the operation.
+        """
+        if self.results is None:
+            raise LibraryError({"message": "Batch has not been executed"})
+        res = self.results[index]
+        if isinstance(res, PyFacebookException):
+            raise res
+        return res
@@ -2,8 +2,7 @@
 Client for facebook graph api
 """
 
-from pyfacebook.api.base_client import BaseApi
-from pyfacebook.api.facebook import resource as rs
+from pyfacebook.api.base_client import BaseApi, LazyResource
 
 
 class FacebookApi(BaseApi):
@@ -11,17 +10,17 @@ class FacebookApi(BaseApi):
     Api class for facebook
     """
 
-    application = rs.FacebookApplication()
-    business = rs.FacebookBusiness()
-    user = rs.FacebookUser()
-    page = rs.FacebookPage()
-    post = rs.FacebookPost()
-    group = rs.FacebookGroup()
-    event = rs.FacebookEvent()
-    photo = rs.FacebookPhoto()
-    album = rs.FacebookAlbum()
-    video = rs.FacebookVideo()
-    live_video = rs.FacebookLiveVideo()
-    comment = rs.FacebookComment()
-    conversation = rs.FacebookConversation()
-    message = rs.FacebookMessage()
+    application = LazyResource("pyfacebook.api.facebook.resource.FacebookApplication")
+    business = LazyResource("pyfacebook.api.facebook.resource.FacebookBusiness")
+    user = LazyResource("pyfacebook.api.facebook.resource.FacebookUser")
+    page = LazyResource("pyfacebook.api.facebook.resource.FacebookPage")
+    post = LazyResource("pyfacebook.api.facebook.resource.FacebookPost")
+    group = LazyResource("pyfacebook.api.facebook.resource.FacebookGroup")
+    event = LazyResource("pyfacebook.api.facebook.resource.FacebookEvent")
+    photo = LazyResource("pyfacebook.api.facebook.resource.FacebookPhoto")
+    album = LazyResource("pyfacebook.api.facebook.resource.FacebookAlbum")
+    video = LazyResource("pyfacebook.api.facebook.resource.FacebookVideo")
+    live_video = LazyResource("pyfacebook.api.facebook.resource.FacebookLiveVideo")
+    comment = LazyResource("pyfacebook.api.facebook.resource.FacebookComment")
+    conversation = LazyResource("pyfacebook.api.facebook.resource.FacebookConversation")
+    message = LazyResource("pyfacebook.api.facebook.resource.FacebookMessage")
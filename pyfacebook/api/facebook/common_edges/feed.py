@@ -2,10 +2,10 @@
 Feed edge for resource.
 """
 
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 import pyfacebook.utils.constant as const
-from pyfacebook.models.post import FeedResponse
+from pyfacebook.models.post import FeedResponse, Post
 from pyfacebook.utils.params_utils import enf_comma_separated
 
 
@@ -101,3 +101,94 @@ class FeedEdge:
             return_json=return_json,
             **kwargs,
         )
+
+    def _iter_feed(
+        self,
+        object_id: str,
+        fields: Optional[Union[str, list, dict]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        count: Optional[int] = None,
+        limit: Optional[int] = 10,
+        source: Optional[str] = "feed",
+        prefetch: int = 0,
+        return_json: bool = False,
+        **kwargs,
+    ) -> Iterator[Union[Post, dict]]:
+        """
+        Iterate feed of a Facebook object, yield each post as the response page arrives.
+
+        :param object_id: ID for object to get feeds.
+        :param fields: Comma-separated id string for data fields which you want.
+            You can also pass this with an id list, tuple.
+        :param since: A Unix timestamp or strtotime data value that points to the start of data.
+        :param until: A Unix timestamp or strtotime data value that points to the end of data.
+        :param count: The total count for you to get data. Default is None will get all data.
+        :param limit: Each request retrieve objects count.
+            It should no more than 100. Default is None will use api default limit.
+        :param source: Resource type. Valid values maybe feed/posts/tagged/published_posts depend on object type.
+        :param prefetch: Max count of pages to request ahead in a background thread.
+            Default is 0 will not prefetch.
+        :param return_json: Set to false will yield dataclass for post.
+            Or yield json data. Default is false.
+        :param kwargs: Additional parameters for different object.
+        :return: Generator for post
+        """
+
+        if fields is None:
+            fields = const.POST_PUBLIC_FIELDS + const.POST_CONNECTIONS_SUMMERY_FIELDS
+
+        for item in self.client.iter_connections(
+            object_id=object_id,
+            connection=source,
+            count=count,
+            limit=limit,
+            prefetch=prefetch,
+            fields=enf_comma_separated(field="fields", value=fields),
+            since=since,
+            until=until,
+            **kwargs,
+        ):
+            yield item if return_json else Post.new_from_json_dict(item)
+
+    def iter_feed(
+        self,
+        object_id: str,
+        fields: Optional[Union[str, list, dict]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        count: Optional[int] = None,
+        limit: Optional[int] = 10,
+        prefetch: int = 0,
+        return_json: bool = False,
+        **kwargs,
+    ) -> Iterator[Union[Post, dict]]:
+        """
+        Iterate feed of a Facebook Page including posts and links published by this Page, or by visitors to this Page.
+
+        :param object_id: ID for page to get feeds.
+        :param fields: Comma-separated id string for data fields which you want.
+            You can also pass this with an id list, tuple.
+        :param since: A Unix timestamp or strtotime data value that points to the start of data.
+        :param until: A Unix timestamp or strtotime data value that points to the end of data.
+        :param count: The total count for you to get data. Default is None will get all data.
+        :param limit: Each request retrieve objects count.
+            It should no more than 100. Default is None will use api default limit.
+        :param prefetch: Max count of pages to request ahead in a background thread.
+            Default is 0 will not prefetch.
+        :param return_json: Set to false will yield dataclass for post.
+            Or yield json data. Default is false.
+        :param kwargs: Additional parameters for different object.
+        :return: Generator for post
+        """
+        return self._iter_feed(
+            object_id=object_id,
+            fields=fields,
+            since=since,
+            until=until,
+            count=count,
+            limit=limit,
+            prefetch=prefetch,
+            return_json=return_json,
+            **kwargs,
+        )
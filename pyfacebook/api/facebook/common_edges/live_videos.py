@@ -2,10 +2,10 @@
 Live videos edge for resource
 """
 
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 import pyfacebook.utils.constant as const
-from pyfacebook.models.live_video import LiveVideosResponse
+from pyfacebook.models.live_video import LiveVideo, LiveVideosResponse
 from pyfacebook.utils.params_utils import enf_comma_separated
 
 
@@ -57,3 +57,50 @@ class LiveVideosEdge:
             return data
         else:
             return LiveVideosResponse.new_from_json_dict(data)
+
+    def iter_live_videos(
+        self,
+        object_id: str,
+        fields: Optional[Union[str, list, dict]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        count: Optional[int] = None,
+        limit: Optional[int] = 10,
+        prefetch: int = 0,
+        return_json: bool = False,
+        **kwargs,
+    ) -> Iterator[Union[LiveVideo, dict]]:
+        """
+        Iterate live videos on a facebook object, yield each one as the response page arrives.
+
+        :param object_id: ID for the facebook object.
+        :param fields: Comma-separated id string for data fields which you want.
+            You can also pass this with an id list, tuple.
+        :param since: A Unix timestamp or strtotime data value that points to the start of data.
+        :param until: A Unix timestamp or strtotime data value that points to the end of data.
+        :param count: The total count for you to get data. Default is None will get all data.
+        :param limit: Each request retrieve objects count.
+            It should no more than 100. Default is None will use api default limit.
+        :param prefetch: Max count of pages to request ahead in a background thread.
+            Default is 0 will not prefetch.
+        :param return_json: Set to false will yield dataclass for LiveVideo.
+            Or yield json data. Default is false.
+        :param kwargs: Additional parameters for different object.
+        :return: Generator for LiveVideo
+        """
+
+        if fields is None:
+            fields = const.LIVE_VIDEO_PUBLIC_FIELDS
+
+        for item in self.client.iter_connections(
+            object_id=object_id,
+            connection="live_videos",
+            count=count,
+            limit=limit,
+            prefetch=prefetch,
+            fields=enf_comma_separated(field="fields", value=fields),
+            since=since,
+            until=until,
+            **kwargs,
+        ):
+            yield item if return_json else LiveVideo.new_from_json_dict(item)
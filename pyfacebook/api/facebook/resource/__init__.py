@@ -2,17 +2,24 @@
 Expose for outside
 """
 
-from pyfacebook.api.facebook.resource.application import FacebookApplication
-from pyfacebook.api.facebook.resource.business import FacebookBusiness
-from pyfacebook.api.facebook.resource.user import FacebookUser
-from pyfacebook.api.facebook.resource.page import FacebookPage
-from pyfacebook.api.facebook.resource.group import FacebookGroup
-from pyfacebook.api.facebook.resource.event import FacebookEvent
-from pyfacebook.api.facebook.resource.post import FacebookPost
-from pyfacebook.api.facebook.resource.photo import FacebookPhoto
-from pyfacebook.api.facebook.resource.album import FacebookAlbum
-from pyfacebook.api.facebook.resource.video import FacebookVideo
-from pyfacebook.api.facebook.resource.live_video import FacebookLiveVideo
-from pyfacebook.api.facebook.resource.comment import FacebookComment
-from pyfacebook.api.facebook.resource.conversation import FacebookConversation
-from pyfacebook.api.facebook.resource.message import FacebookMessage
+from pyfacebook.utils.lazy_import import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "FacebookApplication": ".application",
+        "FacebookBusiness": ".business",
+        "FacebookUser": ".user",
+        "FacebookPage": ".page",
+        "FacebookGroup": ".group",
+        "FacebookEvent": ".event",
+        "FacebookPost": ".post",
+        "FacebookPhoto": ".photo",
+        "FacebookAlbum": ".album",
+        "FacebookVideo": ".video",
+        "FacebookLiveVideo": ".live_video",
+        "FacebookComment": ".comment",
+        "FacebookConversation": ".conversation",
+        "FacebookMessage": ".message",
+    },
+)
@@ -2,7 +2,7 @@
 Apis for page.
 """
 
-from typing import Dict, Optional, Union
+from typing import Dict, Iterator, Optional, Union
 
 import pyfacebook.utils.constant as const
 from pyfacebook.api.base_resource import BaseResource
@@ -17,7 +17,7 @@ from pyfacebook.api.facebook.common_edges import (
 )
 from pyfacebook.exceptions import LibraryError
 from pyfacebook.models.page import Page, SearchPagesResponse
-from pyfacebook.models.post import FeedResponse
+from pyfacebook.models.post import FeedResponse, Post
 from pyfacebook.utils.params_utils import enf_comma_separated
 
 
@@ -138,6 +138,46 @@ class FacebookPage(
             return_json=return_json,
         )
 
+    def iter_posts(
+        self,
+        object_id: str,
+        fields: Optional[Union[str, list, dict]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        count: Optional[int] = None,
+        limit: Optional[int] = 10,
+        prefetch: int = 0,
+        return_json: bool = False,
+    ) -> Iterator[Union[Post, dict]]:
+        """
+        Iterate the page's own posts, yield each post as the response page arrives.
+
+        :param object_id: ID for page to get posts.
+        :param fields: Comma-separated id string for data fields which you want.
+            You can also pass this with an id list, tuple.
+        :param since: A Unix timestamp or strtotime data value that points to the start of data.
+        :param until: A Unix timestamp or strtotime data value that points to the end of data.
+        :param count: The total count for you to get data. Default is None will get all data.
+        :param limit: Each request retrieve objects count.
+            It should no more than 100. Default is None will use api default limit.
+        :param prefetch: Max count of pages to request ahead in a background thread.
+            Default is 0 will not prefetch.
+        :param return_json: Set to false will yield dataclass for post.
+            Or yield json data. Default is false.
+        :return: Generator for post
+        """
+        return self._iter_feed(
+            object_id=object_id,
+            fields=fields,
+            since=since,
+            until=until,
+            count=count,
+            limit=limit,
+            prefetch=prefetch,
+            source="posts",
+            return_json=return_json,
+        )
+
     def get_published_posts(
         self,
         object_id: str,
@@ -2,21 +2,44 @@
 This module contains the GraphAPI class, its subclass BasicDisplayAPI and the class ServerSentEventAPI.
 """
 
+import contextvars
 import hashlib
 import hmac
 import logging
 import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from urllib.parse import parse_qsl, urlparse
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from warnings import warn
 
 import requests
 from requests import Response
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from requests_oauthlib.oauth2_session import OAuth2Session
 from requests_oauthlib.compliance_fixes.facebook import facebook_compliance_fix
 
-from pyfacebook import RateLimit, PercentSecond, FacebookError, LibraryError
+from pyfacebook import (
+    RateLimit,
+    RateLimitScheduler,
+    RateLimitStore,
+    PercentSecond,
+    PyFacebookException,
+    FacebookError,
+    LibraryError,
+    PartialResultError,
+)
+from pyfacebook.api.adapter import PoolStats, PoolStatsAdapter
+from pyfacebook.api.batch import GraphBatch
+from pyfacebook.cache import CacheEntry, CacheStore, build_cache_key
+from pyfacebook.codec import JsonCodec, get_codec
+from pyfacebook.retry import RetryPolicy
+from pyfacebook.token_pool import TokenPool
+from pyfacebook.utils.field_utils import Field
+from pyfacebook.utils.iter_utils import prefetch as prefetch_iterator
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +59,10 @@ class GraphAPI:
     DEFAULT_REDIRECT_URI = "https://localhost/"
     DEFAULT_SCOPE = ["public_profile"]
     STATE = "PyFacebook"
+    MAX_BATCH_SIZE = 50
+    MAX_IDS_PER_REQUEST = 50
+    DEFAULT_MAX_WORKERS = 4
+    SECRET_PROOF_CACHE_SIZE = 1024
 
     def __init__(
         self,
@@ -57,20 +84,63 @@ class GraphAPI:
         redirect_uri: Optional[str] = None,
         scope: Optional[List[str]] = None,
         state: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        adapter: Optional[HTTPAdapter] = None,
+        thread_safe: bool = False,
+        scheduler: Optional[RateLimitScheduler] = None,
+        rate_limit_store: Optional[RateLimitStore] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[CacheStore] = None,
+        json_codec: Union[str, JsonCodec, None] = None,
+        token_pool: Optional[TokenPool] = None,
     ):
         self.app_id = app_id
         self.app_secret = app_secret
         self.access_token = access_token
-
-        self.session = requests.Session()
-        self.__timeout = timeout
+        # Tokens for objects, requests for objects in the pool use their own tokens.
+        self.token_pool = token_pool
+        # (access_token, app_secret) -> secret_proof, for recent tokens like tokens in the pool.
+        self._secret_proof_cache: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+        self._secret_proof_lock = threading.Lock()
+
+        # Connection pools for the session, share the kept alive connections with threads.
+        if adapter is None:
+            adapter = PoolStatsAdapter(
+                pool_connections=pool_connections or DEFAULT_POOLSIZE,
+                pool_maxsize=pool_maxsize or DEFAULT_POOLSIZE,
+                pool_block=pool_block,
+            )
+        self.adapter = adapter
+        # With thread safe mode, each thread will use its own session.
+        # Worker threads of the client, like chunks for get_objects, always use their own sessions.
+        self.thread_safe = thread_safe
+        self._local = threading.local()
+        self._owner_thread = threading.get_ident()
+        self.session = self._new_session()
+        self.timeout = timeout
         self.proxies = proxies
         self.sleep_on_rate_limit = sleep_on_rate_limit
         self.sleep_seconds_mapping = self._build_sleep_seconds_resource(
             sleep_seconds_mapping=sleep_seconds_mapping
         )
-        self.rate_limit = RateLimit()
+        # Codec to decode responses and usage headers.
+        self.json_codec = get_codec(json_codec)
+        self.rate_limit = RateLimit(store=rate_limit_store, json_codec=self.json_codec)
+        # Scheduler to check rate limit before send request.
+        if scheduler is None and sleep_on_rate_limit:
+            scheduler = RateLimitScheduler()
+        self.scheduler = scheduler
+        # Policy to retry requests failed with transient errors, default not retry.
+        self.retry_policy = retry_policy
+        # Store for responses with ETag, GET requests will be sent with If-None-Match.
+        self.cache = cache
         self.instagram_business_id = instagram_business_id
+        self.max_workers = (
+            max_workers if max_workers is not None else self.DEFAULT_MAX_WORKERS
+        )
 
         # Override url for send request
         self.base_url = base_url if base_url else self.GRAPH_URL
@@ -111,9 +181,80 @@ class GraphAPI:
             self.access_token = data["access_token"]
         elif oauth_flow and all([self.app_id, self.app_secret]):
             pass
+        elif token_pool is not None:
+            pass
         else:
             raise LibraryError({"message": "Need access token"})
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        Session to send requests.
+        With thread safe mode, the thread created the client uses the main session, other
+        threads get their own sessions, which copy headers from the main session.
+        Worker threads started by the client get their own sessions even without thread safe mode.
+        All sessions share the connection pools of the adapter.
+
+        :return: Session for current thread.
+        """
+        local = self._local
+        if threading.get_ident() == self._owner_thread:
+            return self._session
+        if not self.thread_safe and not getattr(local, "worker", False):
+            return self._session
+        session = getattr(local, "session", None)
+        if session is None:
+            session = self._new_session()
+            session.headers.update(self._session.headers)
+            local.session = session
+        return session
+
+    @session.setter
+    def session(self, session: requests.Session):
+        self._session = session
+
+    def _new_session(self) -> requests.Session:
+        """
+        :return: New session with the adapter mounted.
+        """
+        session = requests.Session()
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        return session
+
+    def _run_in_worker(self, func: Callable, *args, **kwargs):
+        """
+        Run the function in a worker thread of the client, requests use the session of the thread.
+        Submit it with a copy of the caller's context, so it runs with the context of caller,
+        like the event loop for async client.
+
+        :param func: Function to run.
+        :return: Result of the function.
+        """
+        self._local.worker = True
+        return func(*args, **kwargs)
+
+    def _iter_in_worker(self, iterator: Iterator[dict]) -> Iterator[dict]:
+        """
+        Same as ``_run_in_worker``, but for the iterator.
+
+        :param iterator: Iterator to produce in a worker thread of the client, like prefetch thread.
+        :return: Generator for the items.
+        """
+        self._local.worker = True
+        yield from iterator
+
+    @property
+    def pool_stats(self) -> Optional[PoolStats]:
+        """
+        Statistics for the connection pools, None if the custom adapter not counts.
+
+        :return: Connections created, reused and waited.
+        """
+        if isinstance(self.adapter, PoolStatsAdapter):
+            return self.adapter.stats
+        return None
+
     @staticmethod
     def _build_sleep_seconds_resource(
         sleep_seconds_mapping: Optional[Dict[int, int]],
@@ -152,23 +293,72 @@ class GraphAPI:
             digestmod=hashlib.sha256,
         ).hexdigest()
 
-    def _append_token(self, args: Optional[dict]) -> dict:
+    def _get_secret_proof(self, access_token: str) -> Optional[str]:
+        """
+        Get secret proof for the access token, cached for recent tokens and app secrets.
+
+        :param access_token: Access token
+        :return: secret proof
+        """
+        key = (access_token, self.app_secret)
+        cache = self._secret_proof_cache
+        with self._secret_proof_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        secret_proof = self._generate_secret_proof(access_token, self.app_secret)
+        with self._secret_proof_lock:
+            cache[key] = secret_proof
+            while len(cache) > self.SECRET_PROOF_CACHE_SIZE:
+                cache.popitem(last=False)
+        return secret_proof
+
+    def _append_token(self, args: Optional[dict], url: Optional[str] = None) -> dict:
         """
         Append access token and secret_proof parameter of parameters.
-        :param args: Original parameters.
+        :param args: Original parameters, will not be changed.
+        :param url: Resource url for Graph, to pick token for the object from the token pool.
         :return: New parameters.
         """
-        args = {} if args is None else args
+        args = {} if args is None else dict(args)
         if "access_token" not in args:
-            args["access_token"] = self.access_token
+            args["access_token"] = self._get_access_token(url=url, args=args)
         # Begin with v5.0, appsecret_proof parameter can improve requests secure.
         # Refer: https://developers.facebook.com/docs/graph-api/securing-requests/
-        secret_proof = self._generate_secret_proof(
-            args["access_token"], self.app_secret
-        )
-        args["appsecret_proof"] = secret_proof
+        args["appsecret_proof"] = self._get_secret_proof(args["access_token"])
         return args
 
+    def _get_access_token(
+        self, url: Optional[str] = None, args: Optional[dict] = None
+    ) -> Optional[str]:
+        """
+        :param url: Resource url for Graph.
+        :param args: Query parameters, objects in ``ids`` should have a common token in the pool.
+        :return: Token for the objects of the request in the token pool, or the access token of client.
+        :raises LibraryError: No token in the pool for the objects, and the client has no access token.
+        """
+        if self.token_pool is None or url is None:
+            return self.access_token
+        ids = (args or {}).get("ids")
+        if ids:
+            object_ids = [
+                self._get_object_key(url=oid) for oid in str(ids).split(",") if oid
+            ]
+        else:
+            object_ids = [self._get_object_key(url=url)]
+        object_ids = [oid for oid in object_ids if oid is not None]
+        token = self.token_pool.get_token(object_ids=object_ids)
+        if token is not None:
+            return token
+        if self.access_token is None:
+            raise LibraryError(
+                {
+                    "message": f"No token in pool for objects {','.join(object_ids)}, "
+                    f"and the client has no access token"
+                }
+            )
+        return self.access_token
+
     def _request(
         self,
         url: str,
@@ -190,20 +380,304 @@ class GraphAPI:
         :param kwargs: Additional parameters.
         :return:
         """
+        url, args, post_args, kwargs, cached = self._prepare_request(
+            url=url,
+            args=args,
+            post_args=post_args,
+            verb=verb,
+            auth_need=auth_need,
+            **kwargs,
+        )
+        response = self._send_with_retry(
+            verb=verb,
+            url=url,
+            args=args,
+            post_args=post_args,
+            files=files,
+            **kwargs,
+        )
+        return self._cache_response(response=response, cached=cached)
+
+    def _prepare_request(
+        self,
+        url: str,
+        args: Optional[dict] = None,
+        post_args: Optional[dict] = None,
+        verb: str = "GET",
+        auth_need: bool = True,
+        **kwargs,
+    ) -> Tuple[str, Optional[dict], Optional[dict], dict, Optional[tuple]]:
+        """
+        Add token and conditional headers for the request, shared by the sync and async clients.
+
+        :param url: Resource url for Graph.
+        :param args: Query parameters.
+        :param post_args: Form parameters.
+        :param verb: HTTP method
+        :param auth_need: Whether request need access token.
+        :param kwargs: Additional parameters.
+        :return: Full url, args, post_args, kwargs and (cache_key, entry) for GET requests with cache.
+        """
         if auth_need:
             if verb == "GET" or verb == "DELETE":
-                args = self._append_token(args=args)
+                args = self._append_token(args=args, url=url)
             elif verb == "POST":
-                post_args = self._append_token(args=post_args)
+                post_args = self._append_token(args=post_args, url=url)
 
         if not url.startswith("http"):
             url = self.base_url + url
 
+        # Conditional request for the cached response.
+        cached = None
+        if self.cache is not None and verb == "GET":
+            cache_key = build_cache_key(url=url, args=args)
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                kwargs["headers"] = {
+                    **(kwargs.get("headers") or {}),
+                    "If-None-Match": entry.etag,
+                }
+            cached = (cache_key, entry)
+        return url, args, post_args, kwargs, cached
+
+    def _cache_response(
+        self, response: Response, cached: Optional[tuple] = None
+    ) -> Response:
+        """
+        :param response: Response for the request.
+        :param cached: (cache_key, entry) from ``_prepare_request``.
+        :return: The cached response if not modified, or the response.
+        """
+        if cached is None:
+            return response
+        cache_key, entry = cached
+        if response.status_code == 304 and entry is not None:
+            return entry.to_response(url=response.url)
+        entry = CacheEntry.from_response(response)
+        if entry is not None:
+            self.cache.set(cache_key, entry)
+        return response
+
+    def _send_with_retry(
+        self,
+        verb: str,
+        url: str,
+        args: Optional[dict] = None,
+        post_args: Optional[dict] = None,
+        files: Optional[dict] = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Send request when the rate limit allows, and retry for transient errors by the retry policy.
+
+        :param verb: HTTP method
+        :param url: Full url for the request.
+        :param args: Query parameters.
+        :param post_args: Form parameters.
+        :param files: Dictionary of ``'filename': file-like-objects``
+            for multipart encoding upload.
+        :param kwargs: Additional parameters.
+        :return: Response
+        """
+        # Requests for an object will wait for its business use case rate limit.
+        object_key = self._get_object_key(url=url)
+        if self.retry_policy is not None:
+            self.retry_policy.start()
+        retries = 0
+        while True:
+            if self.scheduler is not None:
+                self._refresh_rate_limit(object_key=object_key)
+                self.scheduler.acquire(key=object_key)
+            response, error, business_ids = None, None, []
+            try:
+                response = self._send_request(
+                    verb=verb,
+                    url=url,
+                    args=args,
+                    post_args=post_args,
+                    files=files,
+                    **kwargs,
+                )
+            except (requests.ConnectionError, requests.Timeout) as ex:
+                if self.retry_policy is None:
+                    raise
+                error = ex
+            else:
+                business_ids = self._update_rate_limit(
+                    response=response,
+                    verb=verb,
+                    args=args,
+                    post_args=post_args,
+                    object_key=object_key,
+                )
+                if self.retry_policy is None:
+                    return response
+                error = self.retry_policy.get_error(
+                    response, json_codec=self.json_codec
+                )
+
+            wait = self._get_retry_wait(
+                verb=verb,
+                retries=retries,
+                error=error,
+                business_ids=business_ids,
+                object_key=object_key,
+            )
+            if wait is None:
+                if response is None:
+                    raise error
+                return response
+            retries += 1
+            time.sleep(wait)
+
+    def _update_rate_limit(
+        self,
+        response: Response,
+        verb: str,
+        args: Optional[dict] = None,
+        post_args: Optional[dict] = None,
+        object_key: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Update rate limit usage by the response headers, and delay next requests.
+
+        :param response: Response for the request.
+        :param verb: HTTP method
+        :param args: Query parameters.
+        :param post_args: Form parameters.
+        :param object_key: Object id for the request.
+        :return: Business object ids which have usage in the headers.
+        """
+        headers = response.headers
+        business_ids = self.rate_limit.set_limit(headers)
+        if self.token_pool is not None:
+            params = (post_args if verb == "POST" else args) or {}
+            self.token_pool.set_limit(params.get("access_token"), headers)
+        self._delay_requests(business_ids=business_ids, object_key=object_key)
+        return business_ids
+
+    def _get_retry_wait(
+        self,
+        verb: str,
+        retries: int,
+        error: Optional[Exception],
+        business_ids: List[str],
+        object_key: Optional[str] = None,
+    ) -> Optional[float]:
+        """
+        :param verb: HTTP method
+        :param retries: Count of retries before.
+        :param error: Error for the request.
+        :param business_ids: Business object ids which have usage in the response.
+        :param object_key: Object id for the request.
+        :return: Seconds to wait before retry, None if not retry.
+        """
+        if error is None:
+            return None
+        # not retry before regain access for throttled objects.
+        object_ids = business_ids + ([object_key] if object_key else [])
+        regain_seconds = max(
+            (self.rate_limit.get_regain_seconds(oid) for oid in object_ids),
+            default=0,
+        )
+        return self.retry_policy.get_wait(
+            method=verb,
+            retries=retries,
+            error=error,
+            regain_seconds=regain_seconds,
+        )
+
+    @staticmethod
+    def _get_object_key(url: str) -> Optional[str]:
+        """
+        Get the object id which the request is for, used as key to schedule requests.
+
+        :param url: Resource url for Graph, like v19.0/{page_id}/feed or full url.
+        :return: Object id, the id of page for post id like {page_id}_{post_id}.
+        """
+        segments = [seg for seg in urlparse(url).path.split("/") if seg]
+        if segments and re.match(r"^v\d+\.\d+$", segments[0]):
+            segments = segments[1:]
+        if not segments:
+            return None
+        return segments[0].split("_", 1)[0]
+
+    def _refresh_rate_limit(self, object_key: Optional[str] = None) -> None:
+        """
+        Load the usage updated by other workers from the shared store, and delay requests by the merged usage.
+        Delays are only set again when the usage is changed, the usage not changed has been waited for.
+
+        :param object_key: Object id for the request to send.
+        """
+        if not self.rate_limit.refresh_if_stale():
+            return
+        business = self.rate_limit.resources["business"]
+        keys = (
+            object_key,
+            self.scheduler.get_owner(object_key) if object_key else None,
+        )
+        business_ids = [key for key in keys if key is not None and key in business]
+        self._delay_requests(business_ids=business_ids, object_key=object_key)
+
+    def _delay_requests(
+        self, business_ids: List[str], object_key: Optional[str] = None
+    ) -> None:
+        """
+        Delay next requests by the rate limit usage, app usage delays all requests,
+        and business use case usage only delays requests for the business object.
+
+        :param business_ids: Business object ids which usage updated.
+        :param object_key: Object id for the request which got the usage.
+        """
+        if self.scheduler is None:
+            return
+        # next request will wait, not this one.
+        self.scheduler.delay(
+            self.rate_limit.get_sleep_seconds(sleep_data=self.sleep_seconds_mapping)
+        )
+        owner, owner_seconds = None, -1
+        for business_id in business_ids:
+            seconds = self.rate_limit.get_sleep_seconds(
+                sleep_data=self.sleep_seconds_mapping, object_id=business_id
+            )
+            self.scheduler.delay(seconds, key=business_id)
+            if seconds > owner_seconds:
+                owner, owner_seconds = business_id, seconds
+        # object like instagram media is limited by its owner's usage,
+        # later requests for the object wait for the owner's delays.
+        if (
+            object_key is not None
+            and owner is not None
+            and object_key not in business_ids
+        ):
+            self.scheduler.set_owner(object_key, owner)
+
+    def _send_request(
+        self,
+        verb: str,
+        url: str,
+        args: Optional[dict] = None,
+        post_args: Optional[dict] = None,
+        files: Optional[dict] = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Send the prepared request by the session.
+
+        :param verb: HTTP method
+        :param url: Full url for the request.
+        :param args: Query parameters.
+        :param post_args: Form parameters.
+        :param files: Dictionary of ``'filename': file-like-objects``
+            for multipart encoding upload.
+        :param kwargs: Additional parameters.
+        :return: Response
+        """
         try:
             response = self.session.request(
                 method=verb,
                 url=url,
-                timeout=self.__timeout,
+                timeout=self.timeout,
                 params=args,
                 data=post_args,
                 files=files,
@@ -212,15 +686,6 @@ class GraphAPI:
             )
         except requests.HTTPError as ex:
             raise LibraryError({"message": ex.args})
-
-        # check headers
-        headers = response.headers
-        self.rate_limit.set_limit(headers)
-        if self.sleep_on_rate_limit:
-            sleep_seconds = self.rate_limit.get_sleep_seconds(
-                sleep_data=self.sleep_seconds_mapping
-            )
-            time.sleep(sleep_seconds)
         return response
 
     def _parse_response(self, response: Response) -> dict:
@@ -230,7 +695,8 @@ class GraphAPI:
         """
         content_type = response.headers["Content-Type"]
         if "json" in content_type:
-            data = response.json()
+            # decode bytes directly, not need to decode to text first.
+            data = self.json_codec.loads(response.content)
             self._check_graph_error(data=data)
             return data
         elif "image/" in content_type:
@@ -286,11 +752,72 @@ class GraphAPI:
         data = self._parse_response(resp)
         return data
 
-    def get_objects(self, ids: str, fields: str = "", **kwargs) -> dict:
+    def get_objects(
+        self,
+        ids: Union[str, list, tuple],
+        fields: str = "",
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> dict:
         """
         Get objects information by multi object ids.
+        Graph only accept 50 ids for each request, so ids will be split into chunks,
+        and chunks are requested concurrently.
 
         :param ids: Comma-separated string for object ids which you want.
+            You can also pass this with an id list, tuple.
+        :param fields: Comma-separated string for object fields which you want.
+        :param max_workers: Max chunks to request at same time. Default is the client's max_workers.
+        :param kwargs: Additional parameters for object.
+        :return: Response data
+        :raises PartialResultError: Some chunks failed, the data for successful chunks is in its data.
+        """
+        chunks = self._chunk_ids(ids)
+        if len(chunks) <= 1:
+            return self._get_objects_chunk(
+                ids=",".join(chunks), fields=fields, **kwargs
+            )
+
+        if max_workers is None:
+            max_workers = self.max_workers
+        data, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._run_in_worker,
+                    self._get_objects_chunk,
+                    ids=chunk,
+                    fields=fields,
+                    **kwargs,
+                )
+                for chunk in chunks
+            ]
+            # merge with the ids order.
+            for chunk, future in zip(chunks, futures):
+                try:
+                    data.update(future.result())
+                except PyFacebookException as ex:
+                    errors[chunk] = ex
+        if errors:
+            raise PartialResultError(data=data, errors=errors)
+        return data
+
+    def _chunk_ids(self, ids: Union[str, list, tuple]) -> List[str]:
+        """
+        :param ids: Comma-separated string or list for object ids.
+        :return: Comma-separated ids for each request, no more than 50 ids.
+        """
+        if isinstance(ids, str):
+            ids = ids.split(",")
+        return [
+            ",".join(ids[i : i + self.MAX_IDS_PER_REQUEST])
+            for i in range(0, len(ids), self.MAX_IDS_PER_REQUEST)
+        ]
+
+    def _get_objects_chunk(self, ids: str, fields: str = "", **kwargs) -> dict:
+        """
+        :param ids: Comma-separated string for object ids, no more than 50.
         :param fields: Comma-separated string for object fields which you want.
         :param kwargs: Additional parameters for object.
         :return: Response data
@@ -323,27 +850,42 @@ class GraphAPI:
         data = self._parse_response(resp)
         return data
 
-    def get_full_connections(
+    def iter_connection_pages(
         self,
         object_id: str,
         connection: str,
-        count: Optional[int] = 10,
         limit: Optional[int] = None,
+        prefetch: int = 0,
         **kwargs,
-    ) -> dict:
+    ) -> Iterator[dict]:
         """
-        Get connections objects for object by id. Like get page medias by page id.
+        Iterate response pages for object's connection, auto paging inside.
+        Next page is requested only when the previous page has been consumed,
+        unless set prefetch to request next pages in background while the caller processes current page.
 
         :param object_id: ID for object(user,page,event...).
         :param connection: Connection name for object, Like(posts,comments...).
-        :param count: The count will retrieve objects. Default is None will get all data.
         :param limit: Each request retrieve objects count.
             For most connections should no more than 100. Default is None will use api default limit.
+        :param prefetch: Max count of pages to request ahead in a background thread.
+            Default is 0 will not prefetch.
         :param kwargs: Additional parameters for different connections.
-        :return: Combined Response data
+        :return: Generator for response data of each page.
         """
+        pages = self._iter_connection_pages(
+            object_id=object_id, connection=connection, limit=limit, **kwargs
+        )
+        if prefetch > 0:
+            return prefetch_iterator(self._iter_in_worker(pages), depth=prefetch)
+        return pages
 
-        data, data_set, paging = {}, [], None
+    def _iter_connection_pages(
+        self,
+        object_id: str,
+        connection: str,
+        limit: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[dict]:
         while True:
             # sometimes may not return limit.
             if limit is not None:
@@ -354,11 +896,7 @@ class GraphAPI:
                 connection=connection,
                 **kwargs,
             )
-            # Append this request data
-            data_set.extend(data["data"])
-            if count is not None and len(data_set) > count:
-                data_set = data_set[:count]
-                break
+            yield data
 
             # check next pagination
             paging, _next = data.get("paging"), None
@@ -369,10 +907,230 @@ class GraphAPI:
             # parse next url args as new args
             kwargs = dict(parse_qsl(urlparse(_next).query))
 
+    def iter_connections(
+        self,
+        object_id: str,
+        connection: str,
+        count: Optional[int] = None,
+        limit: Optional[int] = None,
+        yield_pages: bool = False,
+        prefetch: int = 0,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """
+        Iterate objects for object's connection as each response arrives, auto paging inside.
+        Stop the iteration early will not request the rest pages.
+
+        :param object_id: ID for object(user,page,event...).
+        :param connection: Connection name for object, Like(posts,comments...).
+        :param count: The count will retrieve objects. Default is None will get all data.
+        :param limit: Each request retrieve objects count.
+            For most connections should no more than 100. Default is None will use api default limit.
+        :param yield_pages: Set to True will yield response data for each page instead of each object.
+        :param prefetch: Max count of pages to request ahead in a background thread.
+            Default is 0 will not prefetch.
+        :param kwargs: Additional parameters for different connections.
+        :return: Generator for objects data, or response data for pages.
+        """
+        total = 0
+        pages = self.iter_connection_pages(
+            object_id=object_id,
+            connection=connection,
+            limit=limit,
+            prefetch=prefetch,
+            **kwargs,
+        )
+        try:
+            for data in pages:
+                items = data.get("data", [])
+                if count is not None and total + len(items) >= count:
+                    items = items[: count - total]
+                    data["data"] = items
+                    count_reached = True
+                else:
+                    count_reached = False
+                total += len(items)
+
+                if yield_pages:
+                    yield data
+                else:
+                    yield from items
+                if count_reached:
+                    break
+        finally:
+            # stop the prefetch when consumer stopped early.
+            pages.close()
+
+    def get_full_connections(
+        self,
+        object_id: str,
+        connection: str,
+        count: Optional[int] = 10,
+        limit: Optional[int] = None,
+        drain_nested: bool = False,
+        **kwargs,
+    ) -> dict:
+        """
+        Get connections objects for object by id. Like get page medias by page id.
+
+        :param object_id: ID for object(user,page,event...).
+        :param connection: Connection name for object, Like(posts,comments...).
+        :param count: The count will retrieve objects. Default is None will get all data.
+        :param limit: Each request retrieve objects count.
+            For most connections should no more than 100. Default is None will use api default limit.
+        :param drain_nested: Set to True will get all pages for the nested connections of objects
+            by field expansion, like comments for posts with ``fields=id,comments{id,message}``.
+        :param kwargs: Additional parameters for different connections.
+        :return: Combined Response data
+        """
+
+        data, data_set = {}, []
+        for data in self.iter_connection_pages(
+            object_id=object_id, connection=connection, limit=limit, **kwargs
+        ):
+            # Append this request data
+            data_set.extend(data["data"])
+            if count is not None and len(data_set) > count:
+                data_set = data_set[:count]
+                break
+
         # Replace the data list in data.
         data["data"] = data_set
+        if drain_nested:
+            self.drain_nested_connections(data=data)
         return data
 
+    def drain_nested_connections(
+        self,
+        data: dict,
+        count: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> dict:
+        """
+        Get the rest pages for nested connections in response data by field expansion, and merge them
+        into the connections. Like ``fields=posts.limit(100){comments.limit(100)}`` only returns the first page
+        of comments for each post.
+
+        Connections are requested concurrently, the pages of a connection are requested one by one.
+        Nested connections in the new pages are also drained.
+
+        :param data: Response data, changed in place. Paging for the data itself is not followed.
+        :param count: Max count of objects for each nested connection. Default is None will get all data.
+        :param max_workers: Max connections to request at same time. Default is the client's max_workers.
+        :return: The data with nested connections merged.
+        :raises PartialResultError: Some connections failed, the data with others merged is in its data.
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            futures = {}
+
+            def submit(edges: Iterator[dict]):
+                for edge in edges:
+                    remaining = None if count is None else count - len(edge["data"])
+                    if remaining is not None and remaining <= 0:
+                        edge["paging"].pop("next", None)
+                        continue
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self._run_in_worker,
+                        self._get_nested_pages,
+                        next_url=edge["paging"]["next"],
+                        count=remaining,
+                    )
+                    futures[future] = edge
+
+            submit(self._find_nested_connections(data, root=True))
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    edge = futures.pop(future)
+                    try:
+                        pages = future.result()
+                    except PyFacebookException as ex:
+                        errors[edge["paging"]["next"]] = ex
+                        continue
+                    items = self._merge_nested_pages(
+                        edge=edge, pages=pages, count=count
+                    )
+                    submit(self._find_nested_connections(items))
+        if errors:
+            raise PartialResultError(data=data, errors=errors)
+        return data
+
+    @staticmethod
+    def _find_nested_connections(value: Any, root: bool = False) -> Iterator[dict]:
+        """
+        :param value: Response data, or objects in it.
+        :param root: Whether the value is the response data, its paging is not followed.
+        :return: Generator for connections have next page, like {"data": [...], "paging": {"next": "..."}}.
+        """
+        stack = [(value, root)]
+        while stack:
+            value, is_root = stack.pop()
+            if isinstance(value, dict):
+                paging = value.get("paging")
+                if (
+                    not is_root
+                    and isinstance(value.get("data"), list)
+                    and isinstance(paging, dict)
+                    and paging.get("next")
+                ):
+                    yield value
+                stack.extend((v, False) for v in value.values())
+            elif isinstance(value, list):
+                stack.extend((v, False) for v in value)
+
+    def _get_nested_pages(
+        self, next_url: str, count: Optional[int] = None
+    ) -> List[dict]:
+        """
+        :param next_url: Url for next page, which has the parameters for the connection.
+        :param count: Max count of objects to get. Default is None will get all data.
+        :return: Response data for pages.
+        """
+        pages, total = [], 0
+        while next_url:
+            parsed = urlparse(next_url)
+            resp = self._request(
+                url=parsed._replace(query="").geturl(),
+                args=dict(parse_qsl(parsed.query)),
+            )
+            data = self._parse_response(resp)
+            pages.append(data)
+            total += len(data.get("data", []))
+            if count is not None and total >= count:
+                break
+            next_url = (data.get("paging") or {}).get("next")
+        return pages
+
+    @staticmethod
+    def _merge_nested_pages(
+        edge: dict, pages: List[dict], count: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Append objects in pages to the connection, and update its paging to the last page.
+
+        :param edge: Nested connection in response data.
+        :param pages: Response data for next pages of the connection.
+        :param count: Max count of objects for the connection.
+        :return: Objects appended.
+        """
+        items = [item for page in pages for item in page.get("data", [])]
+        if count is not None:
+            items = items[: max(count - len(edge["data"]), 0)]
+        edge["data"].extend(items)
+
+        paging = dict(edge["paging"])
+        paging.pop("next", None)
+        last_paging = (pages[-1].get("paging") or {}) if pages else {}
+        after = (last_paging.get("cursors") or {}).get("after")
+        if after is not None:
+            paging["cursors"] = {**(paging.get("cursors") or {}), "after": after}
+        edge["paging"] = paging
+        return items
+
     def discovery_user_media(
         self,
         username: str,
@@ -394,26 +1152,15 @@ class GraphAPI:
         :param until: A Unix timestamp or strtotime data value that points to the end of data.
         :return: Combined Response data
         """
-        limit = f".limit({limit})" if limit is not None else ""
-        since = f".since({since})" if since is not None else ""
-        until = f".until({until})" if until is not None else ""
+        media = Field("media", fields).limit(limit).since(since).until(until)
         after = kwargs.get("after", "")
-
-        base_query = "business_discovery.username({username}){{media{after}{limit}{since}{until}{{{fields}}}}}"
         data, media_set, paging = {}, [], None
         while True:
             # next page for result
-            after = f".after({after})" if after else ""
-
-            fds = base_query.format(
-                username=username,
-                fields=fields,
-                after=after,
-                limit=limit,
-                since=since,
-                until=until,
+            fds = Field("business_discovery", media.after(after or None)).modifier(
+                "username", username
             )
-            args = {"fields": fds}
+            args = {"fields": str(fds)}
 
             data = self.get(
                 path=self.instagram_business_id,
@@ -500,6 +1247,97 @@ class GraphAPI:
         data = self._parse_response(resp)
         return data
 
+    def batch(self, include_headers: bool = True) -> GraphBatch:
+        """
+        Create a batch to collect operations, which will be sent with one request.
+
+        Usage:
+
+            with api.batch() as batch:
+                page = batch.get_object(object_id="20531316728", fields="id,name")
+                posts = batch.get_connection(object_id="20531316728", connection="posts")
+            batch.result(page)
+
+        :param include_headers: Whether response include headers for each operation.
+        :return: Batch instance.
+        """
+        return GraphBatch(client=self, include_headers=include_headers)
+
+    def execute_batch(
+        self,
+        operations: List[dict],
+        include_headers: bool = True,
+    ) -> List[Union[dict, PyFacebookException, None]]:
+        """
+        Send multi operations with one batch request.
+        Refer: https://developers.facebook.com/docs/graph-api/batch-requests
+
+        :param operations: List of operations, each one likes:
+            {"method": "GET", "relative_url": "v24.0/me?fields=id,name"}
+            Operations can also have keys: body, name, depends_on, omit_response_on_success.
+            Use JSONPath to refer result of named operation, like `{result=name:$.data.*.id}`.
+        :param include_headers: Whether response include headers for each operation.
+        :return: Results for each operation. Data for success operation,
+            the exception for failed operation, and None for omitted response.
+        """
+        if not operations:
+            return []
+        if len(operations) > self.MAX_BATCH_SIZE:
+            raise LibraryError(
+                {
+                    "message": f"Batch request can only include {self.MAX_BATCH_SIZE} operations"
+                }
+            )
+
+        resp = self._request(
+            url="",
+            post_args={
+                "batch": self.json_codec.dumps(operations).decode("utf-8"),
+                "include_headers": "true" if include_headers else "false",
+            },
+            verb="POST",
+        )
+        data = self._parse_response(resp)
+        return [self._parse_batch_item(item) for item in data]
+
+    def _parse_batch_item(
+        self, item: Optional[dict]
+    ) -> Union[dict, PyFacebookException, None]:
+        """
+        Parse result for batch operation, with same way as single request.
+
+        :param item: Result for operation, like {"code": 200, "headers": [], "body": "{}"}
+        :return: Operation data or the exception.
+        """
+        if item is None:
+            # omitted response, or the operation depends on failed.
+            return None
+
+        headers = CaseInsensitiveDict(
+            {h["name"]: h["value"] for h in item.get("headers") or []}
+        )
+        business_ids = self.rate_limit.set_limit(headers)
+        self._delay_requests(business_ids=business_ids)
+        # body for operation is always json, but header is likely text/javascript.
+        headers["Content-Type"] = "application/json; charset=UTF-8"
+
+        response = Response()
+        response.status_code = item.get("code")
+        response.headers = headers
+        response._content = (item.get("body") or "{}").encode("utf-8")
+        response.encoding = "utf-8"
+        try:
+            return self._parse_response(response)
+        except PyFacebookException as ex:
+            return ex
+        except ValueError:
+            # body not json, like html page for server errors.
+            return LibraryError(
+                {
+                    "message": f"Wrong response for batch operation, status code {response.status_code}"
+                }
+            )
+
     def _get_oauth_session(
         self,
         redirect_uri: Optional[str] = None,
@@ -755,6 +1593,18 @@ class BasicDisplayAPI(GraphAPI):
         base_url: Optional[str] = None,
         authorization_url: Optional[str] = None,
         access_token_url: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        adapter: Optional[HTTPAdapter] = None,
+        thread_safe: bool = False,
+        scheduler: Optional[RateLimitScheduler] = None,
+        rate_limit_store: Optional[RateLimitStore] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[CacheStore] = None,
+        json_codec: Union[str, JsonCodec, None] = None,
+        token_pool: Optional[TokenPool] = None,
     ):
         super().__init__(
             app_id=app_id,
@@ -770,6 +1620,18 @@ class BasicDisplayAPI(GraphAPI):
             base_url=base_url,
             authorization_url=authorization_url,
             access_token_url=access_token_url,
+            max_workers=max_workers,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            adapter=adapter,
+            thread_safe=thread_safe,
+            scheduler=scheduler,
+            rate_limit_store=rate_limit_store,
+            retry_policy=retry_policy,
+            cache=cache,
+            json_codec=json_codec,
+            token_pool=token_pool,
         )
 
     @staticmethod
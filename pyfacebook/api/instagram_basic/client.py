@@ -2,8 +2,7 @@
 Client for Instagram Basic Display API.
 """
 
-from pyfacebook.api.base_client import BaseBasicDisplayApi
-from pyfacebook.api.instagram_basic import resource as rs
+from pyfacebook.api.base_client import BaseBasicDisplayApi, LazyResource
 
 
 class IGBasicDisplayApi(BaseBasicDisplayApi):
@@ -11,5 +10,5 @@ class IGBasicDisplayApi(BaseBasicDisplayApi):
     Api class for Instagram basic display api
     """
 
-    user = rs.IGBasicUser()
-    media = rs.IGBasicMedia()
+    user = LazyResource("pyfacebook.api.instagram_basic.resource.IGBasicUser")
+    media = LazyResource("pyfacebook.api.instagram_basic.resource.IGBasicMedia")
@@ -1,2 +1,9 @@
-from pyfacebook.api.instagram_basic.resource.user import IGBasicUser
-from pyfacebook.api.instagram_basic.resource.media import IGBasicMedia
+from pyfacebook.utils.lazy_import import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "IGBasicUser": ".user",
+        "IGBasicMedia": ".media",
+    },
+)
@@ -2,11 +2,15 @@
 Apis for basic user
 """
 
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 import pyfacebook.utils.constant as const
 from pyfacebook.api.base_resource import BaseResource
-from pyfacebook.models.ig_basic_models import IgBasicUser, IgBasicMediaResponse
+from pyfacebook.models.ig_basic_models import (
+    IgBasicUser,
+    IgBasicMedia,
+    IgBasicMediaResponse,
+)
 from pyfacebook.utils.params_utils import enf_comma_separated
 
 
@@ -80,3 +84,47 @@ class IGBasicUser(BaseResource):
             return data
         else:
             return IgBasicMediaResponse.new_from_json_dict(data)
+
+    def iter_media(
+        self,
+        user_id: Optional[str] = "me",
+        fields: Optional[Union[str, list, tuple]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        count: Optional[int] = None,
+        limit: Optional[int] = 10,
+        prefetch: int = 0,
+        return_json=False,
+    ) -> Iterator[Union[IgBasicMedia, dict]]:
+        """
+        Iterate Media on a User, yield each media as the response page arrives.
+
+        :param user_id: ID for the user, matched the access token.
+        :param fields: Comma-separated id string for data fields which you want.
+            You can also pass this with an id list, tuple.
+        :param since: A Unix timestamp or strtotime data value that points to the start of data.
+        :param until: A Unix timestamp or strtotime data value that points to the end of data.
+        :param count: The total count for you to get data. Default is None will get all data.
+        :param limit: Each request retrieve objects count.
+            It should no more than 100. Default is None will use api default limit.
+        :param prefetch: Max count of pages to request ahead in a background thread.
+            Default is 0 will not prefetch.
+        :param return_json: Set to false will yield dataclass for IgBasicMedia.
+            Or yield json data. Default is false.
+        :return: Generator for media.
+        """
+
+        if fields is None:
+            fields = const.IG_BASIC_MEDIA_FIELDS
+
+        for item in self.client.iter_connections(
+            object_id=user_id,
+            connection="media",
+            count=count,
+            limit=limit,
+            prefetch=prefetch,
+            fields=enf_comma_separated(field="fields", value=fields),
+            since=since,
+            until=until,
+        ):
+            yield item if return_json else IgBasicMedia.new_from_json_dict(item)
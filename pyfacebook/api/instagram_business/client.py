@@ -2,8 +2,7 @@
 Client for Instagram Graph API.
 """
 
-from pyfacebook.api.base_client import BaseApi
-from pyfacebook.api.instagram_business import resource as rs
+from pyfacebook.api.base_client import BaseApi, LazyResource
 
 
 class IGBusinessApi(BaseApi):
@@ -11,9 +10,15 @@ class IGBusinessApi(BaseApi):
     Api class for Instagram Business
     """
 
-    user = rs.IGBusinessUser()
-    media = rs.IGBusinessMedia()
-    comment = rs.IGBusinessComment()
-    reply = rs.IGBusinessReply()
-    hashtag = rs.IGBusinessHashtag()
-    container = rs.IGBusinessContainer()
+    user = LazyResource("pyfacebook.api.instagram_business.resource.IGBusinessUser")
+    media = LazyResource("pyfacebook.api.instagram_business.resource.IGBusinessMedia")
+    comment = LazyResource(
+        "pyfacebook.api.instagram_business.resource.IGBusinessComment"
+    )
+    reply = LazyResource("pyfacebook.api.instagram_business.resource.IGBusinessReply")
+    hashtag = LazyResource(
+        "pyfacebook.api.instagram_business.resource.IGBusinessHashtag"
+    )
+    container = LazyResource(
+        "pyfacebook.api.instagram_business.resource.IGBusinessContainer"
+    )
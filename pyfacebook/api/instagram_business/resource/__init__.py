@@ -1,8 +1,13 @@
-from pyfacebook.api.instagram_business.resource.user import IGBusinessUser
-from pyfacebook.api.instagram_business.resource.media import IGBusinessMedia
-from pyfacebook.api.instagram_business.resource.comment import (
-    IGBusinessComment,
-    IGBusinessReply,
+from pyfacebook.utils.lazy_import import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "IGBusinessUser": ".user",
+        "IGBusinessMedia": ".media",
+        "IGBusinessComment": ".comment",
+        "IGBusinessReply": ".comment",
+        "IGBusinessHashtag": ".hashtag",
+        "IGBusinessContainer": ".container",
+    },
 )
-from pyfacebook.api.instagram_business.resource.hashtag import IGBusinessHashtag
-from pyfacebook.api.instagram_business.resource.container import IGBusinessContainer
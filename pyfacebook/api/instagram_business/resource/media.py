@@ -2,12 +2,13 @@
 Apis for media.
 """
 
-from typing import Dict, Optional, Union
+from typing import Dict, Iterator, Optional, Union
 
 import pyfacebook.utils.constant as const
 from pyfacebook.api.base_resource import BaseResource
 from pyfacebook.models.ig_business_models import (
     IgBusMedia,
+    IgBusComment,
     IgBusCommentResponse,
     IgBusMediaChildren,
     IgBusInsightsResponse,
@@ -114,6 +115,44 @@ class IGBusinessMedia(BaseResource):
         else:
             return IgBusCommentResponse.new_from_json_dict(data)
 
+    def iter_comments(
+        self,
+        media_id: str,
+        fields: Optional[Union[str, list, tuple]] = None,
+        count: Optional[int] = None,
+        limit: Optional[int] = 10,
+        prefetch: int = 0,
+        return_json: bool = False,
+    ) -> Iterator[Union[IgBusComment, dict]]:
+        """
+        Iterate IG Comments on an IG Media object, yield each comment as the response page arrives.
+
+        :param media_id: ID for the media.
+        :param fields: Comma-separated id string for data fields which you want.
+            You can also pass this with an id list, tuple.
+        :param count: The total count for you to get data. Default is None will get all data.
+        :param limit: Each request retrieve objects count.
+            It should no more than 50. Default is None will use api default limit.
+        :param prefetch: Max count of pages to request ahead in a background thread.
+            Default is 0 will not prefetch.
+        :param return_json: Set to false will yield dataclass for IgBusComment.
+            Or yield json data. Default is false.
+        :return: Generator for comment.
+        """
+
+        if fields is None:
+            fields = const.IG_BUSINESS_COMMENT_PUBLIC_FIELDS
+
+        for item in self.client.iter_connections(
+            object_id=media_id,
+            connection="comments",
+            count=count,
+            limit=limit,
+            prefetch=prefetch,
+            fields=enf_comma_separated(field="fields", value=fields),
+        ):
+            yield item if return_json else IgBusComment.new_from_json_dict(item)
+
     def get_children(
         self,
         media_id: str,
@@ -2,12 +2,13 @@
 Apis for user.
 """
 
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 import pyfacebook.utils.constant as const
 from pyfacebook.api.base_resource import BaseResource
 from pyfacebook.models.ig_business_models import (
     IgBusUser,
+    IgBusMedia,
     IgBusMediaResponse,
     IgBusDiscoveryUserResponse,
     IgBusDiscoveryUserMediaResponse,
@@ -20,6 +21,7 @@ from pyfacebook.models.ig_business_models import (
     IgBusProductsResponse,
     IgBusProductAppealsResponse,
 )
+from pyfacebook.utils.field_utils import Field
 from pyfacebook.utils.params_utils import enf_comma_separated
 
 
@@ -78,7 +80,9 @@ class IGBusinessUser(BaseResource):
 
         data = self.client.get_object(
             object_id=self.client.instagram_business_id,
-            fields=f"business_discovery.username({username}){{{metric}}}",
+            fields=str(
+                Field("business_discovery", metric).modifier("username", username)
+            ),
         )
         if return_json:
             return data
@@ -117,17 +121,18 @@ class IGBusinessUser(BaseResource):
             fields = const.IG_BUSINESS_MEDIA_PUBLIC_FIELDS
         metric = enf_comma_separated(field="fields", value=fields)
 
-        limit_str = f".limit({limit})" if limit is not None else ""
-        after_str = f".after({after})" if after is not None else ""
-        before_str = f".before({before})" if before is not None else ""
-        since_str = f".since({since})" if since is not None else ""
-        until_str = f".until({until})" if until is not None else ""
-
+        media = (
+            Field("media", metric)
+            .after(after)
+            .before(before)
+            .since(since)
+            .until(until)
+            .limit(limit)
+        )
         data = self.client.get_object(
             object_id=self.client.instagram_business_id,
-            fields=(
-                f"business_discovery.username({username})"
-                f"{{media{after_str}{before_str}{since_str}{until_str}{limit_str}{{{metric}}}}}"
+            fields=str(
+                Field("business_discovery", media).modifier("username", username)
             ),
         )
 
@@ -269,6 +274,48 @@ class IGBusinessUser(BaseResource):
         else:
             return IgBusMediaResponse.new_from_json_dict(data)
 
+    def iter_media(
+        self,
+        fields: Optional[Union[str, list, tuple]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        count: Optional[int] = None,
+        limit: Optional[int] = 10,
+        prefetch: int = 0,
+        return_json: bool = False,
+    ) -> Iterator[Union[IgBusMedia, dict]]:
+        """
+        Iterate user's media, yield each media as the response page arrives. This only can return max 10k medias.
+
+        :param fields: Comma-separated id string for data fields which you want.
+            You can also pass this with an id list, tuple.
+        :param since: A Unix timestamp or strtotime data value that points to the start of data.
+        :param until: A Unix timestamp or strtotime data value that points to the end of data.
+        :param count: The total count for you to get data. Default is None will get all data.
+        :param limit: Each request retrieve objects count.
+            It should no more than 100. Default is None will use api default limit.
+        :param prefetch: Max count of pages to request ahead in a background thread.
+            Default is 0 will not prefetch.
+        :param return_json: Set to false will yield dataclass for IgBusMedia.
+            Or yield json data. Default is false.
+        :return: Generator for media.
+        """
+
+        if fields is None:
+            fields = const.IG_BUSINESS_MEDIA_PUBLIC_FIELDS
+
+        for item in self.client.iter_connections(
+            object_id=self.client.instagram_business_id,
+            connection="media",
+            count=count,
+            limit=limit,
+            prefetch=prefetch,
+            fields=enf_comma_separated(field="fields", value=fields),
+            since=since,
+            until=until,
+        ):
+            yield item if return_json else IgBusMedia.new_from_json_dict(item)
+
     def get_live_media(
         self,
         fields: Optional[Union[str, list, tuple]] = None,
@@ -0,0 +1,314 @@
+"""
+Cache for responses with ETag, the client sends conditional requests with ``If-None-Match``,
+and uses the cached response when graph returns ``304 Not Modified``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Parameters for the token, the cache is shared by tokens.
+IGNORED_PARAMS = {"access_token", "appsecret_proof"}
+# Headers for the transport, not for the decoded content.
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def build_cache_key(url: str, args: Optional[dict] = None) -> str:
+    """
+    Build cache key for the request, parameters are sorted and token parameters are excluded.
+
+    :param url: Full url for the request, may have query.
+    :param args: Query parameters.
+    :return: Cache key.
+    """
+    parsed = urlparse(url)
+    params = dict(parse_qsl(parsed.query, keep_blank_values=True))
+    params.update({k: v for k, v in (args or {}).items() if v is not None})
+    params = sorted((k, str(v)) for k, v in params.items() if k not in IGNORED_PARAMS)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{urlencode(params)}"
+
+
+@dataclass
+class CacheEntry:
+    """
+    A class representing the cached response.
+    """
+
+    etag: str
+    content: bytes
+    headers: Dict[str, str]
+    encoding: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, response: Response) -> Optional["CacheEntry"]:
+        """
+        :param response: Response for the request.
+        :return: Entry, None if the response can not be cached.
+        """
+        etag = response.headers.get("ETag")
+        if response.status_code != 200 or not etag:
+            return None
+        return cls(
+            etag=etag,
+            content=response.content,
+            headers={
+                k: v
+                for k, v in response.headers.items()
+                if k.lower() not in SKIPPED_HEADERS
+            },
+            encoding=response.encoding,
+        )
+
+    def to_response(self, url: str) -> Response:
+        """
+        :param url: Url for the request.
+        :return: Response with the cached data.
+        """
+        response = Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = self.encoding
+        response.reason = "OK"
+        response.url = url
+        return response
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+
+class CacheStore(object):
+    """
+    Base class for cache stores.
+    """
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheStore(CacheStore):
+    """
+    Least recently used cache in memory.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        """
+        :param max_entries: Max count of responses to cache.
+        :param max_bytes: Max total bytes for content of responses.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, removed = self._entries.popitem(last=False)
+                self._bytes -= removed.size
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+
+
+class DiskCacheStore(CacheStore):
+    """
+    Cache on disk, each response is saved in a file named by the hash of key.
+
+    The file begins with a json line for the etag and headers, then the content.
+    Files are pruned by the least recently used, which is the modified time of the file, touched when read.
+    Once over the limits, files are pruned to ``PRUNE_RATIO`` of the limits, so not scanned for every set.
+    Errors for writing files are logged, the cache is skipped for the response.
+    """
+
+    PRUNE_RATIO = 0.9
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: Optional[int] = 10000,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        :param directory: Directory for the cache files, created if not exists.
+        :param max_entries: Max count of responses to cache, None for no limit.
+        :param max_bytes: Max total bytes for the cache files, None for no limit.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # count and bytes of files, counted again when pruning, as other processes may share the directory.
+        self._entries, self._bytes = 0, 0
+        self._scan()
+
+    def __len__(self):
+        return len(self._scan())
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name)
+
+    def _scan(self) -> List[Tuple[int, str, int]]:
+        """
+        :return: Modified time, path and size for the cache files, and update the count and bytes.
+        """
+        files = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                # temp files for writing are not counted.
+                if len(item.name) != 64 or not item.is_file():
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime_ns, item.path, stat.st_size))
+        self._entries = len(files)
+        self._bytes = sum(size for _, _, size in files)
+        return files
+
+    def _over_limit(self, ratio: float = 1.0) -> bool:
+        return (
+            self.max_entries is not None and self._entries > self.max_entries * ratio
+        ) or (self.max_bytes is not None and self._bytes > self.max_bytes * ratio)
+
+    def prune(self) -> None:
+        """
+        Remove the least recently used files until the cache is in ``PRUNE_RATIO`` of the limits.
+        """
+        with self._lock:
+            try:
+                files = sorted(self._scan())
+            except OSError as ex:
+                logger.warning(f"Exception in scan cache files. errors: {ex}")
+                return
+            for _, path, size in files:
+                if not self._over_limit(ratio=self.PRUNE_RATIO):
+                    break
+                self._remove(path)
+                self._entries -= 1
+                self._bytes -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as ex:
+            logger.warning(f"Exception in remove cache file {path}. errors: {ex}")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                line = f.readline()
+                content = f.read()
+        except OSError:
+            return None
+        try:
+            meta = json.loads(line)
+            # hash collision
+            if meta.get("key") != key:
+                return None
+            entry = CacheEntry(
+                etag=meta["etag"],
+                content=content,
+                headers=meta["headers"],
+                encoding=meta.get("encoding"),
+            )
+        except (ValueError, KeyError, AttributeError):
+            # corrupt file, like truncated by a crash.
+            self._remove(path)
+            return None
+        try:
+            # mark as recently used.
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            return
+        meta = {
+            "key": key,
+            "etag": entry.etag,
+            "headers": entry.headers,
+            "encoding": entry.encoding,
+        }
+        path = self._path(key)
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode("utf-8") + b"\n")
+                f.write(entry.content)
+                size = f.tell()
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = None
+            os.replace(tmp_path, path)
+        except OSError as ex:
+            # the response is got, not fail the request for the cache.
+            logger.warning(f"Exception in write cache file. errors: {ex}")
+            if tmp_path is not None:
+                self._remove(tmp_path)
+            return
+        with self._lock:
+            if old_size is None:
+                self._entries += 1
+            else:
+                self._bytes -= old_size
+            self._bytes += size
+            over_limit = self._over_limit()
+        if over_limit:
+            self.prune()
+
+    def delete(self, key: str) -> None:
+        self._remove(self._path(key))
@@ -0,0 +1,165 @@
+"""
+Json codecs to decode responses and usage headers, and encode models.
+
+The default codec is orjson if installed, or the stdlib json. ujson and simdjson are used only when chosen,
+as ujson rounds floats differently from the stdlib json.
+"""
+
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Type, Union
+
+from pyfacebook.exceptions import LibraryError
+
+
+class JsonCodec(object):
+    """
+    Codec with the stdlib json, also the base class for codecs.
+
+    Errors for invalid json are subclasses of ``ValueError`` for all codecs.
+    """
+
+    name = "json"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        :param data: Json text, bytes are decoded directly without decoding to text first if the codec supports.
+        :return: Data
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """
+        :param obj: Data
+        :param default: Function to convert object not supported by json, dataclasses are also converted by it.
+        :return: Compact utf-8 json bytes.
+        """
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), default=default
+        ).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        if default is None:
+            return self._orjson.dumps(obj)
+        # encode dataclasses by default like the stdlib json, not by orjson.
+        return self._orjson.dumps(
+            obj, default=default, option=self._orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._ujson.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        kwargs = {} if default is None else {"default": default}
+        return self._ujson.dumps(
+            obj, ensure_ascii=False, escape_forward_slashes=False, **kwargs
+        ).encode("utf-8")
+
+
+class SimdjsonCodec(JsonCodec):
+    """
+    Codec decodes with simdjson, and encodes with the stdlib json as simdjson only parses.
+    """
+
+    name = "simdjson"
+
+    def __init__(self):
+        import simdjson
+
+        self._simdjson = simdjson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._simdjson.loads(data)
+
+
+CODECS: Dict[str, Type[JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "simdjson": SimdjsonCodec,
+    "ujson": UjsonCodec,
+    "json": JsonCodec,
+}
+
+# codecs to choose the default from, in order.
+AUTO_CODECS = ("orjson", "json")
+
+_default_codec: Optional[JsonCodec] = None
+_lock = threading.Lock()
+
+
+def _find_codec() -> JsonCodec:
+    for name in AUTO_CODECS:
+        try:
+            return CODECS[name]()
+        except ImportError:
+            continue
+    return JsonCodec()
+
+
+def get_default_codec() -> JsonCodec:
+    """
+    :return: Default codec, orjson if installed or the stdlib json if not set.
+    """
+    global _default_codec
+    if _default_codec is None:
+        with _lock:
+            if _default_codec is None:
+                _default_codec = _find_codec()
+    return _default_codec
+
+
+def set_default_codec(codec: Union[str, JsonCodec, None]) -> None:
+    """
+    Set default codec, which is used by clients without codec and models.
+
+    :param codec: Codec instance or name, None to use orjson if installed or the stdlib json.
+    """
+    global _default_codec
+    _default_codec = None if codec is None else get_codec(codec)
+
+
+def get_codec(codec: Union[str, JsonCodec, None] = None) -> JsonCodec:
+    """
+    :param codec: Codec instance, or name for codec, like ``json`` and ``orjson``.
+        None for the default codec.
+    :return: Codec instance.
+    """
+    if codec is None:
+        return get_default_codec()
+    if isinstance(codec, JsonCodec):
+        return codec
+    codec_class = CODECS.get(codec)
+    if codec_class is None:
+        raise LibraryError(
+            {
+                "message": f"Unknown json codec {codec}, should be one of {', '.join(CODECS)}"
+            }
+        )
+    try:
+        return codec_class()
+    except ImportError:
+        raise LibraryError(
+            {
+                "message": f"Json codec {codec} need package {codec}. You can install it by `pip install {codec}`"
+            }
+        )
@@ -44,5 +44,37 @@ class FacebookError(LibraryError):
         super().__init__(kwargs=error)
 
 
+class PartialResultError(LibraryError):
+    """
+    A class representing some of multi requests failed.
+    Data for the successful requests is kept in ``data``, and ``errors`` maps the failed request to its exception.
+    """
+
+    def __init__(self, data: dict, errors: dict):
+        self._data = data
+        self._errors = errors
+        super().__init__(
+            kwargs={"message": f"{len(errors)} requests failed, data for others kept"}
+        )
+
+    @property
+    def data(self) -> dict:
+        return self._data
+
+    @property
+    def errors(self) -> dict:
+        return self._errors
+
+
+class RateLimitError(LibraryError):
+    """
+    A class representing request not sent for the rate limit.
+    ``wait_seconds`` is the predicted seconds to wait before the request can be sent.
+    """
+
+    def __init__(self, message: str, wait_seconds: float):
+        super().__init__(kwargs={"message": message, "wait_seconds": wait_seconds})
+
+
 class PyFacebookDeprecationWaring(DeprecationWarning):
     pass
@@ -1,40 +1,55 @@
-from .base import BaseModel
-from .business import Business
-from .user import User, UserExperience, UserAgeRange
-from .page import Page, PagesResponse, SearchPage, SearchPagesResponse
-from .post import Post, FeedResponse
-from .group import Group
-from .event import Event
-from .photo import Photo, PhotosResponse
-from .album import Album, AlbumResponse
-from .video import Video, VideosResponse
-from .live_video import LiveVideo, LiveVideosResponse
-from .comment import Comment, CommentsResponse
-from .conversation import Conversation
-from .message import Message
-from .ig_business_models import (
-    IgBusUser,
-    IgBusMedia,
-    IgBusMediaResponse,
-    IgBusMediaChildren,
-    IgBusReply,
-    IgBusComment,
-    IgBusHashtag,
-    IgBusContainer,
-    IgBusPublishLimit,
-    IgBusPublishLimitResponse,
-    IgBusInsight,
-    IgBusInsightsResponse,
-    IgBusDiscoveryUserResponse,
-    IgBusDiscoveryUserMediaResponse,
-    IgBusMentionedCommentResponse,
-    IgBusMentionedMediaResponse,
-    IgBusHashtagsResponse,
-    IgBusCommentResponse,
-)
-from .ig_basic_models import (
-    IgBasicUser,
-    IgBasicMediaChildren,
-    IgBasicMedia,
-    IgBasicMediaResponse,
+from pyfacebook.utils.lazy_import import attach
+
+# Models are imported at first access.
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "BaseModel": ".base",
+        "Business": ".business",
+        "User": ".user",
+        "UserExperience": ".user",
+        "UserAgeRange": ".user",
+        "Page": ".page",
+        "PagesResponse": ".page",
+        "SearchPage": ".page",
+        "SearchPagesResponse": ".page",
+        "Post": ".post",
+        "FeedResponse": ".post",
+        "Group": ".group",
+        "Event": ".event",
+        "Photo": ".photo",
+        "PhotosResponse": ".photo",
+        "Album": ".album",
+        "AlbumResponse": ".album",
+        "Video": ".video",
+        "VideosResponse": ".video",
+        "LiveVideo": ".live_video",
+        "LiveVideosResponse": ".live_video",
+        "Comment": ".comment",
+        "CommentsResponse": ".comment",
+        "Conversation": ".conversation",
+        "Message": ".message",
+        "IgBusUser": ".ig_business_models",
+        "IgBusMedia": ".ig_business_models",
+        "IgBusMediaResponse": ".ig_business_models",
+        "IgBusMediaChildren": ".ig_business_models",
+        "IgBusReply": ".ig_business_models",
+        "IgBusComment": ".ig_business_models",
+        "IgBusHashtag": ".ig_business_models",
+        "IgBusContainer": ".ig_business_models",
+        "IgBusPublishLimit": ".ig_business_models",
+        "IgBusPublishLimitResponse": ".ig_business_models",
+        "IgBusInsight": ".ig_business_models",
+        "IgBusInsightsResponse": ".ig_business_models",
+        "IgBusDiscoveryUserResponse": ".ig_business_models",
+        "IgBusDiscoveryUserMediaResponse": ".ig_business_models",
+        "IgBusMentionedCommentResponse": ".ig_business_models",
+        "IgBusMentionedMediaResponse": ".ig_business_models",
+        "IgBusHashtagsResponse": ".ig_business_models",
+        "IgBusCommentResponse": ".ig_business_models",
+        "IgBasicUser": ".ig_basic_models",
+        "IgBasicMediaChildren": ".ig_basic_models",
+        "IgBasicMedia": ".ig_basic_models",
+        "IgBasicMediaResponse": ".ig_basic_models",
+    },
 )
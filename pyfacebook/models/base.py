@@ -2,9 +2,10 @@
 Base model
 """
 
-from copy import deepcopy
+import json
 from dataclasses import dataclass, field as base_field
 from typing import (
+    ClassVar,
     Dict,
     Type,
     TypeVar,
@@ -14,28 +15,67 @@ from typing import (
 from dataclasses_json import (
     DataClassJsonMixin,
 )
-from dataclasses_json.core import Json
+from dataclasses_json.core import Json, _ExtendedEncoder
+
+from pyfacebook.codec import get_default_codec
+from pyfacebook.models import encoder
+from pyfacebook.models.decoder import decode
 
 A = TypeVar("A", bound=DataClassJsonMixin)
 
 
 @dataclass
 class BaseModel(DataClassJsonMixin):
+    # Whether to keep the origin json dict on the instance as ``_json``, off by default.
+    # Can be set for all models by ``BaseModel.keep_json = True``, or for a model class.
+    keep_json: ClassVar[bool] = False
+    # Whether to decode instances in compact mode, for models with more than 30 fields, fields which are None
+    # are not saved on the instance, and read from the class default, this saves memory for fields not returned.
+    # Models with fewer fields always share the attribute names between instances, which is smaller.
+    compact: ClassVar[bool] = False
+    # Whether to decode instances in lazy mode, nested models and lists of models are kept as json,
+    # and decoded at first access, the cost of decoding is only for fields read.
+    lazy: ClassVar[bool] = False
+    # Origin json dict, only set on instances when keep json.
+    _json: ClassVar[Optional[Dict]] = None
+
     @classmethod
     def new_from_json_dict(
-        cls: Type[A], data: Optional[Dict], *, infer_missing=False
+        cls: Type[A],
+        data: Optional[Dict],
+        *,
+        infer_missing=False,
+        keep_json: Optional[bool] = None,
+        compact: Optional[bool] = None,
+        lazy: Optional[bool] = None,
     ) -> Optional[A]:
         """
         Convert json dict to dataclass
         :param data: A json dict which will convert model class.
         :param infer_missing: if set True, will let missing field (not have default vale) to None
+        :param keep_json: if set True, will save the json dict to the instance as ``_json``.
+            The instance holds the dict, it is freed with the instance.
+            Default is the ``keep_json`` setting of the model class.
+        :param compact: if set True, will not save fields which are None on the instance and nested instances,
+            for models with more than 30 fields.
+            Default is the ``compact`` setting of the model class.
+        :param lazy: if set True, will decode nested models at first access, for the instance and nested instances.
+            Errors for the nested data are raised at access.
+            Default is the ``lazy`` setting of the model class.
         :return: The data class
         """
         if not data:
             return None
-        c = cls.from_dict(data, infer_missing=infer_missing)
-        # save origin data
-        cls._json = data
+        if compact is None:
+            compact = cls.compact
+        if lazy is None:
+            lazy = cls.lazy
+        c = decode(cls, data, infer_missing=infer_missing, compact=compact, lazy=lazy)
+        if keep_json is None:
+            keep_json = cls.keep_json
+        if keep_json:
+            # save origin data
+            c._json = data
         return c
 
     def to_dict(self, encode_json=False, ignore_nan=True) -> Dict[str, Json]:
@@ -45,31 +85,48 @@ class BaseModel(DataClassJsonMixin):
         :param ignore_nan: Is the result include None data.
         :return: dict
         """
-        data = super().to_dict(encode_json=encode_json)
-        if ignore_nan:
-            data = dict_minus_none_values(data)
-        return data
+        return encoder.to_dict(self, ignore_nan=ignore_nan, encode_json=encode_json)
+
+    def to_json(self, *, ignore_nan=True, **kwargs) -> str:
+        """
+        Convert dataclass to json string, models are encoded during the json encoder walks, not converted to dict first.
+        :param ignore_nan: Is the result include None data.
+        :param kwargs: Arguments for ``json.dumps``, like ``indent``.
+        :return: json string
+        """
+        kwargs.setdefault("cls", _ExtendedEncoder)
+        kwargs.setdefault("default", encoder.json_default(ignore_nan=ignore_nan))
+        return json.dumps(self, **kwargs)
+
+    def to_bytes(self, ignore_nan=True) -> bytes:
+        """
+        Convert dataclass to compact utf-8 json bytes by the default json codec, for writing to files or message queues.
+        Models are encoded during the json encoder walks, not converted to dict first.
+        :param ignore_nan: Is the result include None data.
+        :return: json bytes
+        """
+        return get_default_codec().dumps(
+            self, default=encoder.json_default(ignore_nan=ignore_nan)
+        )
 
 
 def dict_minus_none_values(obj: Optional[dict]):
     """
     Remove data dict where value is None
     :param obj: dict object
-    :return: obj
+    :return: new dict without None values, obj is not changed.
     """
     if obj is None:
         return None
+    return {k: _minus_none_values(v) for k, v in obj.items() if v is not None}
+
 
-    keys = list(obj.keys())
-    for key in keys:
-        value = obj[key]
-        if value is None:
-            obj.pop(key)
-        if isinstance(value, (list, tuple)):
-            obj[key] = type(value)([dict_minus_none_values(v) for v in value])
-        if isinstance(value, dict):
-            obj[key] = dict_minus_none_values(value)
-    return deepcopy(obj)
+def _minus_none_values(value):
+    if isinstance(value, dict):
+        return dict_minus_none_values(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)([_minus_none_values(v) for v in value])
+    return value
 
 
 def field(default=None, repr=False, compare=False, **kwargs):
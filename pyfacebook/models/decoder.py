@@ -0,0 +1,450 @@
+"""
+Precompiled decoders for models.
+
+``DataClassJsonMixin.from_dict`` resolves type hints and walks the schema for every call.
+The decoder for a model class is generated once from its fields, and builds the instance directly.
+Only values with the json types are decoded by the decoder, like ``str`` for ``Optional[str]`` and ``dict``
+for nested models, other values fallback to ``from_dict``, so the result is always same as ``from_dict``.
+
+In compact mode, models with few fields set all fields in the same order, so the instances share the keys
+of the class and only save the values, which is much smaller than a dict. For models with more fields than
+CPython can share, fields which are None are not saved in the instance ``__dict__``, the dataclass
+keeps the default None on the class, so reading them is same, and the instances use less memory.
+
+In lazy mode, nested models and lists of models are kept as json in ``_pending`` of the instance,
+the ``LazyField`` descriptors on the class decode them at first access, so the cost is only for fields read.
+"""
+
+import dataclasses
+import threading
+import typing
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dataclasses_json import cfg
+
+# decoder for model, accept json dict, infer_missing, compact and lazy.
+Decoder = Callable[[dict, bool, bool, bool], Any]
+
+_decoders: Dict[type, Decoder] = {}
+_lock = threading.RLock()
+
+SCALAR_TYPES = (str, int, float, bool)
+# max attributes for instances to share the keys of the class, same as the limit of CPython.
+SHARED_KEYS_MAX = 30
+# raw value is not pending for the lazy field.
+_MISSING = object()
+
+
+class _Mismatch(Exception):
+    """Value not match the type for fast decoding."""
+
+
+def _mismatch():
+    raise _Mismatch
+
+
+def _unwrap_optional(type_: Any) -> Tuple[Any, bool]:
+    """
+    :param type_: Type hint.
+    :return: Type without Optional, and whether it's optional.
+    """
+    if typing.get_origin(type_) is typing.Union:
+        args = [arg for arg in typing.get_args(type_) if arg is not type(None)]
+        if len(args) == 1 and len(typing.get_args(type_)) == 2:
+            return args[0], True
+    return type_, False
+
+
+def _is_model(type_: Any) -> bool:
+    return (
+        isinstance(type_, type)
+        and dataclasses.is_dataclass(type_)
+        and hasattr(type_, "from_dict")
+    )
+
+
+def _can_compile(cls: type) -> bool:
+    """
+    Check whether the model only uses features which the decoder supports.
+
+    :param cls: Model class.
+    :return: Supported or not.
+    """
+    if getattr(cls, "dataclass_json_config", None):
+        return False
+    # instance without __dict__ can not be built by the decoder.
+    if hasattr(cls, "__post_init__") or not cls.__dictoffset__:
+        return False
+    if cfg.global_config.decoders:
+        return False
+    for f in dataclasses.fields(cls):
+        if not f.init or f.default is dataclasses.MISSING:
+            return False
+        overrides = f.metadata.get("dataclasses_json", {})
+        if set(overrides) - {"letter_case", "encoder", "mm_field"}:
+            return False
+    return True
+
+
+def _json_name(f: dataclasses.Field) -> str:
+    letter_case = f.metadata.get("dataclasses_json", {}).get("letter_case")
+    return letter_case(f.name) if letter_case is not None else f.name
+
+
+def _compile_field(
+    index: int, f: dataclasses.Field, type_: Any, namespace: dict
+) -> List[str]:
+    """
+    Generate code lines to decode the value ``v`` for the field.
+
+    :param index: Index for the field.
+    :param f: Field
+    :param type_: Type hint for the field.
+    :param namespace: Namespace for the generated code.
+    :return: Code lines.
+    """
+    inner, optional = _unwrap_optional(type_)
+    fallback = f"v = fallback({f.name!r}, {_json_name(f)!r}, v, infer_missing, compact)"
+    lines = []
+    # None for non-optional field will warn in from_dict.
+    lines.append("if v is None:" if optional else "if v is None:\n    " + fallback)
+    if optional:
+        lines.append("    pass")
+
+    if inner is Any:
+        return lines
+    if inner in SCALAR_TYPES:
+        namespace[f"t{index}"] = inner
+        lines += [f"elif v.__class__ is not t{index}:", "    " + fallback]
+        return lines
+    if inner is dict:
+        lines += [
+            "elif v.__class__ is dict:",
+            "    v = dict(v)",
+            "else:",
+            "    " + fallback,
+        ]
+        return lines
+    if _is_model(inner):
+        namespace[f"m{index}"] = inner
+        lines += [
+            "elif v.__class__ is dict:",
+            f"    v = decode(m{index}, v, infer_missing, compact, lazy)",
+            "else:",
+            "    " + fallback,
+        ]
+        return lines
+    if typing.get_origin(inner) in (list, List) and len(typing.get_args(inner)) == 1:
+        item = typing.get_args(inner)[0]
+        if item in SCALAR_TYPES or item is dict:
+            namespace[f"t{index}"] = item
+            convert = "dict(x)" if item is dict else "x"
+            lines += [
+                f"elif v.__class__ is list and all(x.__class__ is t{index} for x in v):",
+                f"    v = [{convert} for x in v]",
+                "else:",
+                "    " + fallback,
+            ]
+            return lines
+        if _is_model(item):
+            namespace[f"m{index}"] = item
+            lines += [
+                "elif v.__class__ is list:",
+                "    try:",
+                f"        v = [decode(m{index}, x, infer_missing, compact, lazy) if x.__class__ is dict else mismatch() for x in v]",
+                "    except Mismatch:",
+                "        " + fallback,
+                "else:",
+                "    " + fallback,
+            ]
+            return lines
+    # Other types, like Union, let from_dict to decode.
+    lines += ["else:", "    " + fallback]
+    return lines
+
+
+def _is_nested(type_: Any) -> bool:
+    """
+    :param type_: Type hint.
+    :return: Whether the type is nested model or list of nested model, which can be decoded lazily.
+    """
+    inner, _ = _unwrap_optional(type_)
+    if typing.get_origin(inner) in (list, List) and len(typing.get_args(inner)) == 1:
+        inner = typing.get_args(inner)[0]
+    return _is_model(inner)
+
+
+class PendingFields(object):
+    """
+    Json values for the nested fields of a lazy instance, which are not decoded yet.
+    """
+
+    __slots__ = ("values", "infer_missing", "compact")
+
+    def __init__(self, values: dict, infer_missing: bool, compact: bool):
+        self.values = values
+        self.infer_missing = infer_missing
+        self.compact = compact
+
+    def __reduce__(self):
+        return PendingFields, (self.values, self.infer_missing, self.compact)
+
+
+class LazyField(object):
+    """
+    Non-data descriptor for the nested field, the value is decoded at first access for lazy instances,
+    and saved on the instance, then the descriptor is not used for the instance any more.
+    For other instances, the field is always saved on the instance, except None in compact mode.
+    """
+
+    __slots__ = ("name", "decode_field")
+
+    def __init__(self, name: str, decode_field: Callable[..., Any]):
+        self.name = name
+        self.decode_field = decode_field
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return None
+        attrs = obj.__dict__
+        pending = attrs.get("_pending")
+        raw = _MISSING if pending is None else pending.values.get(self.name, _MISSING)
+        if raw is _MISSING:
+            # not in the data, or decoded by another thread, which saves the value before removing the raw.
+            return attrs.get(self.name)
+        value = self.decode_field(raw, pending.infer_missing, pending.compact, True)
+        # another thread may decode the field too, the values are same.
+        attrs[self.name] = value
+        pending.values.pop(self.name, None)
+        return value
+
+
+def compile_decoder(cls: type) -> Optional[Decoder]:
+    """
+    Generate decoder for the model class.
+
+    :param cls: Model class.
+    :return: Decoder, None if the model can not be compiled.
+    """
+    if not _can_compile(cls):
+        return None
+
+    hints = typing.get_type_hints(cls)
+    fields = dataclasses.fields(cls)
+
+    def fallback(
+        name: str, key: str, value: Any, infer_missing: bool, compact: bool
+    ) -> Any:
+        # decode single field by from_dict, other fields are default.
+        obj = cls.from_dict({key: value}, infer_missing=infer_missing)
+        return _compact(getattr(obj, name)) if compact else getattr(obj, name)
+
+    namespace = {
+        "cls": cls,
+        "new": object.__new__,
+        "decode": decode,
+        "fallback": fallback,
+        "from_dict": _from_dict,
+        "mismatch": _mismatch,
+        "Mismatch": _Mismatch,
+    }
+    body = [
+        "if data.__class__ is not dict:",
+        "    return from_dict(cls, data, infer_missing, compact)",
+        "get = data.get",
+    ]
+    # from_dict replaces the field name with the json name, skip the data has both.
+    renamed = [f.name for f in fields if _json_name(f) != f.name]
+    if renamed:
+        conditions = " or ".join(f"{name!r} in data" for name in renamed)
+        body += [
+            f"if {conditions}:",
+            "    return from_dict(cls, data, infer_missing, compact)",
+        ]
+    body.append("pending = None")
+    lazy_fields = {}
+    for index, f in enumerate(fields):
+        if f.default is None:
+            body.append(f"v = get({_json_name(f)!r})")
+        else:
+            namespace[f"d{index}"] = f.default
+            body.append(f"v = get({_json_name(f)!r}, d{index})")
+        lines = _compile_field(index, f, hints[f.name], namespace)
+        if f.default is None and _is_nested(hints[f.name]):
+            # nested field is decoded by function, also used by the descriptor at first access.
+            source = (
+                f"def field{index}(v, infer_missing, compact, lazy):\n"
+                + "\n".join(
+                    "    " + line
+                    for code in lines + ["return v"]
+                    for line in code.split("\n")
+                )
+            )
+            exec(
+                compile(
+                    source, f"<pyfacebook decoder {cls.__qualname__}.{f.name}>", "exec"
+                ),
+                namespace,
+            )
+            lazy_fields[f.name] = namespace[f"field{index}"]
+            body += [
+                "if lazy and v is not None:",
+                "    if pending is None:",
+                "        pending = {}",
+                f"    pending[{f.name!r}] = v",
+                f"    f{index} = None",
+                "else:",
+                f"    f{index} = field{index}(v, infer_missing, compact, lazy)",
+            ]
+        else:
+            body += lines
+            body.append(f"f{index} = v")
+    body.append("obj = new(cls)")
+    if len(fields) <= SHARED_KEYS_MAX:
+        body += _compile_shared_keys(fields, lazy_fields)
+    else:
+        body += _compile_dict(fields)
+    body.append("return obj")
+    namespace["PendingFields"] = PendingFields
+    source = (
+        "def decoder(data, infer_missing=False, compact=False, lazy=False):\n"
+        + "\n".join("    " + line for code in body for line in code.split("\n"))
+    )
+    exec(compile(source, f"<pyfacebook decoder {cls.__qualname__}>", "exec"), namespace)
+    # replace the None default on the class with the descriptor.
+    for name, decode_field in lazy_fields.items():
+        setattr(cls, name, LazyField(name, decode_field))
+    return namespace["decoder"]
+
+
+def _compile_shared_keys(
+    fields: Tuple[dataclasses.Field, ...], lazy_fields: dict
+) -> List[str]:
+    """
+    Set fields as attributes in the same order for all instances, so the instances share the keys of the class,
+    and each instance only saves the values. This is smaller than a dict even without the None fields,
+    so all fields are saved in compact mode too. Fields not decoded for lazy instances are not set.
+
+    :param fields: Fields of the model.
+    :param lazy_fields: Fields can be decoded lazily, by name.
+    :return: Lines to set the fields of ``obj``.
+    """
+    lines = []
+    for index, f in enumerate(fields):
+        if f.name in lazy_fields:
+            lines.append(
+                f"if pending is None or {f.name!r} not in pending: obj.{f.name} = f{index}"
+            )
+        else:
+            lines.append(f"obj.{f.name} = f{index}")
+    lines += [
+        "if pending is not None:",
+        "    obj._pending = PendingFields(pending, infer_missing, compact)",
+    ]
+    return lines
+
+
+def _compile_dict(fields: Tuple[dataclasses.Field, ...]) -> List[str]:
+    """
+    Set the dict of instance for models with more fields than the keys can be shared,
+    fields which are None are not saved in compact mode.
+
+    :param fields: Fields of the model.
+    :return: Lines to set the dict of ``obj``.
+    """
+    values = ", ".join(f"{f.name!r}: f{i}" for i, f in enumerate(fields))
+    lines = ["if compact:", "    d = {}"]
+    # field with None default is read from the class attribute, not need to save.
+    for index, f in enumerate(fields):
+        if f.default is None:
+            lines.append(f"    if f{index} is not None: d[{f.name!r}] = f{index}")
+        else:
+            lines.append(f"    d[{f.name!r}] = f{index}")
+    lines += [
+        "    obj.__dict__ = d",
+        "else:",
+        f"    obj.__dict__ = {{{values}}}",
+        "if pending is not None:",
+        "    d = obj.__dict__",
+        "    for name in pending:",
+        "        d.pop(name, None)",
+        "    d['_pending'] = PendingFields(pending, infer_missing, compact)",
+    ]
+    return lines
+
+
+def _from_dict(
+    cls: type,
+    data: dict,
+    infer_missing: bool = False,
+    compact: bool = False,
+    lazy: bool = False,
+) -> Any:
+    obj = cls.from_dict(data, infer_missing=infer_missing)
+    return _compact(obj) if compact else obj
+
+
+def _compact(value: Any) -> Any:
+    """
+    Remove fields which are None from instance decoded by ``from_dict``, and its nested instances,
+    for models with more fields than the keys can be shared.
+
+    :param value: Value decoded by ``from_dict``.
+    :return: The value.
+    """
+    if isinstance(value, list):
+        for item in value:
+            _compact(item)
+    elif dataclasses.is_dataclass(value) and hasattr(value, "__dict__"):
+        attrs = vars(value)
+        fields = dataclasses.fields(value)
+        # instances of models with few fields share keys, removing fields makes them larger.
+        shared = len(fields) <= SHARED_KEYS_MAX
+        for f in fields:
+            if not shared and f.default is None and attrs.get(f.name, 0) is None:
+                del attrs[f.name]
+            else:
+                _compact(attrs.get(f.name))
+    return value
+
+
+def get_decoder(cls: type) -> Decoder:
+    """
+    Get decoder for the model class, generate it at first time.
+
+    :param cls: Model class.
+    :return: Decoder.
+    """
+    decoder = _decoders.get(cls)
+    if decoder is None:
+        with _lock:
+            decoder = _decoders.get(cls)
+            if decoder is None:
+                decoder = compile_decoder(cls) or partial(_from_dict, cls)
+                _decoders[cls] = decoder
+    return decoder
+
+
+def decode(
+    cls: type,
+    data: dict,
+    infer_missing: bool = False,
+    compact: bool = False,
+    lazy: bool = False,
+) -> Any:
+    """
+    Decode json dict to the model, same as ``cls.from_dict``.
+
+    :param cls: Model class.
+    :param data: Json dict.
+    :param infer_missing: If set True, will let missing field (not have default vale) to None.
+    :param compact: If set True, fields which are None will not be saved on the instance,
+        read them from the class default, to reduce memory.
+    :param lazy: If set True, nested models and lists of models are kept as json, and decoded at first access.
+    :return: Model instance.
+    """
+    decoder = _decoders.get(cls)
+    if decoder is None:
+        decoder = get_decoder(cls)
+    return decoder(data, infer_missing, compact, lazy)
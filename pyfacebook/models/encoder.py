@@ -0,0 +1,146 @@
+"""
+Encoder for models.
+
+``DataClassJsonMixin.to_dict`` copies every value, and removing None values walked and copied the result again
+for each level. The encoder walks the model once, reads the json names of fields which are cached for each class,
+and drops None values during the walk. Values with json types are not copied.
+
+``json_default`` is the hook for json encoders to encode models while the encoder walks the data,
+so ``to_json`` and ``to_bytes`` not build the dict for the whole model first.
+"""
+
+import copy
+import dataclasses
+from collections.abc import Mapping
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dataclasses_json import DataClassJsonMixin, cfg
+from dataclasses_json.core import _ExtendedEncoder
+
+from pyfacebook.models.decoder import _json_name
+
+# attribute names and json names for the fields of model, None if the model can not be encoded by the encoder.
+_fields: Dict[type, Optional[Tuple[Tuple[str, str], ...]]] = {}
+
+_encode_default = _ExtendedEncoder().default
+
+
+def _get_fields(cls: type) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """
+    :param cls: Model class.
+    :return: Attribute names and json names for the fields, None if the model uses features
+        which the encoder not supports, like custom encoders.
+    """
+    try:
+        return _fields[cls]
+    except KeyError:
+        pass
+    names = None
+    if (
+        not getattr(cls, "dataclass_json_config", None)
+        and not cfg.global_config.encoders
+    ):
+        fields = dataclasses.fields(cls)
+        if all(
+            set(f.metadata.get("dataclasses_json", {})) <= {"letter_case"}
+            for f in fields
+        ):
+            names = tuple((f.name, _json_name(f)) for f in fields)
+    _fields[cls] = names
+    return names
+
+
+def to_dict(obj: Any, ignore_nan: bool = True, encode_json: bool = False) -> Any:
+    """
+    Convert model to dict, same as ``DataClassJsonMixin.to_dict`` with None values removed.
+
+    :param obj: Model instance, or list and dict of models.
+    :param ignore_nan: Is the result include None values in dicts.
+    :param encode_json: If set True, values not json types are encoded like ``to_dict``.
+    :return: Json data.
+    """
+
+    def convert(value: Any) -> Any:
+        cls = value.__class__
+        if cls is str or cls is int or cls is float or cls is bool or value is None:
+            return value
+        if cls is dict:
+            if ignore_nan:
+                return {k: convert(v) for k, v in value.items() if v is not None}
+            return {k: convert(v) for k, v in value.items()}
+        if cls is list:
+            return [convert(v) for v in value]
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            names = _get_fields(cls)
+            if names is None:
+                # model with custom encoders, let dataclasses_json to encode.
+                return convert(_fallback_to_dict(value, encode_json))
+            data = {}
+            for name, key in names:
+                v = getattr(value, name)
+                if v is None:
+                    if not ignore_nan:
+                        data[key] = None
+                else:
+                    data[key] = convert(v)
+            return data
+        if isinstance(value, Mapping):
+            return convert({convert(k): v for k, v in value.items()})
+        if isinstance(value, (str, bytes, Enum)) or not hasattr(value, "__iter__"):
+            value = copy.deepcopy(value)
+            return _encode_default(value) if encode_json else value
+        return [convert(v) for v in value]
+
+    return convert(obj)
+
+
+def json_default(ignore_nan: bool = True) -> Callable[[Any], Any]:
+    """
+    Build the ``default`` hook for json encoders, which converts each model to a dict of its fields when
+    the encoder reaches it, nested models are left to the encoder. Only dicts and lists in fields are copied
+    to remove None values.
+
+    :param ignore_nan: Is the result include None values in dicts.
+    :return: Function to convert object not supported by json.
+    """
+
+    def default(value: Any) -> Any:
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            names = _get_fields(value.__class__)
+            if names is None:
+                return to_dict(value, ignore_nan=ignore_nan)
+            data = {}
+            for name, key in names:
+                v = getattr(value, name)
+                if v is None:
+                    if not ignore_nan:
+                        data[key] = None
+                elif ignore_nan:
+                    data[key] = _strip_none(v)
+                else:
+                    data[key] = v
+            return data
+        value = _encode_default(value)
+        return _strip_none(value) if ignore_nan else value
+
+    return default
+
+
+def _strip_none(value: Any) -> Any:
+    """
+    :param value: Value of field.
+    :return: Dicts and lists copied without None values in dicts, models in them are not changed.
+    """
+    cls = value.__class__
+    if cls is dict:
+        return {k: _strip_none(v) for k, v in value.items() if v is not None}
+    if cls is list or cls is tuple:
+        return [_strip_none(v) for v in value]
+    return value
+
+
+def _fallback_to_dict(obj: Any, encode_json: bool) -> dict:
+    if isinstance(obj, DataClassJsonMixin):
+        return DataClassJsonMixin.to_dict(obj, encode_json=encode_json)
+    return dataclasses.asdict(obj)
@@ -1,12 +1,22 @@
-import json
+import contextlib
+import contextvars
 import logging
-from collections import defaultdict
+import math
+import threading
+import time
 from dataclasses import dataclass
-from json.decoder import JSONDecodeError
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from requests.models import CaseInsensitiveDict
 
+from pyfacebook.codec import JsonCodec, get_codec
+from pyfacebook.exceptions import LibraryError, RateLimitError
+from pyfacebook.ratelimit_store import (
+    OBSERVED_AT,
+    RateLimitStore,
+    MemoryRateLimitStore,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,10 +31,10 @@ class PercentSecond(object):
     seconds: int
 
 
-@dataclass
+@dataclass(frozen=True)
 class RateLimitHeader(object):
     """
-    A class representing the rate limit header.
+    A class representing the rate limit header, it's immutable.
     Refer: https://developers.facebook.com/docs/graph-api/overview/rate-limiting#headers
     """
 
@@ -63,8 +73,14 @@ class RateLimit(object):
     """
 
     DEFAULT_TIME_WINDOW = 60 * 60
+    DEFAULT_REFRESH_INTERVAL = 1
 
-    def __init__(self):
+    def __init__(
+        self,
+        store: Optional[RateLimitStore] = None,
+        json_codec: Union[str, JsonCodec, None] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
         """
         Instantiates the RateLimitObject. Takes a json dict as
         kwargs and maps to the object's dictionary. So for something like:
@@ -100,54 +116,172 @@ class RateLimit(object):
         or:
             api.rate_limit.get_limit(object_id="123456", endpoint="pages")
         and a RateLimitHeader instance will be returned.
+
+        The resources will be replaced by a new one when update, never changed in place.
+        So it's safe to read the resources while other threads updating.
+
+        :param store: Store to share the usage with other clients, processes or hosts.
+            Default is a memory store for this instance.
+        :param json_codec: Codec to parse the usage headers, default is the default codec.
+        :param refresh_interval: Seconds to use the usage before loading from the shared store again,
+            by ``refresh_if_stale``.
         """
+        # usage in the default store is only updated by this instance, no need to refresh.
+        self.shared = store is not None
+        self.store = store if store is not None else MemoryRateLimitStore()
+        self.json_codec = get_codec(json_codec)
+        self.refresh_interval = refresh_interval
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        # field -> (usage, RateLimitHeader), reuse headers for usage not changed.
+        self._headers: Dict[str, Tuple[dict, RateLimitHeader]] = {}
+        # field -> timestamp got the usage.
+        self._observed_at: Dict[str, float] = {}
         self.resources = {
             "app": RateLimitHeader(),
-            "business": defaultdict(lambda: defaultdict(RateLimitHeader)),
+            "business": {},
             "ad_account": RateLimitHeader(),
         }
 
     @staticmethod
-    def parse_headers(headers: CaseInsensitiveDict, key: str) -> Optional[dict]:
+    def parse_headers(
+        headers: CaseInsensitiveDict, key: str, json_codec: Optional[JsonCodec] = None
+    ) -> Optional[dict]:
         """
         Get rate limit information from header for key.
         :param headers: Response headers
         :param key: rate limit key
+        :param json_codec: Codec to parse the header, default is the default codec.
         :return:
         """
         usage = headers.get(key)
         if usage:
             try:
-                data = json.loads(usage)
+                data = get_codec(json_codec).loads(usage)
                 return data
-            except JSONDecodeError as ex:
+            except ValueError as ex:
                 logger.error(
                     f"Exception in parse {key} data error. Usage is: {usage}. errors: {ex}"
                 )
                 return None
         return None
 
-    def set_limit(self, headers: CaseInsensitiveDict):
+    def set_limit(self, headers: CaseInsensitiveDict) -> List[str]:
         """
         Get rate limit data from response headers. And update to instance.
         :param headers: Response headers
-        :return: None
+        :return: Business object ids which have usage in the headers.
         """
-        app_usage = self.parse_headers(headers, "x-app-usage")
+        app_usage = self.parse_headers(headers, "x-app-usage", self.json_codec)
+        business_usage = self.parse_headers(
+            headers, "x-business-use-case-usage", self.json_codec
+        )
+        ad_account_usage = self.parse_headers(
+            headers, "x-ad-account-usage", self.json_codec
+        )
+        if app_usage is None and business_usage is None and ad_account_usage is None:
+            return []
+
+        usage = {}
         if app_usage is not None:
-            self.resources["app"] = RateLimitHeader(**app_usage)
+            usage["app"] = app_usage
+        for business_id, items in (business_usage or {}).items():
+            for item in items:
+                usage[f"business:{business_id}:{item['type']}"] = item
+        if ad_account_usage is not None:
+            usage["ad_account"] = ad_account_usage
+        observed_at = time.time()
+        for data in usage.values():
+            data[OBSERVED_AT] = observed_at
 
-        business_usage = self.parse_headers(headers, "x-business-use-case-usage")
-        if business_usage is not None:
-            for business_id, items in business_usage.items():
-                for item in items:
-                    self.resources["business"][business_id][item["type"]] = (
-                        RateLimitHeader(**item)
-                    )
+        with self._lock:
+            try:
+                merged = self.store.update(usage)
+            except Exception as ex:
+                # the response is got, keep the usage for this instance only.
+                logger.warning(f"Exception in save rate limit usage. errors: {ex}")
+                merged = {
+                    **{field: data for field, (data, _) in self._headers.items()},
+                    **usage,
+                }
+            self._set_resources(merged)
+            self._refreshed_at = time.monotonic()
+        return list(business_usage or {})
 
-        ad_account_usage = self.parse_headers(headers, "x-ad-account-usage")
-        if ad_account_usage is not None:
-            self.resources["ad_account"] = RateLimitHeader(**ad_account_usage)
+    def refresh(self) -> bool:
+        """
+        Load the usage from store, which may be updated by other processes or hosts.
+
+        :return: Whether any usage is changed.
+        """
+        with self._lock:
+            try:
+                usage = self.store.load()
+            except Exception as ex:
+                logger.warning(f"Exception in load rate limit usage. errors: {ex}")
+                return False
+            finally:
+                self._refreshed_at = time.monotonic()
+            return self._set_resources(usage)
+
+    def refresh_if_stale(self) -> bool:
+        """
+        Load the usage from the shared store if not loaded in ``refresh_interval`` seconds,
+        called before sending requests.
+
+        :return: Whether any usage is changed by the loading.
+        """
+        if not self.shared:
+            return False
+        if time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return False
+        return self.refresh()
+
+    def _set_resources(self, usage: Dict[str, dict]) -> bool:
+        """
+        Convert the usage in store to resources, and publish the new data at once.
+
+        :param usage: All usage by field in store.
+        :return: Whether any usage is changed.
+        """
+        resources = {
+            "app": RateLimitHeader(),
+            "business": {},
+            "ad_account": RateLimitHeader(),
+        }
+        headers, observed, changed = {}, {}, False
+        for field, data in usage.items():
+            cached = self._headers.get(field)
+            if cached is not None and (cached[0] is data or cached[0] == data):
+                header = cached[1]
+            else:
+                header = RateLimitHeader(
+                    **{key: value for key, value in data.items() if key != OBSERVED_AT}
+                )
+                changed = True
+            headers[field] = (data, header)
+            if OBSERVED_AT in data:
+                observed[field] = data[OBSERVED_AT]
+
+            if field.startswith("business:"):
+                _, business_id, rate_limit_type = field.split(":", 2)
+                resources["business"].setdefault(business_id, {})[
+                    rate_limit_type
+                ] = header
+            else:
+                resources[field] = header
+        self._headers = headers
+        self._observed_at = observed
+        self.resources = resources
+        return changed
+
+    def snapshot(self) -> dict:
+        """
+        Get current rate limit data, the data will not be changed by later responses.
+
+        :return: Resources like {"app": RateLimitHeader, "business": {...}, "ad_account": RateLimitHeader}
+        """
+        return self.resources
 
     def get_limit(
         self,
@@ -164,20 +298,49 @@ class RateLimit(object):
         :param ad_account_limit: Whether to return x-Ad-Account-Usage limit.
         :return: RateLimitHeader object containing rate limit information.
         """
+        resources = self.resources
         if all([object_id, rate_limit_type]):
-            return self.resources["business"][object_id][rate_limit_type]
+            limits = resources["business"].get(object_id, {})
+            return limits.get(rate_limit_type, RateLimitHeader())
         if ad_account_limit:
-            return self.resources["ad_account"]
-        return self.resources["app"]
+            return resources["ad_account"]
+        return resources["app"]
 
-    def get_max_percent(self) -> int:
-        # TODO Now only check app usage.
-        app_usage = self.resources["app"]
-        percent = app_usage.max_percent()
-        return percent
+    def get_max_percent(self, object_id: Optional[str] = None) -> int:
+        """
+        Get max usage percent.
+
+        :param object_id: Business object id, return the max percent of its business use case
+            usage for all types. If not provided, return app usage.
+        :return: Usage percent.
+        """
+        if object_id is None:
+            return self.resources["app"].max_percent()
+        limits = self.resources["business"].get(object_id, {})
+        return max((limit.max_percent() for limit in limits.values()), default=0)
+
+    def get_regain_seconds(self, object_id: str) -> int:
+        """
+        Get seconds to regain access for the business object, which is throttled.
+
+        :param object_id: Business object id.
+        :return: seconds, the time passed since the usage observed is excluded.
+        """
+        limits = self.resources["business"].get(object_id, {})
+        observed, now = self._observed_at, time.time()
+        seconds = 0.0
+        for rate_limit_type, limit in limits.items():
+            regain = float(limit.estimated_time_to_regain_access or 0) * 60
+            observed_at = observed.get(f"business:{object_id}:{rate_limit_type}")
+            if observed_at is not None:
+                regain -= max(now - observed_at, 0)
+            seconds = max(seconds, regain)
+        return math.ceil(seconds)
 
     def get_sleep_seconds(
-        self, sleep_data: Optional[List[PercentSecond]] = None
+        self,
+        sleep_data: Optional[List[PercentSecond]] = None,
+        object_id: Optional[str] = None,
     ) -> int:
         """
         Get seconds to sleep in requests.
@@ -190,13 +353,208 @@ class RateLimit(object):
                 PercentSecond(percent=90,seconds=10),
                 PercentSecond(percent=100,seconds=1800),
             ]
+        :param object_id: Business object id, get seconds for requests to this object by its
+            business use case usage, at least the seconds to regain access.
         :return: sleep seconds
         """
+        seconds = 0  # Default sleep seconds is 0
         if isinstance(sleep_data, list):
-            max_percent = self.get_max_percent()
+            max_percent = self.get_max_percent(object_id=object_id)
             for ps in sleep_data:
                 if max_percent <= ps.percent:
-                    return ps.seconds
-            return 60 * 10  # sleep 10 minutes
-        # Default sleep seconds is 0
-        return 0
+                    seconds = ps.seconds
+                    break
+            else:
+                seconds = 60 * 10  # sleep 10 minutes
+        if object_id is not None:
+            seconds = max(seconds, self.get_regain_seconds(object_id=object_id))
+        return seconds
+
+
+class RateLimitScheduler(object):
+    """
+    A class to decide whether a request can be sent before dispatch.
+
+    After each response, the client tells the scheduler how long to wait by ``delay``.
+    Then the next request will wait in ``acquire`` until the time comes, or raise ``RateLimitError``
+    with policy ``raise``, or the wait can't finish before the deadline, or the scheduler is cancelled.
+
+    Keys can have an owner by ``set_owner``, like instagram media for the business account,
+    requests for the key wait for the owner's delays too.
+
+    Usage:
+
+        scheduler = RateLimitScheduler(policy="raise")
+        api = GraphAPI(access_token="token", scheduler=scheduler)
+        try:
+            api.get_object(object_id="20531316728")
+        except RateLimitError as ex:
+            reschedule(ex.wait_seconds)
+    """
+
+    SLEEP = "sleep"
+    RAISE = "raise"
+    MAX_OWNERS = 10000
+    ASYNC_CHECK_INTERVAL = 1
+
+    def __init__(self, policy: str = SLEEP, max_wait: Optional[float] = None):
+        """
+        :param policy: What to do when need to wait, ``sleep`` or ``raise``.
+        :param max_wait: Max seconds to wait for one request, longer wait will raise.
+        """
+        if policy not in (self.SLEEP, self.RAISE):
+            raise LibraryError({"message": f"Invalid scheduler policy {policy}"})
+        self.policy = policy
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._next_times: Dict[Optional[str], float] = {}
+        # key -> owner key, oldest keys are removed after MAX_OWNERS.
+        self._owners: Dict[str, str] = {}
+        self._deadline = contextvars.ContextVar(
+            f"pyfacebook_deadline_{id(self)}", default=None
+        )
+
+    def delay(self, seconds: float, key: Optional[str] = None) -> None:
+        """
+        Delay the next requests.
+
+        :param seconds: Seconds to wait from now.
+        :param key: Key for the requests, None for all requests.
+        """
+        if not seconds or seconds <= 0:
+            return
+        now = time.monotonic()
+        next_time = now + seconds
+        with self._lock:
+            if next_time > self._next_times.get(key, 0):
+                # remove expired delays, keys for many objects not grow forever.
+                next_times = {k: t for k, t in self._next_times.items() if t > now}
+                next_times[key] = next_time
+                self._next_times = next_times
+
+    def set_owner(self, key: str, owner: str) -> None:
+        """
+        Set the owner for the key, requests for the key will wait for the owner's delays.
+
+        :param key: Key for the requests, like instagram media id.
+        :param owner: Key for the owner, like instagram business account id.
+        """
+        if key == owner or self._owners.get(key) == owner:
+            return
+        with self._lock:
+            owners = self._owners
+            owners.pop(key, None)
+            owners[key] = owner
+            while len(owners) > self.MAX_OWNERS:
+                owners.pop(next(iter(owners)))
+
+    def get_owner(self, key: str) -> Optional[str]:
+        """
+        :param key: Key for the requests.
+        :return: Owner key, None if not known.
+        """
+        return self._owners.get(key)
+
+    def predict_wait(self, key: Optional[str] = None) -> float:
+        """
+        Get seconds to wait before the request can be sent.
+
+        :param key: Key for the request.
+        :return: Seconds to wait, 0 if can be sent now.
+        """
+        now = time.monotonic()
+        next_times = self._next_times
+        next_time = next_times.get(None, 0)
+        if key is not None:
+            next_time = max(next_time, next_times.get(key, 0))
+            owner = self._owners.get(key)
+            if owner is not None:
+                next_time = max(next_time, next_times.get(owner, 0))
+        return max(next_time - now, 0)
+
+    @contextlib.contextmanager
+    def deadline(self, seconds: float) -> Iterator[None]:
+        """
+        Requests in this context should be sent in seconds, or raise ``RateLimitError``.
+
+        :param seconds: Seconds from now.
+        """
+        token = self._deadline.set(time.monotonic() + seconds)
+        try:
+            yield
+        finally:
+            self._deadline.reset(token)
+
+    def acquire(self, key: Optional[str] = None) -> float:
+        """
+        Wait until the request can be sent.
+
+        :param key: Key for the request.
+        :return: Seconds waited.
+        :raises RateLimitError: Request can not be sent.
+        """
+        waited = 0.0
+        while True:
+            wait = self._check_wait(key=key, waited=waited)
+            if wait <= 0:
+                return waited
+            start = time.monotonic()
+            self._cancelled.wait(wait)
+            waited += time.monotonic() - start
+
+    async def acquire_async(self, key: Optional[str] = None) -> float:
+        """
+        Wait until the request can be sent, without blocking the event loop.
+        Cancel is checked every ``ASYNC_CHECK_INTERVAL`` seconds while waiting.
+
+        :param key: Key for the request.
+        :return: Seconds waited.
+        :raises RateLimitError: Request can not be sent.
+        """
+        # only load asyncio for async clients.
+        import asyncio
+
+        waited = 0.0
+        while True:
+            wait = self._check_wait(key=key, waited=waited)
+            if wait <= 0:
+                return waited
+            start = time.monotonic()
+            await asyncio.sleep(min(wait, self.ASYNC_CHECK_INTERVAL))
+            waited += time.monotonic() - start
+
+    def _check_wait(self, key: Optional[str], waited: float) -> float:
+        """
+        :param key: Key for the request.
+        :param waited: Seconds waited before.
+        :return: Seconds to wait, 0 if can be sent now.
+        :raises RateLimitError: Request can not be sent.
+        """
+        if self._cancelled.is_set():
+            raise RateLimitError("Waiting for rate limit is cancelled", 0)
+        wait = self.predict_wait(key=key)
+        if wait <= 0:
+            return 0
+        if self.policy == self.RAISE:
+            raise RateLimitError("Need wait for rate limit", wait)
+        if self.max_wait is not None and waited + wait > self.max_wait:
+            raise RateLimitError("Need wait longer than max wait", wait)
+        deadline = self._deadline.get()
+        if deadline is not None and time.monotonic() + wait > deadline:
+            raise RateLimitError("Need wait beyond the deadline", wait)
+        return wait
+
+    def cancel(self) -> None:
+        """
+        Cancel all waiting requests and later requests, until ``reset``.
+        """
+        self._cancelled.set()
+
+    def reset(self) -> None:
+        """
+        Clear the delays and cancel state.
+        """
+        with self._lock:
+            self._next_times = {}
+        self._cancelled.clear()
@@ -0,0 +1,225 @@
+"""
+Stores to share the rate limit usage between clients, processes and hosts.
+
+Usage is saved by field, the fields are:
+
+    app: x-app-usage
+    ad_account: x-ad-account-usage
+    business:{business_id}:{type}: x-business-use-case-usage for the object with type
+
+Each usage has the key ``observed_at`` for the timestamp got the usage,
+usage observed before ``ttl`` seconds is removed when updating.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from pyfacebook.exceptions import LibraryError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+OBSERVED_AT = "observed_at"
+DEFAULT_TTL = 60 * 60
+
+
+class RateLimitStore(object):
+    """
+    Base class for rate limit stores.
+    """
+
+    def update(self, usage: Dict[str, dict]) -> Dict[str, dict]:
+        """
+        Save usage for fields, other fields are kept.
+
+        :param usage: Usage by field.
+        :return: All usage in the store.
+        """
+        raise NotImplementedError
+
+    def load(self) -> Dict[str, dict]:
+        """
+        :return: All usage in the store.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def get_expired(usage: Dict[str, dict], ttl: Optional[float]) -> List[str]:
+        """
+        :param usage: Usage by field.
+        :param ttl: Seconds to keep the usage after observed, None to keep forever.
+        :return: Fields observed before ttl seconds, usage without the time is kept.
+        """
+        if not ttl:
+            return []
+        expire_at = time.time() - ttl
+        return [
+            field
+            for field, value in usage.items()
+            if value.get(OBSERVED_AT, expire_at + 1) <= expire_at
+        ]
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Store usage in memory, can be shared by clients in one process.
+    """
+
+    def __init__(self, ttl: Optional[float] = DEFAULT_TTL):
+        """
+        :param ttl: Seconds to keep the usage after observed, the usage is for one hour.
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._usage: Dict[str, dict] = {}
+
+    def update(self, usage: Dict[str, dict]) -> Dict[str, dict]:
+        with self._lock:
+            # replace with new dict, the returned dict will not be changed.
+            merged = {**self._usage, **usage}
+            for field in self.get_expired(merged, self.ttl):
+                del merged[field]
+            self._usage = merged
+            return merged
+
+    def load(self) -> Dict[str, dict]:
+        return self._usage
+
+
+class FileRateLimitStore(RateLimitStore):
+    """
+    Store usage in a memory mapped file, can be shared by processes in one host.
+    The file is locked with ``fcntl.flock`` when read and write, so only for POSIX.
+
+    The file begins with the version and the length for data, then the data with json.
+    """
+
+    HEADER = struct.Struct("<QQ")
+
+    def __init__(
+        self, path: str, size: int = 1024 * 1024, ttl: Optional[float] = DEFAULT_TTL
+    ):
+        """
+        :param path: Path for the file, created if not exists.
+        :param size: Size for the file, data larger than this can not be saved.
+        :param ttl: Seconds to keep the usage after observed, the usage is for one hour.
+        """
+        if fcntl is None:  # pragma: no cover
+            raise LibraryError({"message": "File store need fcntl, only for POSIX"})
+        self.path = path
+        self.size = max(size, self.HEADER.size + 2)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = -1
+        self._usage: Dict[str, dict] = {}
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < self.size:
+                os.ftruncate(self._fd, self.size)
+            else:
+                self.size = os.fstat(self._fd).st_size
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._mmap = mmap.mmap(self._fd, self.size)
+
+    def _read(self) -> Dict[str, dict]:
+        version, length = self.HEADER.unpack_from(self._mmap, 0)
+        # data not changed by other processes.
+        if version != self._version:
+            start = self.HEADER.size
+            data = self._mmap[start : start + length]
+            self._usage = json.loads(data) if data else {}
+            self._version = version
+        return self._usage
+
+    def update(self, usage: Dict[str, dict]) -> Dict[str, dict]:
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                merged = {**self._read(), **usage}
+                for field in self.get_expired(merged, self.ttl):
+                    del merged[field]
+                data = json.dumps(merged, separators=(",", ":")).encode("utf-8")
+                if self.HEADER.size + len(data) > self.size:
+                    raise LibraryError(
+                        {"message": f"Rate limit usage is larger than {self.size}"}
+                    )
+                self._mmap[self.HEADER.size : self.HEADER.size + len(data)] = data
+                self._version += 1
+                self.HEADER.pack_into(self._mmap, 0, self._version, len(data))
+                self._usage = merged
+                return merged
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def load(self) -> Dict[str, dict]:
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_SH)
+            try:
+                return self._read()
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        self._mmap.close()
+        os.close(self._fd)
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Store usage in a redis hash, can be shared by hosts.
+    Any client with ``hset``, ``hgetall``, ``hdel`` and ``expire`` like ``redis.Redis`` can be used.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        key: str = "pyfacebook:rate_limit",
+        ttl: Optional[int] = DEFAULT_TTL,
+    ):
+        """
+        :param client: Redis client.
+        :param key: Key for the hash.
+        :param ttl: Seconds to keep the usage after observed, the usage is for one hour.
+            The hash expires after ttl seconds without updates.
+        """
+        self.client = client
+        self.key = key
+        self.ttl = ttl
+
+    def update(self, usage: Dict[str, dict]) -> Dict[str, dict]:
+        if usage:
+            self.client.hset(
+                self.key,
+                mapping={
+                    field: json.dumps(value, separators=(",", ":"))
+                    for field, value in usage.items()
+                },
+            )
+            if self.ttl:
+                self.client.expire(self.key, self.ttl)
+        merged = self.load()
+        expired = self.get_expired(merged, self.ttl)
+        if expired:
+            self.client.hdel(self.key, *expired)
+            for field in expired:
+                del merged[field]
+        return merged
+
+    def load(self) -> Dict[str, dict]:
+        data = self.client.hgetall(self.key) or {}
+        usage = {}
+        for field, value in data.items():
+            if isinstance(field, bytes):
+                field = field.decode("utf-8")
+            usage[field] = json.loads(value)
+        return usage
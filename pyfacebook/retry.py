@@ -0,0 +1,232 @@
+"""
+Retry policy for requests failed with transient errors.
+
+Refer: https://developers.facebook.com/docs/graph-api/guides/error-handling
+"""
+
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence, Union
+
+import requests
+from requests import Response
+
+from pyfacebook.codec import JsonCodec, get_codec
+from pyfacebook.exceptions import FacebookError
+
+
+@dataclass
+class RetryMetrics:
+    """
+    A class representing the statistics for retries.
+
+    requests: Count of requests checked by the policy.
+    retries: Count of retries.
+    gave_up: Count of transient errors not retried, as retries, wait or budget exhausted.
+    budget_exhausted: Count of retries denied by the retry budget.
+    wait_seconds: Total seconds waited before retries.
+    retries_by_code: Count of retries by error code, ``connection`` for connection errors.
+    """
+
+    requests: int = 0
+    retries: int = 0
+    gave_up: int = 0
+    budget_exhausted: int = 0
+    wait_seconds: float = 0.0
+    retries_by_code: Dict[str, int] = field(default_factory=dict)
+
+
+class RetryBudget(object):
+    """
+    Limit retries to a ratio of requests, avoid retry storms when the graph is throttling.
+
+    Each request deposits ``ratio`` token, each retry withdraws one token.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: int = 10):
+        """
+        :param ratio: Retries allowed for each request.
+        :param min_tokens: Tokens at beginning, also tokens can be kept is at least this.
+        """
+        self.ratio = ratio
+        self.max_tokens = max(min_tokens, 1)
+        self._tokens = float(self.max_tokens)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        """
+        :return: Whether a retry is allowed.
+        """
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class RetryPolicy(object):
+    """
+    Retry requests failed with transient errors, with exponential backoff and jitter.
+
+    Usage:
+
+        api = GraphAPI(access_token="token", retry_policy=RetryPolicy(max_retries=3))
+        api.retry_policy.metrics
+    """
+
+    # Refer: https://developers.facebook.com/docs/graph-api/guides/error-handling#errorcodes
+    TRANSIENT_CODES = {1, 2, 4, 17, 32, 341, 613}
+    PERMANENT_CODES = {100, 190, 200}
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        max_backoff: float = 60.0,
+        max_wait: Optional[float] = 60.0 * 5,
+        jitter: bool = True,
+        allowed_methods: Sequence[str] = ("GET",),
+        budget: Optional[RetryBudget] = None,
+        on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    ):
+        """
+        :param max_retries: Max retries for one request.
+        :param backoff_factor: Backoff seconds is ``backoff_factor * 2 ** retries``.
+        :param max_backoff: Max seconds for backoff.
+        :param max_wait: Max seconds to wait before retry, include time to regain access for
+            rate limit, if need wait longer, the error will not be retried.
+        :param jitter: Whether to random the backoff seconds from 0 to backoff.
+        :param allowed_methods: HTTP methods which can be retried, POST is not idempotent,
+            add it only if your requests can be sent twice.
+        :param budget: Retry budget, default allows retries for 20% of requests.
+        :param on_retry: Callback for each retry with retry number, the error and seconds to wait.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_wait = max_wait
+        self.jitter = jitter
+        self.allowed_methods = {m.upper() for m in allowed_methods}
+        self.budget = budget if budget is not None else RetryBudget()
+        self.on_retry = on_retry
+        self._lock = threading.Lock()
+        self._metrics = RetryMetrics()
+
+    @property
+    def metrics(self) -> RetryMetrics:
+        with self._lock:
+            return RetryMetrics(
+                requests=self._metrics.requests,
+                retries=self._metrics.retries,
+                gave_up=self._metrics.gave_up,
+                budget_exhausted=self._metrics.budget_exhausted,
+                wait_seconds=self._metrics.wait_seconds,
+                retries_by_code=dict(self._metrics.retries_by_code),
+            )
+
+    def is_transient(self, error: Exception) -> bool:
+        """
+        Check whether the error is transient, the request may succeed if retry later.
+
+        :param error: Error for the request.
+        :return: Transient or not.
+        """
+        if isinstance(error, FacebookError):
+            if getattr(error, "is_transient", False):
+                return True
+            code = getattr(error, "code", None)
+            if code in self.PERMANENT_CODES:
+                return False
+            return code in self.TRANSIENT_CODES
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    @staticmethod
+    def get_error(
+        response: Response, json_codec: Optional[JsonCodec] = None
+    ) -> Optional[FacebookError]:
+        """
+        Get graph error from the failed response.
+
+        :param response: Response for the request.
+        :param json_codec: Codec to decode the response, default is the default codec.
+        :return: Error, None if no graph error.
+        """
+        if response.ok or "json" not in response.headers.get("Content-Type", ""):
+            return None
+        try:
+            data = get_codec(json_codec).loads(response.content)
+        except ValueError:
+            return None
+        if isinstance(data, dict) and "error" in data:
+            return FacebookError(data)
+        return None
+
+    def backoff(self, retries: int) -> float:
+        """
+        :param retries: Count of retries before.
+        :return: Seconds to wait before next retry.
+        """
+        seconds = min(self.backoff_factor * (2**retries), self.max_backoff)
+        if self.jitter:
+            seconds = random.uniform(0, seconds)
+        return seconds
+
+    def start(self) -> None:
+        """
+        Record a new request.
+        """
+        self.budget.deposit()
+        with self._lock:
+            self._metrics.requests += 1
+
+    def get_wait(
+        self,
+        method: str,
+        retries: int,
+        error: Union[Exception, None],
+        regain_seconds: float = 0,
+    ) -> Optional[float]:
+        """
+        Decide whether to retry the request.
+
+        :param method: HTTP method for the request.
+        :param retries: Count of retries before.
+        :param error: Error for the request.
+        :param regain_seconds: Seconds to regain access for the rate limit.
+        :return: Seconds to wait before retry, None if not retry.
+        """
+        if (
+            error is None
+            or method.upper() not in self.allowed_methods
+            or not self.is_transient(error)
+        ):
+            return None
+
+        wait = max(self.backoff(retries), regain_seconds)
+        if retries >= self.max_retries or (
+            self.max_wait is not None and wait > self.max_wait
+        ):
+            with self._lock:
+                self._metrics.gave_up += 1
+            return None
+        if not self.budget.withdraw():
+            with self._lock:
+                self._metrics.gave_up += 1
+                self._metrics.budget_exhausted += 1
+            return None
+
+        code = str(getattr(error, "code", "connection"))
+        with self._lock:
+            self._metrics.retries += 1
+            self._metrics.wait_seconds += wait
+            self._metrics.retries_by_code[code] = (
+                self._metrics.retries_by_code.get(code, 0) + 1
+            )
+        if self.on_retry is not None:
+            self.on_retry(retries + 1, error, wait)
+        return wait
@@ -0,0 +1,316 @@
+"""
+Cache for access token information from ``debug_token``, and refresh long-lived tokens before they expire.
+"""
+
+import dataclasses
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pyfacebook.exceptions import LibraryError, PyFacebookException
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TokenInfo(object):
+    """
+    A class representing the information of an access token, it's immutable.
+    Refer: https://developers.facebook.com/docs/graph-api/reference/v21.0/debug_token
+    """
+
+    token: str
+    is_valid: bool = False
+    type: Optional[str] = None
+    app_id: Optional[str] = None
+    user_id: Optional[str] = None
+    profile_id: Optional[str] = None
+    scopes: Tuple[str, ...] = ()
+    expires_at: int = 0  # 0 for never expires.
+    data_access_expires_at: int = 0
+    checked_at: float = 0  # time for the information got.
+
+    @classmethod
+    def from_debug_data(
+        cls, token: str, data: dict, checked_at: Optional[float] = None
+    ) -> "TokenInfo":
+        """
+        :param token: Access token.
+        :param data: Response of ``debug_token``.
+        :param checked_at: Time for the data got, default is now.
+        :return: Token information.
+        """
+        data = data.get("data", data)
+        return cls(
+            token=token,
+            is_valid=bool(data.get("is_valid", False)),
+            type=data.get("type"),
+            app_id=data.get("app_id"),
+            user_id=data.get("user_id"),
+            profile_id=data.get("profile_id"),
+            scopes=tuple(data.get("scopes") or ()),
+            expires_at=int(data.get("expires_at") or 0),
+            data_access_expires_at=int(data.get("data_access_expires_at") or 0),
+            checked_at=time.time() if checked_at is None else checked_at,
+        )
+
+    def expires_in(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        :param now: Current time, default is now.
+        :return: Seconds before the token expires, None if never expires.
+        """
+        if not self.expires_at:
+            return None
+        return self.expires_at - (time.time() if now is None else now)
+
+    def has_scopes(self, scopes: Iterable[str]) -> bool:
+        """
+        :param scopes: Permissions the token should have.
+        :return: Whether the token has all scopes.
+        """
+        return set(scopes) <= set(self.scopes)
+
+
+class TokenCache(object):
+    """
+    A class caching token information from ``debug_token``, so checking the scopes and expiration of
+    tokens before each job not need to send requests.
+
+    The information is used until the ``ttl`` passed, or the token is going to expire in ``expire_margin``.
+    With the background refresh started, stale information is checked again in the background,
+    and long-lived user tokens expire in ``refresh_before`` are exchanged for new tokens,
+    then ``on_refresh`` is called with the old token and the new token information.
+
+    Usage:
+
+        api = GraphAPI(app_id="id", app_secret="secret", application_only_auth=True)
+        cache = TokenCache(api, on_refresh=lambda old, new: save_token(new.token))
+        cache.start()
+        info = cache.check("user token", scopes=["pages_show_list"])
+    """
+
+    def __init__(
+        self,
+        api,
+        app_token: Optional[str] = None,
+        ttl: Optional[float] = 60 * 60,
+        expire_margin: float = 60 * 10,
+        refresh_before: Optional[float] = 60 * 60 * 24 * 7,
+        on_refresh: Optional[Callable[[str, TokenInfo], None]] = None,
+    ):
+        """
+        :param api: Client to debug and refresh tokens, like ``GraphAPI`` with app token.
+        :param app_token: Token to debug tokens, default is the token of the client.
+        :param ttl: Seconds to use the information before checking again, None to use until near expiry.
+        :param expire_margin: Seconds before expiry to check the token again, once.
+        :param refresh_before: Seconds before expiry to refresh long-lived tokens in the background.
+            None to not refresh tokens.
+        :param on_refresh: Function called with the old token and the new token information after refreshed.
+        """
+        self.api = api
+        self.app_token = app_token
+        self.ttl = ttl
+        self.expire_margin = expire_margin
+        self.refresh_before = refresh_before
+        self.on_refresh = on_refresh
+        self._lock = threading.Lock()
+        self._infos: Dict[str, TokenInfo] = {}
+        # token -> lock, only one request to check the token at the same time.
+        self._token_locks: Dict[str, threading.Lock] = {}
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._infos)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._infos
+
+    def is_fresh(
+        self, info: TokenInfo, now: Optional[float] = None, check_ttl: bool = True
+    ) -> bool:
+        """
+        :param info: Token information.
+        :param now: Current time, default is now.
+        :param check_ttl: Whether the information is stale after ttl.
+        :return: Whether the information can be used without checking again.
+        """
+        now = time.time() if now is None else now
+        if check_ttl and self.ttl is not None and now - info.checked_at >= self.ttl:
+            return False
+        # check again once when near expiry, like the token is refreshed by others.
+        if info.expires_at:
+            check_at = info.expires_at - self.expire_margin
+            return not info.checked_at < check_at <= now
+        return True
+
+    def get(self, token: str, force: bool = False) -> TokenInfo:
+        """
+        Get token information, from cache if fresh, or by ``debug_token``.
+        With the background refresh started, information after ttl is still used until near expiry,
+        the background thread will check it again.
+
+        :param token: Access token.
+        :param force: Check the token even if the information is fresh.
+        :return: Token information.
+        """
+        info = self._infos.get(token)
+        if (
+            not force
+            and info is not None
+            and self.is_fresh(info, check_ttl=not self.running)
+        ):
+            return info
+        with self._get_token_lock(token):
+            current = self._infos.get(token)
+            # checked by other thread while waiting.
+            if current is not None and current is not info and self.is_fresh(current):
+                return current
+            return self._debug(token)
+
+    def check(self, token: str, scopes: Optional[Iterable[str]] = None) -> TokenInfo:
+        """
+        Get token information, and make sure the token is valid and has the scopes.
+
+        :param token: Access token.
+        :param scopes: Permissions the token should have.
+        :return: Token information.
+        :raises LibraryError: Token is invalid, expired or missing scopes.
+        """
+        info = self.get(token)
+        expires_in = info.expires_in()
+        if not info.is_valid or (expires_in is not None and expires_in <= 0):
+            raise LibraryError({"message": "Access token is invalid or expired"})
+        if scopes is not None and not info.has_scopes(scopes):
+            missing = ", ".join(sorted(set(scopes) - set(info.scopes)))
+            raise LibraryError({"message": f"Access token missing scopes: {missing}"})
+        return info
+
+    def invalidate(self, token: str) -> None:
+        """
+        Remove token information, the next ``get`` will check the token again.
+
+        :param token: Access token.
+        """
+        with self._lock:
+            self._infos.pop(token, None)
+            self._token_locks.pop(token, None)
+
+    def _get_token_lock(self, token: str) -> threading.Lock:
+        lock = self._token_locks.get(token)
+        if lock is None:
+            with self._lock:
+                lock = self._token_locks.setdefault(token, threading.Lock())
+        return lock
+
+    def _set(self, info: TokenInfo) -> TokenInfo:
+        with self._lock:
+            self._infos[info.token] = info
+        return info
+
+    def _debug(self, token: str) -> TokenInfo:
+        data = self.api.debug_token(input_token=token, access_token=self.app_token)
+        return self._set(TokenInfo.from_debug_data(token=token, data=data))
+
+    def _should_refresh(self, info: TokenInfo, now: float) -> bool:
+        if self.refresh_before is None or not info.is_valid:
+            return False
+        # page tokens and app tokens can not be exchanged.
+        if info.type not in (None, "USER"):
+            return False
+        expires_in = info.expires_in(now=now)
+        return expires_in is not None and 0 < expires_in <= self.refresh_before
+
+    def refresh(self, token: str) -> TokenInfo:
+        """
+        Exchange the long-lived token for a new one, by ``refresh_access_token`` for Instagram and Threads,
+        or ``exchange_long_lived_user_access_token`` for Facebook.
+
+        :param token: Long-lived user access token.
+        :return: New token information.
+        """
+        if hasattr(self.api, "refresh_access_token"):
+            data = self.api.refresh_access_token(access_token=token)
+        else:
+            data = self.api.exchange_long_lived_user_access_token(access_token=token)
+        expires_in = data.get("expires_in")
+        if expires_in is None:
+            # not know when the new token expires.
+            info = self._debug(data["access_token"])
+        else:
+            now = time.time()
+            old = self._infos.get(token) or TokenInfo(token=token, is_valid=True)
+            info = self._set(
+                dataclasses.replace(
+                    old,
+                    token=data["access_token"],
+                    expires_at=int(now + expires_in),
+                    checked_at=now,
+                )
+            )
+        if info.token != token:
+            self.invalidate(token)
+        if self.on_refresh is not None:
+            self.on_refresh(token, info)
+        return info
+
+    def refresh_due(self) -> List[TokenInfo]:
+        """
+        Refresh tokens going to expire and check stale information again, called by the background thread.
+        Errors for tokens are logged, not raised.
+
+        :return: Information updated.
+        """
+        now = time.time()
+        updated = []
+        for token, info in list(self._infos.items()):
+            try:
+                if self._should_refresh(info, now=now):
+                    updated.append(self.refresh(token))
+                elif not self.is_fresh(info, now=now):
+                    updated.append(self.get(token, force=True))
+            except PyFacebookException as ex:
+                logger.warning(f"Exception in refresh token information. errors: {ex}")
+        return updated
+
+    @property
+    def running(self) -> bool:
+        """
+        :return: Whether the background refresh is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float = 60) -> None:
+        """
+        Start the background thread to refresh tokens and information.
+
+        :param interval: Seconds between refreshes.
+        """
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval,),
+            name="pyfacebook-token-cache",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            try:
+                self.refresh_due()
+            except Exception:
+                logger.exception("Exception in refresh tokens")
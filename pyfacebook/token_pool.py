@@ -0,0 +1,209 @@
+"""
+Pool of access tokens, to serve many objects like pages with their own tokens by one client.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from requests.structures import CaseInsensitiveDict
+
+from pyfacebook.codec import JsonCodec, get_codec
+from pyfacebook.ratelimit import RateLimit
+
+logger = logging.getLogger(__name__)
+
+
+class TokenPool(object):
+    """
+    A class holding access tokens and the objects which they are for, like page tokens for pages.
+
+    Requests for an object are sent with the token for the object. If the object has several tokens,
+    the least loaded one is used, by the rate limit usage of each token, and then by the times it was picked.
+    Requests for objects without tokens are sent with the default token.
+
+    The object of a request is the first part of the url path, and the owner for ids like ``{page_id}_{post_id}``,
+    or all objects in parameter ``ids``. Objects like comments and media are not known to belong to a page,
+    add their ids for the token if requests for them need the page token.
+
+    Tokens and objects are replaced by new ones when changed, never changed in place.
+    So it's safe to pick tokens while other threads adding tokens.
+
+    Usage:
+
+        pool = TokenPool()
+        for page in api.user.get_accounts(user_id="me", fields="id,access_token").data:
+            pool.add_token(page.access_token, object_ids=[page.id])
+        api = FacebookApi(app_id="id", app_secret="secret", token_pool=pool)
+        api.page.get_info(page_id=page.id)  # sent with the token for the page.
+    """
+
+    def __init__(
+        self,
+        tokens: Optional[Dict[str, Iterable[str]]] = None,
+        default_token: Optional[str] = None,
+        json_codec: Union[str, JsonCodec, None] = None,
+    ):
+        """
+        :param tokens: Object ids for tokens, like {"page token": ["page id"]}.
+        :param default_token: Token for requests to objects without tokens, like user token.
+        :param json_codec: Codec to parse the usage headers, default is the default codec.
+        """
+        self.default_token = default_token
+        self.json_codec = get_codec(json_codec)
+        self._lock = threading.Lock()
+        # object id -> tokens
+        self._owners: Dict[str, Tuple[str, ...]] = {}
+        # token -> object ids
+        self._tokens: Dict[str, Tuple[str, ...]] = {}
+        # token -> rate limit, created for tokens have usage.
+        self._rate_limits: Dict[str, RateLimit] = {}
+        # token -> times picked, to spread requests for tokens with same usage.
+        self._picks: Dict[str, int] = {}
+        for token, object_ids in (tokens or {}).items():
+            self.add_token(token, object_ids=object_ids)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._tokens
+
+    @property
+    def tokens(self) -> List[str]:
+        return list(self._tokens)
+
+    def add_token(self, token: str, object_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Add token for objects, or add more objects for the token.
+
+        :param token: Access token.
+        :param object_ids: Ids of objects the token is for, like page id for page token.
+        """
+        object_ids = tuple(object_ids or ())
+        with self._lock:
+            owners = dict(self._owners)
+            for object_id in object_ids:
+                tokens = owners.get(object_id, ())
+                if token not in tokens:
+                    owners[object_id] = tokens + (token,)
+            tokens = dict(self._tokens)
+            current = tokens.get(token, ())
+            tokens[token] = current + tuple(
+                oid for oid in dict.fromkeys(object_ids) if oid not in current
+            )
+            self._owners, self._tokens = owners, tokens
+
+    def remove_token(self, token: str) -> None:
+        """
+        Remove token, like the token is expired or revoked.
+
+        :param token: Access token.
+        """
+        with self._lock:
+            tokens = dict(self._tokens)
+            object_ids = tokens.pop(token, ())
+            owners = dict(self._owners)
+            for object_id in object_ids:
+                remaining = tuple(t for t in owners.get(object_id, ()) if t != token)
+                if remaining:
+                    owners[object_id] = remaining
+                else:
+                    owners.pop(object_id, None)
+            self._owners, self._tokens = owners, tokens
+            self._rate_limits.pop(token, None)
+            self._picks.pop(token, None)
+
+    def get_tokens(self, object_id: str) -> Tuple[str, ...]:
+        """
+        :param object_id: Object id.
+        :return: Tokens for the object.
+        """
+        return self._owners.get(object_id, ())
+
+    def get_rate_limit(self, token: str) -> RateLimit:
+        """
+        :param token: Access token.
+        :return: Rate limit usage for requests sent with the token.
+        """
+        rate_limit = self._rate_limits.get(token)
+        if rate_limit is None:
+            with self._lock:
+                rate_limit = self._rate_limits.get(token)
+                if rate_limit is None:
+                    rate_limit = RateLimit(json_codec=self.json_codec)
+                    self._rate_limits[token] = rate_limit
+        return rate_limit
+
+    def get_load(self, token: str, object_id: Optional[str] = None) -> int:
+        """
+        :param token: Access token.
+        :param object_id: Object id, count its business use case usage for the token.
+        :return: Max usage percent for the token.
+        """
+        rate_limit = self._rate_limits.get(token)
+        if rate_limit is None:
+            return 0
+        percent = rate_limit.get_max_percent()
+        if object_id is not None:
+            percent = max(percent, rate_limit.get_max_percent(object_id=object_id))
+            if rate_limit.get_regain_seconds(object_id=object_id):
+                # throttled, use other tokens if have.
+                percent = max(percent, 100)
+        return percent
+
+    def get_token(
+        self,
+        object_id: Optional[str] = None,
+        object_ids: Optional[Iterable[str]] = None,
+    ) -> Optional[str]:
+        """
+        Pick token for request to the object, or to multi objects like ``?ids=a,b``.
+
+        :param object_id: Object id the request is for.
+        :param object_ids: Object ids the request is for, the token should be for all of them.
+        :return: The least loaded token for the objects,
+            or the default token if the objects have no common token.
+        """
+        object_ids = tuple(object_ids or ()) or (
+            (object_id,) if object_id is not None else ()
+        )
+        if not object_ids:
+            return self.default_token
+        owners = self._owners
+        tokens = owners.get(object_ids[0], ())
+        for oid in object_ids[1:]:
+            if not tokens:
+                break
+            others = owners.get(oid, ())
+            tokens = tuple(t for t in tokens if t in others)
+        if not tokens:
+            logger.debug(
+                f"No token in pool for objects {','.join(object_ids)}, use the default token"
+            )
+            return self.default_token
+        if len(tokens) == 1:
+            return tokens[0]
+        with self._lock:
+            picks = self._picks
+            token = min(
+                tokens,
+                key=lambda t: (
+                    max(self.get_load(t, oid) for oid in object_ids),
+                    picks.get(t, 0),
+                ),
+            )
+            picks[token] = picks.get(token, 0) + 1
+        return token
+
+    def set_limit(self, token: str, headers: CaseInsensitiveDict) -> List[str]:
+        """
+        Update rate limit usage for the token from response headers.
+
+        :param token: Access token the request sent with.
+        :param headers: Response headers
+        :return: Business object ids which have usage in the headers.
+        """
+        if token not in self._tokens:
+            return []
+        return self.get_rate_limit(token).set_limit(headers)
@@ -0,0 +1,177 @@
+"""
+Builder for fields with field expansion, like ``posts.limit(25){id,message,comments.summary(true)}``.
+
+Refer: https://developers.facebook.com/docs/graph-api/field-expansion
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Tuple, Union
+
+from pyfacebook.exceptions import LibraryError
+
+FieldsType = Union[str, "Field", list, tuple]
+
+
+class Field(object):
+    """
+    A class representing a field or an edge with its modifiers and sub fields, it's immutable.
+    Methods return new fields, so fields can be shared and extended.
+
+    Usage:
+
+        posts = Field("posts", "id", "message").limit(25)
+        fields = compile_fields("id", "name", posts.fields(Field("comments").summary(True).limit(0)))
+        # id,name,posts.limit(25){id,message,comments.summary(true).limit(0)}
+        api.get_object(object_id="20531316728", fields=fields)
+    """
+
+    __slots__ = ("name", "modifiers", "children", "_hash")
+
+    def __init__(
+        self,
+        name: str,
+        *fields: FieldsType,
+        modifiers: Tuple[Tuple[str, str], ...] = (),
+    ):
+        """
+        :param name: Field name, like ``id`` or edge name like ``posts``.
+        :param fields: Sub fields, names, fields or lists of them.
+        :param modifiers: Modifier names and values, in order.
+        """
+        if not isinstance(name, str) or not name:
+            raise LibraryError({"message": f"Field name must be str, not {name!r}"})
+        self.name = name
+        self.modifiers = tuple(modifiers)
+        self.children = _flatten(fields)
+        self._hash = hash((self.name, self.modifiers, self.children))
+
+    def _replace(self, **changes) -> "Field":
+        field = Field.__new__(Field)
+        field.name = changes.get("name", self.name)
+        field.modifiers = changes.get("modifiers", self.modifiers)
+        field.children = changes.get("children", self.children)
+        field._hash = hash((field.name, field.modifiers, field.children))
+        return field
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Field):
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.name == other.name
+            and self.modifiers == other.modifiers
+            and self.children == other.children
+        )
+
+    def __str__(self) -> str:
+        return _compile(self)
+
+    def __repr__(self) -> str:
+        return f"Field({str(self)!r})"
+
+    def fields(self, *fields: FieldsType) -> "Field":
+        """
+        :param fields: Sub fields to add, fields already have are ignored.
+        :return: New field with the sub fields.
+        """
+        return self._replace(children=_flatten((self.children, fields)))
+
+    def modifier(self, name: str, value: Any) -> "Field":
+        """
+        :param name: Modifier name, like ``limit``.
+        :param value: Modifier value, replace the old value for the modifier.
+            None to remove the modifier, bool is converted to ``true`` or ``false``.
+        :return: New field with the modifier.
+        """
+        modifiers = list(self.modifiers)
+        index = next((i for i, m in enumerate(modifiers) if m[0] == name), None)
+        if value is None:
+            if index is None:
+                return self
+            del modifiers[index]
+        else:
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            if index is None:
+                modifiers.append((name, str(value)))
+            else:
+                modifiers[index] = (name, str(value))
+        return self._replace(modifiers=tuple(modifiers))
+
+    def limit(self, limit: Optional[int]) -> "Field":
+        return self.modifier("limit", limit)
+
+    def since(self, since: Optional[Union[str, int]]) -> "Field":
+        return self.modifier("since", since)
+
+    def until(self, until: Optional[Union[str, int]]) -> "Field":
+        return self.modifier("until", until)
+
+    def after(self, after: Optional[str]) -> "Field":
+        return self.modifier("after", after)
+
+    def before(self, before: Optional[str]) -> "Field":
+        return self.modifier("before", before)
+
+    def summary(self, summary: Optional[Union[bool, str]] = True) -> "Field":
+        """
+        :param summary: True for summary of edge like total count, or summary field like ``total_count``.
+        """
+        return self.modifier("summary", summary)
+
+
+def _flatten(fields: Iterable[Any]) -> Tuple[Union[str, Field], ...]:
+    """
+    :param fields: Names, fields or lists of them.
+    :return: Fields without repeat items, in order.
+    """
+    res = {}
+    stack = [iter(fields)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, (str, Field)):
+                res[item] = None
+            elif isinstance(item, (list, tuple)):
+                stack.append(iter(item))
+                break
+            else:
+                raise LibraryError(
+                    {"message": f"Field must be str or Field, not {item!r}"}
+                )
+        else:
+            stack.pop()
+    return tuple(res)
+
+
+@lru_cache(maxsize=1024)
+def _compile(field: Field) -> str:
+    """
+    Compile the field to the fields syntax, cached for the fields with same shape.
+
+    :param field: Field.
+    :return: Field string.
+    """
+    res = field.name + "".join(f".{name}({value})" for name, value in field.modifiers)
+    if field.children:
+        res += "{" + _join(field.children) + "}"
+    return res
+
+
+def compile_fields(*fields: FieldsType) -> str:
+    """
+    Compile fields to comma-separated string for parameter ``fields``.
+
+    :param fields: Names, fields or lists of them.
+    :return: Comma-separated string.
+    """
+    return _join(_flatten(fields))
+
+
+@lru_cache(maxsize=1024)
+def _join(fields: Tuple[Union[str, Field], ...]) -> str:
+    return ",".join(
+        item if isinstance(item, str) else _compile(item) for item in fields
+    )
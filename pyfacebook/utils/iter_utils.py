@@ -0,0 +1,64 @@
+"""
+function's to work with iterators.
+"""
+
+import contextvars
+import queue
+import threading
+from typing import Iterator, TypeVar
+
+T = TypeVar("T")
+
+_END = object()
+
+
+def prefetch(iterator: Iterator[T], depth: int = 1) -> Iterator[T]:
+    """
+    Produce items of the iterator in a background thread, keep at most ``depth`` items ahead of the consumer.
+    Close the returned generator will stop the background thread after its current item.
+    The items are produced with a copy of the consumer's context.
+
+    :param iterator: The iterator to produce items, like response pages.
+    :param depth: Max count of items to produce ahead.
+    :return: Generator for the items.
+    """
+    buffer = queue.Queue(maxsize=max(depth, 1))
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((_END, None))
+        except BaseException as ex:
+            put((_END, ex))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    context = contextvars.copy_context()
+    thread = threading.Thread(
+        target=context.run, args=(produce,), name="pyfacebook-prefetch", daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
@@ -0,0 +1,38 @@
+"""
+Lazy import for attributes of packages, by the module ``__getattr__`` (PEP 562).
+
+Modules for the attributes are imported at the first access, so importing the package is cheap.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach(
+    package: str, attributes: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """
+    Usage in ``__init__.py`` of the package:
+
+        __getattr__, __dir__, __all__ = attach(__name__, {"GraphAPI": ".graph"})
+
+    :param package: Name for the package.
+    :param attributes: Mapping for attribute name to the module which defines it, module name starts
+        with ``.`` is relative to the package.
+    :return: ``__getattr__``, ``__dir__`` and ``__all__`` for the package.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # save to the package, the next access will not call this.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__, list(attributes)
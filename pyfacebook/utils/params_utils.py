@@ -2,44 +2,52 @@
 function's to validate parameters.
 """
 
+from functools import lru_cache
 from typing import Optional, Union
 
 from pyfacebook.exceptions import LibraryError
+from pyfacebook.utils.field_utils import Field
 
 
-def enf_comma_separated(field: str, value: Optional[Union[str, list, tuple]]):
+def enf_comma_separated(field: str, value: Optional[Union[str, list, tuple, Field]]):
     """
     Check to see if field's value type belong to correct type.
     If it is, return api need value, otherwise, raise a LibraryError.
     :param field: Name of the field you want to do check.
-    :param value: Values for the field.
+    :param value: Values for the field, items can be ``Field`` for field expansion.
     :return: Api needed string
     """
     try:
         # if value point with string, not check.
         if isinstance(value, str):
-            value = [value]
+            return value
         elif isinstance(value, (list, tuple)):
-            pass
+            return _join_unique(tuple(value))
+        elif isinstance(value, Field):
+            return str(value)
         else:
             raise LibraryError(
                 {
                     "message": f"Parameter ({field}) must be single str,comma-separated str,list or tuple",
                 }
             )
-
-        # loop value list and remove repeat item
-        seen = {}
-        res = []
-        for item in value:
-            if item in seen:
-                continue
-            seen[item] = 1
-            res.append(item)
-        return ",".join(res)
     except (TypeError, ValueError):
         raise LibraryError(
             {
                 "message": f"Parameter ({field}) must be single str,comma-separated str,list or tuple",
             }
         )
+
+
+@lru_cache(maxsize=1024)
+def _join_unique(value: tuple) -> str:
+    """
+    Join values without repeat items, cached as resource methods are called with same fields.
+
+    :param value: Values, str or Field.
+    :return: Comma-separated string.
+    """
+    # dict keeps the order and removes repeat items.
+    return ",".join(
+        str(item) if isinstance(item, Field) else item for item in dict.fromkeys(value)
+    )
@@ -2,9 +2,41 @@
 tests for api base
 """
 
+from pyfacebook import FacebookApi
+
 
 def test_resource(fb_api):
     assert fb_api.user.access_token == "token"
     assert fb_api.user.app_id == "123456"
     assert fb_api.user.app_secret == "xxxxx"
     assert fb_api.user.client
+
+
+def test_lazy_resource(fb_api):
+    from pyfacebook.api.base_client import BaseApi, LazyResource
+    from pyfacebook.api.facebook.resource import FacebookPage, FacebookUser
+
+    assert isinstance(FacebookApi.page, LazyResource)
+    assert FacebookApi.page.resource_class is FacebookPage
+
+    # created at first access, and cached for the client.
+    assert "page" not in vars(fb_api)
+    page = fb_api.page
+    assert isinstance(page, FacebookPage)
+    assert page.client is fb_api
+    assert fb_api.page is page
+    assert vars(fb_api)["page"] is page
+
+    # resources are not shared between clients.
+    api = FacebookApi(access_token="token")
+    assert api.page is not page
+
+    # resources defined by instance are converted too.
+    class MyApi(BaseApi):
+        user = FacebookUser()
+
+    assert isinstance(MyApi.user, LazyResource)
+    api = MyApi(access_token="token")
+    assert isinstance(api.user, FacebookUser)
+    assert api.user is api.user
+    assert api.user.client is api
@@ -266,3 +266,42 @@ def test_search_pages(helpers, fb_api):
 
         pages_json = fb_api.page.search(q="facebook", count=4, return_json=True)
         assert len(pages_json["data"]) == 4
+
+
+def test_iter_feed(helpers, fb_api):
+    pid = "19292868552"
+
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{fb_api.version}/{pid}/feed",
+            json=helpers.load_json(
+                "testdata/facebook/apidata/posts/feeds_default_fields_p1.json"
+            ),
+        )
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{fb_api.version}/{pid}/feed",
+            json=helpers.load_json(
+                "testdata/facebook/apidata/posts/feeds_default_fields_p2.json"
+            ),
+        )
+
+        posts = list(fb_api.page.iter_feed(object_id=pid, limit=5))
+        assert len(posts) == 10
+        assert posts[0].id == "19292868552_10158349356748553"
+
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{fb_api.version}/{pid}/posts",
+            json=helpers.load_json(
+                "testdata/facebook/apidata/posts/feeds_default_fields_p1.json"
+            ),
+        )
+
+        posts_json = list(
+            fb_api.page.iter_posts(object_id=pid, count=3, limit=5, return_json=True)
+        )
+        assert len(posts_json) == 3
+        assert posts_json[0]["id"] == "19292868552_10158349356748553"
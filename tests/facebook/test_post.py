@@ -92,3 +92,27 @@ def test_get_comments(helpers, fb_api):
             object_id=post_id, count=5, limit=5, return_json=True
         )
         assert len(comments_json["data"]) == 5
+
+
+def test_iter_comments(helpers, fb_api):
+    post_id = "19292868552_10158407654328553"
+
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{fb_api.version}/{post_id}/comments",
+            json=helpers.load_json(
+                "testdata/facebook/apidata/comments/comments_p1.json"
+            ),
+        )
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{fb_api.version}/{post_id}/comments",
+            json=helpers.load_json(
+                "testdata/facebook/apidata/comments/comments_p2.json"
+            ),
+        )
+
+        comments = list(fb_api.post.iter_comments(object_id=post_id, limit=10))
+        assert len(comments) == 15
+        assert comments[0].created_time == "2021-08-10T18:45:03+0000"
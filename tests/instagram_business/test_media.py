@@ -80,6 +80,29 @@ def test_get_comments(helpers, api):
         assert comments_json["data"][0]["id"] == "17892250648466172"
 
 
+def test_iter_comments(helpers, api):
+    media_id = "17846368219941692"
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/{media_id}/comments",
+            json=helpers.load_json(
+                "testdata/instagram/apidata/medias/comments_p1.json"
+            ),
+        )
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/{media_id}/comments",
+            json=helpers.load_json(
+                "testdata/instagram/apidata/medias/comments_p2.json"
+            ),
+        )
+
+        comments = list(api.media.iter_comments(media_id=media_id))
+        assert len(comments) == 4
+        assert comments[0].id == "17858154961981086"
+
+
 def test_get_children(helpers, api):
     media_id = "17846368219941692"
     with responses.RequestsMock() as m:
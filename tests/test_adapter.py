@@ -0,0 +1,85 @@
+"""
+tests for the connection pool adapter.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from pyfacebook import GraphAPI
+from pyfacebook.api.adapter import PoolStats, PoolStatsAdapter
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if "slow" in self.path:
+            time.sleep(0.2)
+        body = b'{"id": "20531316728"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_stats(server_url):
+    api = GraphAPI(access_token="token", base_url=server_url, sleep_on_rate_limit=False)
+    assert api.pool_stats == PoolStats()
+
+    for _ in range(3):
+        assert api.get_object(object_id="20531316728")["id"] == "20531316728"
+    stats = api.pool_stats
+    assert stats.requests == 3
+    assert stats.created == 1
+    assert stats.reused == 2
+    assert stats.waited == 0
+
+
+def test_pool_block(server_url):
+    api = GraphAPI(
+        access_token="token",
+        base_url=server_url,
+        sleep_on_rate_limit=False,
+        pool_maxsize=2,
+        pool_block=True,
+    )
+    assert api.adapter._pool_maxsize == 2
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(lambda _: api.get_object(object_id="slow"), range(6)))
+    stats = api.pool_stats
+    assert stats.requests == 6
+    assert stats.created == 2
+    assert stats.waited > 0
+    assert stats.wait_seconds > 0
+
+
+def test_custom_adapter():
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=32)
+    api = GraphAPI(access_token="token", adapter=adapter)
+    assert api.session.get_adapter("https://graph.facebook.com/") is adapter
+    assert api.pool_stats is None
+
+    adapter = PoolStatsAdapter(pool_maxsize=32)
+    api = GraphAPI(access_token="token", adapter=adapter)
+    assert api.session.get_adapter("https://graph.facebook.com/") is adapter
+    assert api.pool_stats.requests == 0
@@ -0,0 +1,337 @@
+"""
+tests for async graph api.
+"""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+import requests
+
+from pyfacebook import (
+    AsyncGraphAPI,
+    AsyncFacebookApi,
+    AsyncIGBusinessApi,
+    AsyncIGBasicDisplayApi,
+    FacebookError,
+    MemoryCacheStore,
+    MemoryRateLimitStore,
+    PartialResultError,
+    RateLimitScheduler,
+    RetryPolicy,
+)
+from pyfacebook.models.page import Page
+
+
+class MockGraph:
+    """Route requests by path for httpx mock transport, and record them."""
+
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        data = self.routes[request.url.path]
+        if isinstance(data, list):
+            data = data.pop(0)
+        return httpx.Response(
+            200,
+            json=data,
+            headers={
+                "x-app-usage": '{"call_count":16,"total_cputime":15,"total_time":12}'
+            },
+        )
+
+    def http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self))
+
+
+def test_get_object(helpers):
+    mock = MockGraph(
+        {
+            "/v11.0/20531316728": helpers.load_json(
+                "testdata/base/object_default.json"
+            ),
+            "/v11.0/19292868552/feed": [
+                helpers.load_json("testdata/base/full_connecions_p1.json"),
+                helpers.load_json("testdata/base/full_connecions_p2.json"),
+            ],
+        }
+    )
+
+    async def run():
+        async with AsyncGraphAPI(
+            app_id="123456",
+            app_secret="xxxxx",
+            access_token="token",
+            version="v11.0",
+            http_client=mock.http_client(),
+        ) as api:
+            res = await api.get_object(object_id="20531316728")
+            assert res["id"] == "20531316728"
+
+            feed = await api.get_full_connections(
+                object_id="19292868552", connection="feed", count=None, limit=5
+            )
+            assert len(feed["data"]) == 8
+
+            mock.routes["/v11.0/19292868552/feed"] = [
+                helpers.load_json("testdata/base/full_connecions_p1.json"),
+                helpers.load_json("testdata/base/full_connecions_p2.json"),
+            ]
+            items = [
+                item
+                async for item in api.iter_connections(
+                    object_id="19292868552", connection="feed", limit=5, prefetch=1
+                )
+            ]
+            assert len(items) == 8
+            assert api.rate_limit.get_max_percent() == 16
+            assert api.version == "v11.0"
+
+    asyncio.run(run())
+
+    params = mock.requests[0].url.params
+    assert params["access_token"] == "token"
+    assert params["appsecret_proof"]
+    assert "fields" in params
+
+
+def test_concurrent_requests(helpers):
+    page = helpers.load_json("testdata/facebook/apidata/pages/single_default_page.json")
+    mock = MockGraph({f"/v11.0/{i}": dict(page, id=str(i)) for i in range(20)})
+
+    async def run():
+        api = AsyncFacebookApi(
+            access_token="token",
+            version="v11.0",
+            max_workers=5,
+            http_client=mock.http_client(),
+        )
+        pages = await asyncio.gather(
+            *[api.page.get_info(page_id=str(i)) for i in range(20)]
+        )
+        await api.close()
+        return pages
+
+    pages = asyncio.run(run())
+    assert [p.id for p in pages] == [str(i) for i in range(20)]
+    assert all(isinstance(p, Page) for p in pages)
+
+
+def test_resources(helpers):
+    mock = MockGraph(
+        {
+            "/v11.0/17841406338772941/media": helpers.load_json(
+                "testdata/instagram/apidata/users/medias_p1.json"
+            ),
+            "/v11.0/me": helpers.load_json(
+                "testdata/instagram_basic/apidata/user/user_info.json"
+            ),
+            "/v11.0/20531316728": {
+                "error": {"message": "Invalid OAuth access token.", "code": 190}
+            },
+        }
+    )
+
+    async def run():
+        api = AsyncIGBusinessApi(
+            access_token="token",
+            version="v11.0",
+            instagram_business_id="17841406338772941",
+            http_client=mock.http_client(),
+        )
+        media = await api.user.get_media(count=2, limit=2)
+        assert len(media.data) == 2
+        media = [m async for m in api.user.iter_media(count=3, limit=2)]
+        assert len(media) == 3
+        assert api.user.client is api
+
+        with pytest.raises(FacebookError):
+            await api.get_object(object_id="20531316728")
+
+        basic_api = AsyncIGBasicDisplayApi(
+            access_token="token", version="v11.0", http_client=mock.http_client()
+        )
+        user = await basic_api.user.get_info(return_json=True)
+        assert user["id"]
+        assert "appsecret_proof" not in mock.requests[-1].url.params
+
+    asyncio.run(run())
+
+
+def test_post_object(helpers):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "POST"
+        assert b"message=Comment+by+the+api" in request.content
+        return httpx.Response(200, json={"id": "404879271158877_405046241142180"})
+
+    async def run():
+        api = AsyncGraphAPI(
+            access_token="token",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        api.access_token = "new token"
+        assert api.api.access_token == "new token"
+        return await api.post_object(
+            object_id="404879271158877",
+            connection="comments",
+            data={"message": "Comment by the api"},
+        )
+
+    assert asyncio.run(run())["id"] == "404879271158877_405046241142180"
+
+
+def test_request_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Wrong")
+
+    async def run():
+        api = AsyncGraphAPI(
+            access_token="token",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        await api.get_object(object_id="20531316728")
+
+    # same errors as the sync client.
+    with pytest.raises(requests.ConnectionError):
+        asyncio.run(run())
+
+    def timeout_handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadTimeout("Timeout")
+
+    async def run_timeout():
+        api = AsyncGraphAPI(
+            access_token="token",
+            http_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(timeout_handler)
+            ),
+        )
+        await api.get_object(object_id="20531316728")
+
+    with pytest.raises(requests.Timeout):
+        asyncio.run(run_timeout())
+
+
+def test_retry_and_rate_limit():
+    transient = {"error": {"message": "An unknown error occurred", "code": 1}}
+    results = [
+        httpx.ConnectError("Wrong"),
+        httpx.Response(500, json=transient),
+        httpx.Response(200, json={"id": "20531316728"}),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        response = results.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def tick(ticks: list):
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        scheduler = RateLimitScheduler()
+        api = AsyncGraphAPI(
+            access_token="token",
+            scheduler=scheduler,
+            retry_policy=RetryPolicy(backoff_factor=0.01, jitter=False),
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        # waits run on the event loop, other tasks keep going.
+        waited = await scheduler.acquire_async()
+        assert waited == 0
+        scheduler.delay(0.1)
+        ticks = []
+        ticker = asyncio.ensure_future(tick(ticks))
+        assert await scheduler.acquire_async() >= 0.05
+        assert len(ticks) > 2
+
+        data = await api.get_object(object_id="20531316728")
+        ticker.cancel()
+        await api.close()
+        return data, api.retry_policy.metrics
+
+    data, metrics = asyncio.run(run())
+    assert data["id"] == "20531316728"
+    assert metrics.retries == 2
+    assert metrics.retries_by_code == {"connection": 1, "1": 1}
+
+
+def test_native_methods():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v11.0/20531316728":
+            return httpx.Response(200, json={"id": "20531316728"})
+        ids = request.url.params["ids"].split(",")
+        if ids[0] == "100":
+            return httpx.Response(
+                400, json={"error": {"message": "Invalid ids", "code": 100}}
+            )
+        return httpx.Response(200, json={i: {"id": i} for i in ids})
+
+    async def run():
+        api = AsyncGraphAPI(
+            access_token="token",
+            version="v11.0",
+            max_connections=10,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        assert api._executor._max_workers == 10
+        # sent on the event loop, not need the worker threads.
+        api._executor.shutdown()
+        assert (await api.get_object(object_id="20531316728"))["id"] == "20531316728"
+        data = await api.get_objects(ids=[str(i) for i in range(100)])
+        assert list(data) == [str(i) for i in range(100)]
+
+        with pytest.raises(PartialResultError) as ex:
+            await api.get_objects(ids=[str(i) for i in range(120)], max_workers=2)
+        assert list(ex.value.data) == [str(i) for i in range(100)]
+        assert list(ex.value.errors) == [",".join(str(i) for i in range(100, 120))]
+        await api.close()
+
+    asyncio.run(run())
+
+
+def test_blocking_stores():
+    threads = []
+
+    class RecordRateLimitStore(MemoryRateLimitStore):
+        def update(self, usage):
+            threads.append(threading.current_thread())
+            return super().update(usage)
+
+        def load(self):
+            threads.append(threading.current_thread())
+            return super().load()
+
+    class RecordCacheStore(MemoryCacheStore):
+        def get(self, key):
+            threads.append(threading.current_thread())
+            return super().get(key)
+
+        def set(self, key, entry):
+            threads.append(threading.current_thread())
+            return super().set(key, entry)
+
+    mock = MockGraph({"/v11.0/20531316728": {"id": "20531316728"}})
+
+    async def run():
+        api = AsyncGraphAPI(
+            access_token="token",
+            version="v11.0",
+            rate_limit_store=RecordRateLimitStore(),
+            cache=RecordCacheStore(),
+            scheduler=RateLimitScheduler(),
+            http_client=mock.http_client(),
+        )
+        assert (await api.get_object(object_id="20531316728"))["id"] == "20531316728"
+        await api.close()
+
+    asyncio.run(run())
+    # stores are accessed in threads, not blocking the event loop.
+    assert len(threads) >= 2
+    assert threading.main_thread() not in threads
@@ -0,0 +1,159 @@
+import os
+from unittest import mock
+
+import responses
+
+from pyfacebook import GraphAPI, MemoryCacheStore, DiskCacheStore
+from pyfacebook.cache import CacheEntry, build_cache_key
+
+
+def test_build_cache_key():
+    key = build_cache_key(
+        url="https://graph.facebook.com/v19.0/20531316728",
+        args={
+            "fields": "id,name",
+            "access_token": "token",
+            "appsecret_proof": "proof",
+            "limit": None,
+        },
+    )
+    assert key == "https://graph.facebook.com/v19.0/20531316728?fields=id%2Cname"
+    # same for other token and parameters order.
+    assert key == build_cache_key(
+        url="https://graph.facebook.com/v19.0/20531316728?access_token=other",
+        args={"fields": "id,name"},
+    )
+    assert key != build_cache_key(
+        url="https://graph.facebook.com/v19.0/20531316728", args={"fields": "id"}
+    )
+    assert build_cache_key(
+        url="https://graph.facebook.com/v19.0/123/feed?limit=10&after=abc",
+        args={"access_token": "token"},
+    ) == ("https://graph.facebook.com/v19.0/123/feed?after=abc&limit=10")
+
+
+def test_memory_store():
+    store = MemoryCacheStore(max_entries=2)
+    for key in ["a", "b"]:
+        store.set(key, CacheEntry(etag=key, content=b"1234", headers={}))
+    assert store.get("a").etag == "a"
+    store.set("c", CacheEntry(etag="c", content=b"1234", headers={}))
+    # b is least recently used.
+    assert store.get("b") is None
+    assert len(store) == 2
+
+    store = MemoryCacheStore(max_bytes=10)
+    store.set("a", CacheEntry(etag="a", content=b"123456", headers={}))
+    store.set("b", CacheEntry(etag="b", content=b"123456", headers={}))
+    assert store.get("a") is None
+    store.set("c", CacheEntry(etag="c", content=b"x" * 11, headers={}))
+    assert store.get("c") is None
+    assert store.get("b").content == b"123456"
+    store.delete("b")
+    assert len(store) == 0
+
+
+def test_disk_store(tmp_path):
+    store = DiskCacheStore(str(tmp_path / "cache"))
+    assert store.get("a") is None
+    entry = CacheEntry(
+        etag='"abc"',
+        content=b'{"id": "1"}\n{}',
+        headers={"Content-Type": "application/json"},
+        encoding="utf-8",
+    )
+    store.set("a", entry)
+    assert store.get("a") == entry
+    assert DiskCacheStore(str(tmp_path / "cache")).get("a") == entry
+    store.delete("a")
+    store.delete("a")
+    assert store.get("a") is None
+
+    # corrupt file is removed.
+    with open(store._path("a"), "wb") as f:
+        f.write(b'{"key": "a", "eta')
+    assert store.get("a") is None
+    assert not os.path.exists(store._path("a"))
+
+
+def test_disk_store_prune(tmp_path):
+    store = DiskCacheStore(str(tmp_path / "cache"), max_entries=10)
+    keys = [str(i) for i in range(10)]
+    for i, key in enumerate(keys):
+        store.set(key, CacheEntry(etag=key, content=b"1234", headers={}))
+        os.utime(store._path(key), ns=(i, i))
+    assert store.get("0").etag == "0"
+    # 0 is recently used, 1 and 2 are least recently used.
+    assert os.stat(store._path("0")).st_mtime_ns > 9
+    store.set("c", CacheEntry(etag="c", content=b"1234", headers={}))
+    # pruned to 90% of the limits, not scan again for next sets.
+    assert store.get("1") is None
+    assert store.get("2") is None
+    assert store.get("0").etag == "0"
+    assert len(store) == 9
+    with mock.patch.object(store, "_scan") as scan:
+        store.set("d", CacheEntry(etag="d", content=b"1234", headers={}))
+        assert not scan.called
+
+    # about 105 bytes for each file.
+    store = DiskCacheStore(str(tmp_path / "bytes"), max_entries=None, max_bytes=400)
+    for i, key in enumerate(["a", "b", "c"]):
+        store.set(key, CacheEntry(etag=key, content=b"x" * 50, headers={}))
+        os.utime(store._path(key), ns=(i, i))
+    store.set("d", CacheEntry(etag="d", content=b"x" * 50, headers={}))
+    assert store.get("a") is None
+    assert store.get("b").etag == "b"
+    assert store.get("d").etag == "d"
+    assert 300 < store._bytes <= 360
+    # too large to cache.
+    store.set("e", CacheEntry(etag="e", content=b"x" * 401, headers={}))
+    assert store.get("e") is None
+
+
+def test_disk_store_error(tmp_path, caplog):
+    store = DiskCacheStore(str(tmp_path / "cache"))
+    entry = CacheEntry(etag="a", content=b"1234", headers={})
+    # the write error is logged, not raised.
+    with mock.patch("os.replace", side_effect=OSError("No space left on device")):
+        store.set("a", entry)
+    assert "No space left on device" in caplog.text
+    assert store.get("a") is None
+    assert len(os.listdir(store.directory)) == 0
+
+    store.directory = str(tmp_path / "removed")
+    store.set("a", entry)
+    store.prune()
+    assert "Exception in scan cache files" in caplog.text
+
+
+def test_api_cache(helpers):
+    cache = MemoryCacheStore()
+    api = GraphAPI(access_token="token", cache=cache)
+    url = f"https://graph.facebook.com/{api.version}/20531316728"
+    data = helpers.load_json("testdata/base/object_default.json")
+
+    with responses.RequestsMock() as m:
+        m.add(method=responses.GET, url=url, json=data, headers={"ETag": '"v1"'})
+        m.add(
+            method=responses.GET,
+            url=url,
+            status=304,
+            headers={
+                "x-app-usage": '{"call_count":16,"total_cputime":15,"total_time":12}'
+            },
+        )
+        assert api.get_object(object_id="20531316728") == data
+        assert len(cache) == 1
+        assert "If-None-Match" not in m.calls[0].request.headers
+
+        api.access_token = "other token"
+        assert api.get_object(object_id="20531316728") == data
+        assert m.calls[1].request.headers["If-None-Match"] == '"v1"'
+        assert api.rate_limit.get_max_percent() == 16
+
+    # other fields not use the cache.
+    with responses.RequestsMock() as m:
+        m.add(method=responses.GET, url=url, json={"id": "20531316728"})
+        api.get_object(object_id="20531316728", fields="id")
+        assert "If-None-Match" not in m.calls[0].request.headers
+    assert len(cache) == 1
@@ -0,0 +1,129 @@
+import sys
+
+import pytest
+import responses
+
+import pyfacebook.models as md
+from pyfacebook import (
+    GraphAPI,
+    LibraryError,
+    JsonCodec,
+    RetryPolicy,
+    OrjsonCodec,
+    get_codec,
+    set_default_codec,
+    get_default_codec,
+)
+
+
+def available_codecs():
+    codecs = []
+    for name in ["json", "orjson", "ujson", "simdjson"]:
+        try:
+            codecs.append(get_codec(name))
+        except LibraryError:
+            pass
+    return codecs
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda c: c.name)
+def test_codec(codec):
+    data = {"id": "1", "name": "Café/Bar", "count": 10, "items": [1.5, None, True]}
+    text = (
+        '{"id": "1", "name": "Caf\\u00e9/Bar", "count": 10, "items": [1.5, null, true]}'
+    )
+    assert codec.loads(text) == data
+    assert codec.loads(text.encode("utf-8")) == data
+    assert codec.dumps(
+        data
+    ) == '{"id":"1","name":"Café/Bar","count":10,"items":[1.5,null,true]}'.encode(
+        "utf-8"
+    )
+    with pytest.raises(ValueError):
+        codec.loads(b"{wrong")
+
+
+def test_get_codec(monkeypatch):
+    codec = JsonCodec()
+    assert get_codec(codec) is codec
+    assert get_codec("json").name == "json"
+    with pytest.raises(LibraryError):
+        get_codec("yaml")
+
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    with pytest.raises(ImportError):
+        OrjsonCodec()
+    with pytest.raises(LibraryError):
+        get_codec("orjson")
+
+    set_default_codec("json")
+    try:
+        assert get_default_codec().name == "json"
+        assert get_codec(None) is get_default_codec()
+    finally:
+        set_default_codec(None)
+    # orjson is not installed, use the stdlib json, not other codecs installed.
+    assert get_default_codec().name == "json"
+    set_default_codec(None)
+
+
+def test_api_codec(helpers):
+    api = GraphAPI(access_token="token", json_codec="json")
+    assert api.json_codec.name == "json"
+    assert api.rate_limit.json_codec is api.json_codec
+
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/20531316728",
+            json=helpers.load_json("testdata/base/object_default.json"),
+            headers={
+                "x-app-usage": '{"call_count":10,"total_cputime":1,"total_time":1}'
+            },
+        )
+        assert api.get_object(object_id="20531316728")["id"] == "20531316728"
+    assert api.rate_limit.get_limit().call_count == 10
+
+
+def test_retry_codec(helpers):
+    class CountingCodec(JsonCodec):
+        calls = 0
+
+        def loads(self, data):
+            self.calls += 1
+            return super().loads(data)
+
+    codec = CountingCodec()
+    api = GraphAPI(
+        access_token="token",
+        json_codec=codec,
+        retry_policy=RetryPolicy(max_retries=1, backoff_factor=0, jitter=False),
+    )
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/20531316728",
+            json={"error": {"message": "Unknown error", "code": 1}},
+            status=500,
+        )
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/20531316728",
+            json=helpers.load_json("testdata/base/object_default.json"),
+        )
+        assert api.get_object(object_id="20531316728")["id"] == "20531316728"
+    # the error response is decoded by the codec of client too.
+    assert codec.calls == 2
+
+
+def test_model_to_bytes(helpers):
+    post = md.Post.new_from_json_dict(
+        helpers.load_json("testdata/facebook/models/post.json")
+    )
+    data = post.to_bytes()
+    for codec in available_codecs():
+        set_default_codec(codec)
+        try:
+            assert codec.loads(post.to_bytes()) == codec.loads(data)
+        finally:
+            set_default_codec(None)
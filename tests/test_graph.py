@@ -2,11 +2,25 @@
 tests for base graph api.
 """
 
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
 import pytest
 import requests
 import responses
 
-from pyfacebook import GraphAPI, LibraryError, FacebookError
+from pyfacebook import (
+    GraphAPI,
+    BasicDisplayAPI,
+    ThreadsGraphAPI,
+    LibraryError,
+    FacebookError,
+    PartialResultError,
+    RateLimitScheduler,
+    RateLimitError,
+)
 
 
 def test_api_initial():
@@ -41,6 +55,133 @@ def test_sleep_seconds_mapping(pubg_api):
     assert r is None
 
 
+def test_scheduler(helpers):
+    scheduler = RateLimitScheduler(policy="raise")
+    api = GraphAPI(
+        access_token="token",
+        sleep_seconds_mapping={50: 0, 90: 30},
+        scheduler=scheduler,
+    )
+    assert api.scheduler is scheduler
+    assert GraphAPI(access_token="token").scheduler is not None
+    assert GraphAPI(access_token="token", sleep_on_rate_limit=False).scheduler is None
+
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/20531316728",
+            json=helpers.load_json("testdata/base/object_default.json"),
+            headers={
+                "x-app-usage": '{"call_count":80,"total_cputime":15,"total_time":12}'
+            },
+        )
+        # the request got response not wait.
+        assert api.get_object(object_id="20531316728")["id"] == "20531316728"
+        assert scheduler.predict_wait() > 29
+
+        with pytest.raises(RateLimitError) as ex:
+            api.get_object(object_id="20531316728")
+        assert ex.value.wait_seconds > 29
+        assert len(m.calls) == 1
+
+
+def test_business_rate_limit(helpers):
+    scheduler = RateLimitScheduler(policy="raise")
+    api = GraphAPI(access_token="token", scheduler=scheduler)
+    assert api._get_object_key("v19.0/19292868552/feed") == "19292868552"
+    assert api._get_object_key("v19.0/19292868552_3789869301238646") == "19292868552"
+    assert (
+        api._get_object_key("https://graph.facebook.com/v19.0/19292868552/feed?limit=1")
+        == "19292868552"
+    )
+    assert api._get_object_key("v19.0") is None
+
+    buc = '{"19292868552":[{"type":"pages","call_count":100,"total_cputime":1,"total_time":1,"estimated_time_to_regain_access":3}]}'
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/19292868552",
+            json={"id": "19292868552"},
+            headers={"x-business-use-case-usage": buc},
+        )
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/17895695668004550",
+            json={"id": "17895695668004550"},
+            headers={"x-business-use-case-usage": buc},
+        )
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/20531316728",
+            json=helpers.load_json("testdata/base/object_default.json"),
+        )
+        api.get_object(object_id="19292868552")
+        # other objects not limited.
+        api.get_object(object_id="17895695668004550")
+        api.get_object(object_id="20531316728")
+        assert scheduler.predict_wait() == 0
+
+        for object_id in ["19292868552", "19292868552_3789869301238646"]:
+            with pytest.raises(RateLimitError) as ex:
+                api.get_object(object_id=object_id)
+            assert 170 < ex.value.wait_seconds <= 180
+        # limited by the owner usage.
+        with pytest.raises(RateLimitError):
+            api.get_object(object_id="17895695668004550")
+        assert scheduler.get_owner("17895695668004550") == "19292868552"
+        # later delays for the owner limit the object too.
+        scheduler.reset()
+        scheduler.delay(10, key="19292868552")
+        with pytest.raises(RateLimitError):
+            api.get_object(object_id="17895695668004550")
+        api.get_object(object_id="20531316728")
+
+
+def test_append_token(monkeypatch):
+    calls = []
+    generate = GraphAPI._generate_secret_proof
+
+    def generate_secret_proof(access_token, secret=None):
+        calls.append(access_token)
+        return generate(access_token, secret)
+
+    api = GraphAPI(app_secret="xxxxx", access_token="token")
+    monkeypatch.setattr(api, "_generate_secret_proof", generate_secret_proof)
+
+    args = {"fields": "id"}
+    new_args = api._append_token(args)
+    assert args == {"fields": "id"}
+    assert new_args["access_token"] == "token"
+    assert new_args["appsecret_proof"] == generate("token", "xxxxx")
+
+    api._append_token(None)
+    assert calls == ["token"]
+
+    # invalidate for new token or secret
+    api.access_token = "new token"
+    assert api._append_token(args)["appsecret_proof"] == generate("new token", "xxxxx")
+    api.app_secret = "yyyyy"
+    assert api._append_token(args)["appsecret_proof"] == generate("new token", "yyyyy")
+    assert api._append_token({"access_token": "page token"})["appsecret_proof"] == (
+        generate("page token", "yyyyy")
+    )
+    assert calls == ["token", "new token", "new token", "page token"]
+
+    # tokens used in turn are cached, and the cache is bounded.
+    api._append_token({"access_token": "new token"})
+    api._append_token({"access_token": "page token"})
+    assert calls == ["token", "new token", "new token", "page token"]
+    monkeypatch.setattr(api, "SECRET_PROOF_CACHE_SIZE", 2)
+    api._append_token({"access_token": "other token"})
+    assert len(api._secret_proof_cache) == 2
+    assert ("new token", "yyyyy") not in api._secret_proof_cache
+
+    api = BasicDisplayAPI(app_secret="xxxxx", access_token="token")
+    assert api._append_token(args)["appsecret_proof"] is None
+    api = ThreadsGraphAPI(app_secret="xxxxx", access_token="token")
+    assert api._append_token(args)["appsecret_proof"] == generate("token", "xxxxx")
+
+
 def test_request_error(pubg_api):
     with pytest.raises(LibraryError):
         with responses.RequestsMock() as m:
@@ -121,6 +262,77 @@ def test_get_objects(helpers, pubg_api):
         assert len(res) == 2
 
 
+def test_get_objects_chunks(pubg_api):
+    ids = [str(i) for i in range(120)]
+
+    def callback(request):
+        chunk = parse_qs(urlparse(request.url).query)["ids"][0].split(",")
+        assert len(chunk) <= 50
+        if "110" in chunk:
+            return (
+                400,
+                {},
+                json.dumps({"error": {"message": "Invalid id", "code": 100}}),
+            )
+        return 200, {}, json.dumps({i: {"id": i} for i in chunk})
+
+    with responses.RequestsMock() as m:
+        m.add_callback(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{pubg_api.version}",
+            callback=callback,
+            content_type="application/json",
+        )
+
+        res = pubg_api.get_objects(ids=ids[:100], max_workers=2)
+        assert list(res.keys()) == ids[:100]
+        assert len(m.calls) == 2
+
+        with pytest.raises(PartialResultError) as ex:
+            pubg_api.get_objects(ids=",".join(ids))
+        assert len(ex.value.data) == 100
+        assert list(ex.value.errors.keys()) == [",".join(ids[100:])]
+        assert ex.value.errors[",".join(ids[100:])].code == 100
+
+
+def test_thread_safe(helpers):
+    api = GraphAPI(access_token="token", thread_safe=True)
+    api.session.headers["X-Test"] = "test"
+
+    def call(_):
+        data = api.get_object(object_id="20531316728")
+        return api.session, data
+
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"https://graph.facebook.com/{api.version}/20531316728",
+            json=helpers.load_json("testdata/base/object_default.json"),
+            headers={
+                "x-app-usage": '{"call_count":16,"total_cputime":15,"total_time":12}'
+            },
+        )
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(call, range(20)))
+
+    sessions = {id(session) for session, _ in results}
+    assert 1 <= len(sessions) <= 4
+    assert id(api.session) not in sessions
+    for session, data in results:
+        assert data["id"] == "20531316728"
+        assert session.headers["X-Test"] == "test"
+        assert session.get_adapter("https://graph.facebook.com/") is api.adapter
+    assert api.rate_limit.get_max_percent() == 16
+
+    # worker threads of the client use their own sessions without thread safe mode.
+    api = GraphAPI(access_token="token")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(lambda: api.session).result() is api.session
+        session = executor.submit(api._run_in_worker, lambda: api.session).result()
+    assert session is not api.session
+    assert session.get_adapter("https://graph.facebook.com/") is api.adapter
+
+
 def test_get_connection(helpers, pubg_api):
     api = GraphAPI(access_token="token")
     obj_id = "19292868552"
@@ -196,6 +408,139 @@ def test_get_full_connections(helpers):
         assert len(feed["data"]) == 8
 
 
+def test_drain_nested_connections(helpers):
+    api = GraphAPI(access_token="token", version="v11.0", max_workers=2)
+    base = "https://graph.facebook.com/v11.0"
+
+    def edge(items, next_url=None, after=None):
+        paging = {"cursors": {"before": "b0", "after": after or "a0"}}
+        if next_url is not None:
+            paging["next"] = f"{base}/{next_url}"
+        return {"data": items, "paging": paging}
+
+    def build_data():
+        return edge(
+            [
+                {
+                    "id": "p1",
+                    "comments": edge(
+                        [{"id": "c1"}], "p1/comments?access_token=token&after=a1"
+                    ),
+                },
+                {
+                    "id": "p2",
+                    "comments": edge(
+                        [{"id": "c4"}], "p2/comments?access_token=token&after=b1"
+                    ),
+                },
+                {"id": "p3", "comments": edge([])},
+            ],
+            # paging for the data itself is not followed.
+            next_url="page/posts?access_token=token&after=x",
+        )
+
+    pages = {
+        ("p1", "a1"): edge(
+            [
+                {
+                    "id": "c2",
+                    "comments": edge(
+                        [{"id": "r1"}], "c2/comments?access_token=token&after=r1"
+                    ),
+                }
+            ],
+            "p1/comments?access_token=token&after=a2",
+            after="a2",
+        ),
+        ("p1", "a2"): edge([{"id": "c3"}], after="a3"),
+        ("p2", "b1"): edge([{"id": "c5"}], after="b2"),
+        ("c2", "r1"): edge([{"id": "r2"}], after="r2"),
+    }
+
+    def callback(request):
+        query = parse_qs(urlparse(request.url).query)
+        assert query["access_token"] == ["token"]
+        object_id = urlparse(request.url).path.split("/")[2]
+        return 200, {}, json.dumps(pages[(object_id, query["after"][0])])
+
+    with responses.RequestsMock() as m:
+        m.add_callback(
+            method=responses.GET,
+            url=re.compile(f"{base}/.*/comments"),
+            callback=callback,
+            content_type="application/json",
+        )
+        data = api.drain_nested_connections(data=build_data())
+        assert len(m.calls) == 4
+
+    p1, p2, p3 = data["data"]
+    assert [c["id"] for c in p1["comments"]["data"]] == ["c1", "c2", "c3"]
+    assert p1["comments"]["paging"] == {"cursors": {"before": "b0", "after": "a3"}}
+    assert [c["id"] for c in p1["comments"]["data"][1]["comments"]["data"]] == [
+        "r1",
+        "r2",
+    ]
+    assert [c["id"] for c in p2["comments"]["data"]] == ["c4", "c5"]
+    assert "next" not in p2["comments"]["paging"]
+    assert p3["comments"]["data"] == []
+    assert "next" in data["paging"]
+
+    # count for each connection
+    with responses.RequestsMock() as m:
+        m.add_callback(
+            method=responses.GET,
+            url=re.compile(f"{base}/.*/comments"),
+            callback=callback,
+            content_type="application/json",
+        )
+        data = api.drain_nested_connections(data=build_data(), count=2)
+        assert len(m.calls) == 3
+    p1, p2, _ = data["data"]
+    assert [c["id"] for c in p1["comments"]["data"]] == ["c1", "c2"]
+    assert [c["id"] for c in p1["comments"]["data"][1]["comments"]["data"]] == [
+        "r1",
+        "r2",
+    ]
+    assert [c["id"] for c in p2["comments"]["data"]] == ["c4", "c5"]
+
+    # failed connections
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"{base}/p1/comments",
+            json=helpers.load_json("testdata/base/error_data.json"),
+            status=400,
+        )
+        m.add(
+            method=responses.GET,
+            url=f"{base}/p2/comments",
+            json=pages[("p2", "b1")],
+        )
+        with pytest.raises(PartialResultError) as ex:
+            api.drain_nested_connections(data=build_data())
+    assert list(ex.value.errors) == [f"{base}/p1/comments?access_token=token&after=a1"]
+    p1, p2, _ = ex.value.data["data"]
+    assert [c["id"] for c in p1["comments"]["data"]] == ["c1"]
+    assert [c["id"] for c in p2["comments"]["data"]] == ["c4", "c5"]
+
+    # drain for full connections
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=f"{base}/page/posts",
+            json={"data": build_data()["data"][1:]},
+        )
+        m.add(
+            method=responses.GET,
+            url=f"{base}/p2/comments",
+            json=pages[("p2", "b1")],
+        )
+        feed = api.get_full_connections(
+            object_id="page", connection="posts", drain_nested=True
+        )
+    assert [c["id"] for c in feed["data"][0]["comments"]["data"]] == ["c4", "c5"]
+
+
 def test_discovery_user_media(helpers):
     username = "facebook"
 
@@ -378,3 +723,168 @@ def test_debug_token(helpers, pubg_api):
         res = pubg_api.debug_token(input_token=input_token)
         assert res["data"]["type"] == "USER"
         assert res["data"]["is_valid"]
+
+
+def test_batch(helpers, pubg_api):
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.POST,
+            url="https://graph.facebook.com/",
+            json=helpers.load_json("testdata/base/batch_data.json"),
+        )
+
+        with pubg_api.batch() as batch:
+            page = batch.get_object(object_id="20531316728", fields="id,name")
+            batch.get_connection(
+                object_id="20531316728",
+                connection="posts",
+                name="posts",
+                omit_response_on_success=True,
+                limit=1,
+            )
+            posts = batch.get_objects(
+                ids="{result=posts:$.data.*.id}", depends_on="posts"
+            )
+            error = batch.get_object(object_id="20531316728", fields="notexists")
+
+        operations = json.loads(parse_qs(m.calls[0].request.body)["batch"][0])
+        assert len(operations) == 4
+        assert (
+            operations[0]["relative_url"]
+            == f"{pubg_api.version}/20531316728?fields=id,name"
+        )
+        assert operations[1]["name"] == "posts"
+        assert operations[2]["relative_url"].endswith("ids={result=posts:$.data.*.id}")
+        assert operations[2]["depends_on"] == "posts"
+
+        assert batch.result(page)["name"] == "Facebook App"
+        assert batch.results[1] is None
+        assert "20531316728_3789869301238646" in batch.result(posts)
+        assert isinstance(batch.results[error], FacebookError)
+        with pytest.raises(FacebookError):
+            batch.result(error)
+        assert pubg_api.rate_limit.get_limit("20531316728", "pages").call_count == 3
+
+    # operations
+    batch = pubg_api.batch()
+    assert batch.execute() == []
+    idx = batch.post_object(
+        object_id="20531316728", connection="feed", data={"message": "hello"}
+    )
+    assert batch.operations[idx]["body"] == "message=hello"
+    idx = batch.delete_object(object_id="20531316728_3789869301238646")
+    assert batch.operations[idx]["method"] == "DELETE"
+
+    with pytest.raises(LibraryError):
+        pubg_api.batch().result(0)
+    with pytest.raises(LibraryError):
+        batch = pubg_api.batch()
+        for _ in range(pubg_api.MAX_BATCH_SIZE + 1):
+            batch.get_object(object_id="20531316728")
+    with pytest.raises(LibraryError):
+        pubg_api.execute_batch(
+            [{"method": "GET", "relative_url": "me"}] * (pubg_api.MAX_BATCH_SIZE + 1)
+        )
+
+    # operation with body not json only fails itself.
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.POST,
+            url="https://graph.facebook.com/",
+            json=[
+                {"code": 502, "headers": [], "body": "<html>Bad Gateway</html>"},
+                {"code": 200, "headers": [], "body": '{"id": "20531316728"}'},
+            ],
+        )
+        results = pubg_api.execute_batch(
+            [
+                {"method": "GET", "relative_url": "me"},
+                {"method": "GET", "relative_url": "20531316728"},
+            ]
+        )
+    assert isinstance(results[0], LibraryError)
+    assert "502" in results[0].message
+    assert results[1] == {"id": "20531316728"}
+
+
+def test_iter_connections(helpers):
+    obj_id = "19292868552"
+
+    api = GraphAPI(access_token="token", version="v11.0")
+    # stop early will not request next page
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url="https://graph.facebook.com/v11.0/19292868552/feed",
+            json=helpers.load_json("testdata/base/full_connecions_p1.json"),
+        )
+
+        items = api.iter_connections(object_id=obj_id, connection="feed", limit=5)
+        assert next(items)["id"] == "19292868552_10158333323653553"
+        assert next(items)["id"] == "19292868552_10158331020098553"
+        items.close()
+        assert len(m.calls) == 1
+
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url="https://graph.facebook.com/v11.0/19292868552/feed",
+            json=helpers.load_json("testdata/base/full_connecions_p1.json"),
+        )
+        m.add(
+            method=responses.GET,
+            url="https://graph.facebook.com/v11.0/19292868552/feed",
+            json=helpers.load_json("testdata/base/full_connecions_p2.json"),
+        )
+
+        items = list(api.iter_connections(object_id=obj_id, connection="feed", limit=5))
+        assert len(items) == 8
+
+    # yield pages with count
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url="https://graph.facebook.com/v11.0/19292868552/feed",
+            json=helpers.load_json("testdata/base/full_connecions_p1.json"),
+        )
+        m.add(
+            method=responses.GET,
+            url="https://graph.facebook.com/v11.0/19292868552/feed",
+            json=helpers.load_json("testdata/base/full_connecions_p2.json"),
+        )
+
+        pages = list(
+            api.iter_connections(
+                object_id=obj_id,
+                connection="feed",
+                count=6,
+                limit=5,
+                yield_pages=True,
+            )
+        )
+        assert [len(p["data"]) for p in pages] == [5, 1]
+        assert "paging" in pages[0]
+
+
+def test_iter_connections_prefetch(helpers):
+    api = GraphAPI(access_token="token", version="v11.0")
+
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url="https://graph.facebook.com/v11.0/19292868552/feed",
+            json=helpers.load_json("testdata/base/full_connecions_p1.json"),
+        )
+        m.add(
+            method=responses.GET,
+            url="https://graph.facebook.com/v11.0/19292868552/feed",
+            json=helpers.load_json("testdata/base/full_connecions_p2.json"),
+        )
+
+        items = list(
+            api.iter_connections(
+                object_id="19292868552", connection="feed", limit=5, prefetch=2
+            )
+        )
+        assert len(items) == 8
+        assert items[0]["id"] == "19292868552_10158333323653553"
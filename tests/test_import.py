@@ -0,0 +1,79 @@
+"""
+Tests for lazy imports, run in new interpreters to check modules imported.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import pyfacebook
+
+HEAVY_MODULES = [
+    "pyfacebook.models.base",
+    "pyfacebook.models.post",
+    "pyfacebook.api.graph",
+    "pyfacebook.api.facebook.resource.page",
+    "dataclasses_json",
+    "requests",
+    "requests_oauthlib",
+    "httpx",
+]
+
+
+def imported_modules(statement):
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "seconds = time.perf_counter() - start\n"
+        "print(json.dumps({'modules': sorted(sys.modules), 'seconds': seconds}))"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return json.loads(output)
+
+
+def test_import_package():
+    result = imported_modules("import pyfacebook")
+    for module in HEAVY_MODULES:
+        assert module not in result["modules"]
+    # guard for regression, importing the package should only load few modules.
+    assert len([m for m in result["modules"] if m.startswith("pyfacebook")]) <= 4
+    assert result["seconds"] < 1
+
+
+def test_import_graph_api():
+    result = imported_modules("from pyfacebook import GraphAPI")
+    assert "pyfacebook.api.graph" in result["modules"]
+    for module in ["pyfacebook.models.base", "pyfacebook.api.async_graph", "httpx"]:
+        assert module not in result["modules"]
+
+
+@pytest.mark.parametrize("name", ["FacebookApi", "IGBusinessApi", "IGBasicDisplayApi"])
+def test_import_client(name):
+    result = imported_modules(f"from pyfacebook import {name}")
+    assert "pyfacebook.api.graph" in result["modules"]
+    for module in [
+        "pyfacebook.api.async_graph",
+        "pyfacebook.api.async_client",
+        "httpx",
+        "asyncio",
+    ]:
+        assert module not in result["modules"]
+
+
+def test_import_model():
+    result = imported_modules("from pyfacebook.models import Post")
+    assert "pyfacebook.models.post" in result["modules"]
+    for module in ["pyfacebook.models.ig_business_models", "requests"]:
+        assert module not in result["modules"]
+
+
+def test_lazy_attributes():
+    assert "GraphAPI" in dir(pyfacebook)
+    assert "Post" in pyfacebook.__all__
+    assert pyfacebook.Post is pyfacebook.models.post.Post
+    assert pyfacebook.GraphAPI is pyfacebook.api.graph.GraphAPI
+    with pytest.raises(AttributeError):
+        pyfacebook.NotExists
@@ -2,8 +2,20 @@
 models tests
 """
 
+import dataclasses
+import glob
+import importlib
+import json
+import pickle
+import pkgutil
+
+import pytest
+from dataclasses_json import DataClassJsonMixin
+
 import pyfacebook.models as md
+from pyfacebook.models import encoder
 from pyfacebook.models.base import dict_minus_none_values
+from pyfacebook.models.decoder import SHARED_KEYS_MAX, compile_decoder, decode
 
 
 def test_base_model():
@@ -13,6 +25,85 @@ def test_base_model():
     assert dict_minus_none_values(None) is None
 
 
+def test_keep_json(helpers):
+    post_data = helpers.load_json("testdata/facebook/models/post.json")
+    page_data = helpers.load_json("testdata/facebook/models/page.json")
+
+    post = md.Post.new_from_json_dict(post_data)
+    assert post._json is None
+    assert "_json" not in vars(post)
+
+    post = md.Post.new_from_json_dict(post_data, keep_json=True)
+    other = md.Post.new_from_json_dict({"id": "1"}, keep_json=True)
+    assert post._json is post_data
+    assert other._json == {"id": "1"}
+    # not saved on class
+    assert md.Post._json is None
+    assert post == md.Post.new_from_json_dict(post_data)
+
+    md.Page.keep_json = True
+    try:
+        assert md.Page.new_from_json_dict(page_data)._json is page_data
+        assert md.Page.new_from_json_dict(page_data, keep_json=False)._json is None
+        assert md.Post.new_from_json_dict(post_data)._json is None
+    finally:
+        del md.Page.keep_json
+
+
+def test_compact(helpers):
+    post_data = helpers.load_json("testdata/facebook/models/post.json")
+
+    post = md.Post.new_from_json_dict(post_data)
+    compact_post = md.Post.new_from_json_dict(post_data, compact=True)
+    assert len(vars(compact_post)) < len(vars(post))
+    assert compact_post.to_dict() == post.to_dict()
+    assert repr(compact_post) == repr(post)
+    assert compact_post.reactions.summary.total_count == 8878
+    assert compact_post.backdated_time is None
+    compact_post.backdated_time = "2021-07-04T19:50:58+0000"
+    assert compact_post.backdated_time == "2021-07-04T19:50:58+0000"
+    assert md.Post.backdated_time is None
+
+    md.Post.compact = True
+    try:
+        post = md.Post.new_from_json_dict(post_data)
+        assert vars(post) == vars(md.Post.new_from_json_dict(post_data, compact=True))
+    finally:
+        del md.Post.compact
+
+
+def test_lazy(helpers):
+    data = helpers.load_json("testdata/facebook/apidata/posts/feed_fields_p1.json")
+
+    feed = md.FeedResponse.new_from_json_dict(data)
+    lazy_feed = md.FeedResponse.new_from_json_dict(data, lazy=True)
+    assert "data" not in vars(lazy_feed)
+    assert set(vars(lazy_feed)["_pending"].values) == {"data", "paging"}
+
+    post = lazy_feed.data[0]
+    assert lazy_feed.data is vars(lazy_feed)["data"]
+    assert set(vars(lazy_feed)["_pending"].values) == {"paging"}
+    assert post.id == feed.data[0].id
+    assert post.to_dict() == feed.data[0].to_dict()
+    assert lazy_feed.to_dict() == feed.to_dict()
+    assert not vars(lazy_feed)["_pending"].values
+
+    lazy_feed = md.FeedResponse.new_from_json_dict(data, lazy=True, compact=True)
+    assert pickle.loads(pickle.dumps(lazy_feed)).to_dict() == feed.to_dict()
+    assert md.FeedResponse.data is None
+
+    # another thread decoded the field after this one found it not saved.
+    lazy_feed = md.FeedResponse.new_from_json_dict(data, lazy=True)
+    paging = lazy_feed.paging
+    assert vars(md.FeedResponse)["paging"].__get__(lazy_feed) is paging
+
+    md.FeedResponse.lazy = True
+    try:
+        assert "_pending" in vars(md.FeedResponse.new_from_json_dict(data))
+    finally:
+        del md.FeedResponse.lazy
+
+
 def test_user(helpers):
     user_data = helpers.load_json("testdata/facebook/models/user.json")
 
@@ -189,3 +280,124 @@ def test_ig_bus_insight(helpers):
     insight = md.IgBusInsight.new_from_json_dict(data)
     assert insight.name == "impressions"
     assert insight.values[0].value == 32
+
+
+def all_models():
+    # models are imported lazily, import all modules to find subclasses.
+    for module in pkgutil.iter_modules(md.__path__):
+        importlib.import_module(f"pyfacebook.models.{module.name}")
+    models, classes = [], [md.BaseModel]
+    while classes:
+        cls = classes.pop()
+        for sub in cls.__subclasses__():
+            if sub not in models:
+                models.append(sub)
+                classes.append(sub)
+    return models
+
+
+def assert_same(left, right, compact=False, lazy=False):
+    assert type(left) is type(right)
+    if isinstance(left, md.BaseModel):
+        if lazy:
+            pass
+        elif compact and len(dataclasses.fields(left)) <= SHARED_KEYS_MAX:
+            # all fields saved in order to share keys with other instances.
+            assert list(vars(left)) == [f.name for f in dataclasses.fields(left)]
+        elif compact:
+            assert None not in vars(left).values()
+        else:
+            assert list(vars(left)) == list(vars(right))
+        for f in dataclasses.fields(left):
+            assert_same(getattr(left, f.name), getattr(right, f.name), compact, lazy)
+    elif isinstance(left, (list, dict)):
+        assert left == right
+        items = left.values() if isinstance(left, dict) else left
+        others = right.values() if isinstance(right, dict) else right
+        for item, other in zip(items, others):
+            assert_same(item, other, compact, lazy)
+    else:
+        assert left == right
+
+
+def load_samples(helpers):
+    samples = [
+        {},
+        {"id": 123, "name": None, "data": [{"id": "1"}, "wrong"], "paging": "wrong"},
+        {"id": "1", "from": {"id": "2"}, "_from": {"id": "3"}},
+        {"value": {"a": 1}, "values": [{"value": 1}], "count": "1"},
+        {"is_verified": 1, "length": 10, "data": None},
+    ]
+    for filename in glob.glob("testdata/*/models/*.json"):
+        data = helpers.load_json(filename)
+        if isinstance(data, dict):
+            samples.append(data)
+            if isinstance(data.get("data"), list):
+                samples.extend(i for i in data["data"] if isinstance(i, dict))
+    return samples
+
+
+def test_decoder(helpers):
+    samples = load_samples(helpers)
+    models = all_models()
+    assert len(models) > 100
+    assert all(compile_decoder(model) is not None for model in models)
+    for model in models:
+        for data in samples:
+            try:
+                expected = model.from_dict(data)
+            except Exception as e:
+                with pytest.raises(type(e)):
+                    decode(model, data)
+            else:
+                assert_same(decode(model, data), expected)
+                assert_same(decode(model, data, compact=True), expected, True)
+                assert_same(decode(model, data, lazy=True), expected, lazy=True)
+
+
+def strip_none(value):
+    if isinstance(value, dict):
+        return {k: strip_none(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [strip_none(v) for v in value]
+    return value
+
+
+def test_encoder(helpers, monkeypatch):
+    samples = load_samples(helpers)
+    for model in all_models():
+        for data in samples:
+            try:
+                obj = decode(model, data)
+            except Exception:
+                continue
+            expected = DataClassJsonMixin.to_dict(obj)
+            assert obj.to_dict(ignore_nan=False) == expected
+            assert obj.to_dict() == strip_none(expected)
+            assert (
+                decode(model, data, lazy=True, compact=True).to_dict() == obj.to_dict()
+            )
+            assert json.loads(obj.to_json()) == json.loads(json.dumps(obj.to_dict()))
+
+    post_data = helpers.load_json("testdata/facebook/models/post.json")
+    post = md.Post.new_from_json_dict(post_data)
+    data = post.to_dict()
+    assert json.loads(post.to_json()) == data
+    assert json.loads(post.to_json(ignore_nan=False)) == post.to_dict(ignore_nan=False)
+    assert post.to_json(indent=2).startswith("{\n")
+    assert json.loads(post.to_bytes().decode("utf-8")) == data
+    assert len(post.to_bytes()) < len(post.to_json().encode("utf-8"))
+    # encoded during the json walk, the whole dict is not built.
+    monkeypatch.setattr(encoder, "to_dict", None)
+    assert json.loads(post.to_json()) == data
+    assert json.loads(post.to_bytes()) == data
+    monkeypatch.undo()
+    # values are copied
+    data["reactions"]["summary"]["total_count"] = 0
+    data["comments"]["changed"] = True
+    assert post.reactions.summary.total_count == 8878
+    assert "changed" not in post.comments
+
+    assert dict_minus_none_values(
+        {"a": None, "b": ["x", None, {"c": None}], "d": ("y",)}
+    ) == {"b": ["x", None, {}], "d": ("y",)}
@@ -1,5 +1,16 @@
+import threading
+import time
+
+import pytest
 from requests.models import CaseInsensitiveDict
-from pyfacebook import RateLimit, PercentSecond
+
+from pyfacebook import (
+    RateLimit,
+    PercentSecond,
+    RateLimitScheduler,
+    RateLimitError,
+    LibraryError,
+)
 
 
 def test_parse_headers():
@@ -53,3 +64,129 @@ def test_ad_account_limit():
     r.set_limit(headers)
 
     assert r.get_limit(ad_account_limit=True).acc_id_util_pct == 9.67
+
+
+def test_snapshot():
+    r = RateLimit()
+    headers = CaseInsensitiveDict(
+        {
+            "x-app-usage": '{"call_count":16,"total_cputime":15,"total_time":12}',
+            "x-business-use-case-usage": '{"112130216863063":[{"type":"pages","call_count":1,"total_cputime":1,"total_time":1}]}',
+        }
+    )
+    r.set_limit(headers)
+    snapshot = r.snapshot()
+
+    headers = CaseInsensitiveDict(
+        {
+            "x-app-usage": '{"call_count":50,"total_cputime":15,"total_time":12}',
+            "x-business-use-case-usage": '{"112130216863063":[{"type":"instagram","call_count":5,"total_cputime":1,"total_time":1}]}',
+        }
+    )
+    r.set_limit(headers)
+
+    # old snapshot not changed.
+    assert snapshot["app"].call_count == 16
+    assert list(snapshot["business"]["112130216863063"].keys()) == ["pages"]
+    assert r.get_limit().call_count == 50
+    assert r.get_limit("112130216863063", "pages").call_count == 1
+    assert r.get_limit("112130216863063", "instagram").call_count == 5
+    assert r.get_limit("123", "pages").call_count == 0
+    assert "123" not in r.snapshot()["business"]
+
+
+def test_scheduler():
+    with pytest.raises(LibraryError):
+        RateLimitScheduler(policy="wait")
+
+    scheduler = RateLimitScheduler()
+    assert scheduler.predict_wait() == 0
+    assert scheduler.acquire() == 0
+
+    scheduler.delay(0.1)
+    scheduler.delay(0.05)  # shorter delay not change.
+    assert 0.05 < scheduler.predict_wait() <= 0.1
+    assert scheduler.acquire() >= 0.05
+    assert scheduler.predict_wait() == 0
+
+    # delay for key
+    scheduler.delay(10, key="112130216863063")
+    assert scheduler.predict_wait() == 0
+    assert scheduler.predict_wait(key="112130216863063") > 9
+
+    with scheduler.deadline(1):
+        with pytest.raises(RateLimitError) as ex:
+            scheduler.acquire(key="112130216863063")
+        assert ex.value.wait_seconds > 9
+
+    # keys wait for the owner.
+    scheduler.set_owner("media", "112130216863063")
+    assert scheduler.get_owner("media") == "112130216863063"
+    assert scheduler.predict_wait(key="media") > 9
+    assert scheduler.predict_wait(key="other") == 0
+
+    scheduler.reset()
+    assert scheduler.predict_wait(key="112130216863063") == 0
+
+    # expired delays are removed.
+    scheduler.delay(0.01, key="expired")
+    time.sleep(0.02)
+    scheduler.delay(10, key="new")
+    assert set(scheduler._next_times) == {"new"}
+
+    scheduler = RateLimitScheduler()
+    scheduler.MAX_OWNERS = 2
+    for key in ["a", "b", "c"]:
+        scheduler.set_owner(key, "owner")
+    assert scheduler.get_owner("a") is None
+    assert scheduler.get_owner("c") == "owner"
+
+    scheduler = RateLimitScheduler(max_wait=1)
+    scheduler.delay(10)
+    with pytest.raises(RateLimitError):
+        scheduler.acquire()
+
+    scheduler = RateLimitScheduler(policy="raise")
+    scheduler.delay(10)
+    with pytest.raises(RateLimitError) as ex:
+        scheduler.acquire()
+    assert ex.value.wait_seconds > 9
+
+
+def test_scheduler_cancel():
+    scheduler = RateLimitScheduler()
+    scheduler.delay(30)
+    timer = threading.Timer(0.05, scheduler.cancel)
+    timer.start()
+    with pytest.raises(RateLimitError):
+        scheduler.acquire()
+    timer.join()
+    # later requests raise too, until reset.
+    with pytest.raises(RateLimitError):
+        scheduler.acquire(key="any")
+    scheduler.reset()
+    assert scheduler.acquire() == 0
+
+
+def test_business_sleep_seconds():
+    headers = CaseInsensitiveDict(
+        {
+            "x-app-usage": '{"call_count":10,"total_cputime":15,"total_time":12}',
+            "x-business-use-case-usage": '{"112130216863063":[{"type":"pages","call_count":95,"total_cputime":1,"total_time":1,"estimated_time_to_regain_access":0},{"type":"instagram","call_count":100,"total_cputime":1,"total_time":1,"estimated_time_to_regain_access":5}],"222":[{"type":"pages","call_count":1,"total_cputime":1,"total_time":1,"estimated_time_to_regain_access":0}]}',
+        }
+    )
+    r = RateLimit()
+    assert r.set_limit(headers) == ["112130216863063", "222"]
+    assert r.set_limit(CaseInsensitiveDict()) == []
+
+    assert r.get_max_percent() == 15
+    assert r.get_max_percent(object_id="112130216863063") == 100
+    assert r.get_max_percent(object_id="333") == 0
+    assert r.get_regain_seconds(object_id="112130216863063") == 300
+    assert r.get_regain_seconds(object_id="222") == 0
+
+    mapping = [PercentSecond(50, 0), PercentSecond(100, 60)]
+    assert r.get_sleep_seconds(sleep_data=mapping) == 0
+    assert r.get_sleep_seconds(sleep_data=mapping, object_id="222") == 0
+    assert r.get_sleep_seconds(sleep_data=mapping, object_id="112130216863063") == 300
+    assert r.get_sleep_seconds(object_id="112130216863063") == 300
@@ -0,0 +1,228 @@
+import multiprocessing
+import time
+
+import pytest
+import responses
+from requests.models import CaseInsensitiveDict
+
+from pyfacebook import (
+    GraphAPI,
+    RateLimit,
+    MemoryRateLimitStore,
+    FileRateLimitStore,
+    RedisRateLimitStore,
+    RateLimitScheduler,
+    RateLimitError,
+    LibraryError,
+)
+
+APP_HEADERS = CaseInsensitiveDict(
+    {"x-app-usage": '{"call_count":91,"total_cputime":15,"total_time":12}'}
+)
+BUSINESS_HEADERS = CaseInsensitiveDict(
+    {
+        "x-business-use-case-usage": '{"112130216863063":[{"type":"pages","call_count":80,"total_cputime":1,"total_time":1,"estimated_time_to_regain_access":0}]}'
+    }
+)
+
+
+class FakeRedis:
+    """Stand-in for redis client, values are bytes like redis."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttl = {}
+
+    def hset(self, name, mapping):
+        hash_data = self.data.setdefault(name, {})
+        for key, value in mapping.items():
+            hash_data[key.encode()] = value.encode()
+        return len(mapping)
+
+    def hgetall(self, name):
+        return dict(self.data.get(name, {}))
+
+    def hdel(self, name, *keys):
+        hash_data = self.data.get(name, {})
+        return sum(hash_data.pop(key.encode(), None) is not None for key in keys)
+
+    def expire(self, name, seconds):
+        self.ttl[name] = seconds
+
+
+class BrokenStore(MemoryRateLimitStore):
+    def update(self, usage):
+        raise OSError("disk full")
+
+    def load(self):
+        raise OSError("disk full")
+
+
+def check_shared(store_a, store_b):
+    worker_a, worker_b = RateLimit(store=store_a), RateLimit(store=store_b)
+    worker_a.set_limit(APP_HEADERS)
+    worker_b.set_limit(BUSINESS_HEADERS)
+
+    # usage from worker a is also seen by worker b.
+    assert worker_b.get_max_percent() == 91
+    assert worker_b.get_max_percent(object_id="112130216863063") == 80
+    assert worker_a.get_max_percent(object_id="112130216863063") == 0
+    worker_a.refresh()
+    assert worker_a.get_max_percent(object_id="112130216863063") == 80
+
+
+def check_expire(store):
+    old = {"call_count": 90, "observed_at": time.time() - 3601}
+    store.update({"business:1:pages": old, "business:2:pages": {"call_count": 90}})
+    usage = store.update({"app": {"call_count": 10, "observed_at": time.time()}})
+    # usage without observed time is kept.
+    assert set(usage) == {"app", "business:2:pages"}
+    assert set(store.load()) == {"app", "business:2:pages"}
+
+
+def test_memory_store():
+    store = MemoryRateLimitStore()
+    check_shared(store, store)
+    check_expire(MemoryRateLimitStore())
+
+    r = RateLimit()
+    assert isinstance(r.store, MemoryRateLimitStore)
+    r.set_limit(APP_HEADERS)
+    app_limit = r.get_limit()
+    r.set_limit(BUSINESS_HEADERS)
+    # header not changed is reused.
+    assert r.get_limit() is app_limit
+
+
+def _update_in_process(path):
+    store = FileRateLimitStore(path)
+    RateLimit(store=store).set_limit(BUSINESS_HEADERS)
+    store.close()
+
+
+def test_file_store(tmp_path):
+    path = str(tmp_path / "rate_limit")
+    store_a, store_b = FileRateLimitStore(path), FileRateLimitStore(path)
+    check_shared(store_a, store_b)
+    store_a.close()
+    store_b.close()
+
+    store = FileRateLimitStore(str(tmp_path / "rate_limit_expire"))
+    check_expire(store)
+    store.close()
+
+    path = str(tmp_path / "rate_limit_process")
+    store = FileRateLimitStore(path)
+    r = RateLimit(store=store)
+    r.set_limit(APP_HEADERS)
+    process = multiprocessing.get_context("spawn").Process(
+        target=_update_in_process, args=(path,)
+    )
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+    r.refresh()
+    assert r.get_max_percent() == 91
+    assert r.get_max_percent(object_id="112130216863063") == 80
+
+    # data too large.
+    store = FileRateLimitStore(str(tmp_path / "small"), size=32)
+    with pytest.raises(LibraryError):
+        store.update({"app": {"call_count": 10, "total_cputime": 1, "total_time": 1}})
+
+
+def test_redis_store():
+    client = FakeRedis()
+    store_a = RedisRateLimitStore(client)
+    store_b = RedisRateLimitStore(client)
+    check_shared(store_a, store_b)
+    assert client.ttl["pyfacebook:rate_limit"] == 3600
+    assert store_a.update({}) == store_b.load()
+
+    check_expire(RedisRateLimitStore(FakeRedis()))
+
+
+def test_store_error(caplog):
+    r = RateLimit(store=BrokenStore())
+    # the usage is kept for the instance.
+    assert r.set_limit(APP_HEADERS) == []
+    assert r.set_limit(BUSINESS_HEADERS) == ["112130216863063"]
+    assert r.get_max_percent() == 91
+    assert r.get_max_percent(object_id="112130216863063") == 80
+    assert not r.refresh()
+    assert r.get_max_percent() == 91
+    assert "Exception in save rate limit usage" in caplog.text
+    assert "Exception in load rate limit usage" in caplog.text
+
+
+def test_api_with_store():
+    store = MemoryRateLimitStore()
+    api = GraphAPI(access_token="token", rate_limit_store=store)
+    assert api.rate_limit.store is store
+
+    # usage from other workers throttles the requests after refreshed.
+    scheduler = RateLimitScheduler(policy="raise")
+    worker = GraphAPI(
+        access_token="token",
+        sleep_seconds_mapping={50: 0, 90: 30},
+        rate_limit_store=store,
+        scheduler=scheduler,
+    )
+    other = RateLimit(store=store)
+    other.set_limit(BUSINESS_HEADERS)
+    worker.scheduler.set_owner("media", "112130216863063")
+    with pytest.raises(RateLimitError) as ex:
+        worker.get_object(object_id="media")
+    assert 29 < ex.value.wait_seconds <= 30
+    assert worker.rate_limit.get_max_percent(object_id="112130216863063") == 80
+    assert scheduler.predict_wait() == 0
+
+    # loaded once in the refresh interval.
+    other.set_limit(APP_HEADERS)
+    assert not worker.rate_limit.refresh_if_stale()
+    worker.rate_limit.refresh_interval = 0
+    with pytest.raises(RateLimitError) as ex:
+        worker.get_object(object_id="20531316728")
+    assert ex.value.wait_seconds > 590
+    assert not RateLimit().refresh_if_stale()
+
+
+@responses.activate
+def test_api_with_stale_store():
+    store = MemoryRateLimitStore()
+    business_id = "112130216863063"
+    usage = {
+        "type": "pages",
+        "call_count": 100,
+        "estimated_time_to_regain_access": 1,
+    }
+    store.update(
+        {f"business:{business_id}:pages": {**usage, "observed_at": time.time() - 30}}
+    )
+    worker = GraphAPI(
+        access_token="token",
+        rate_limit_store=store,
+        scheduler=RateLimitScheduler(policy="raise"),
+    )
+    worker.rate_limit.refresh_interval = 0
+    # time passed since observed is excluded.
+    with pytest.raises(RateLimitError) as ex:
+        worker.get_object(object_id=business_id)
+    assert 25 < ex.value.wait_seconds <= 30
+
+    # usage not changed in store, not delay again.
+    worker.scheduler.reset()
+    responses.add(
+        method=responses.GET,
+        url=f"https://graph.facebook.com/{worker.version}/{business_id}",
+        json={"id": business_id},
+    )
+    assert worker.get_object(object_id=business_id)["id"] == business_id
+
+    # regain access after observed long ago.
+    worker.scheduler.reset()
+    store.update(
+        {f"business:{business_id}:pages": {**usage, "observed_at": time.time() - 60}}
+    )
+    assert worker.get_object(object_id=business_id)["id"] == business_id
+    assert worker.rate_limit.get_regain_seconds(object_id=business_id) == 0
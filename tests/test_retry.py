@@ -0,0 +1,140 @@
+import pytest
+import requests
+import responses
+
+from pyfacebook import (
+    GraphAPI,
+    FacebookError,
+    RetryPolicy,
+    RetryBudget,
+)
+
+
+def graph_error(code, **kwargs):
+    return FacebookError({"error": {"message": "error", "code": code, **kwargs}})
+
+
+def test_is_transient():
+    policy = RetryPolicy()
+    for code in [1, 2, 4, 17, 32, 341, 613]:
+        assert policy.is_transient(graph_error(code))
+    for code in [100, 190, 200, 10]:
+        assert not policy.is_transient(graph_error(code))
+    assert policy.is_transient(graph_error(10, is_transient=True))
+    assert policy.is_transient(requests.ConnectionError("Wrong"))
+    assert not policy.is_transient(ValueError("Wrong"))
+
+
+def test_get_wait():
+    retries = []
+    policy = RetryPolicy(
+        max_retries=2,
+        backoff_factor=1,
+        jitter=False,
+        on_retry=lambda n, err, wait: retries.append((n, wait)),
+    )
+    assert policy.get_wait("GET", 0, None) is None
+    assert policy.get_wait("POST", 0, graph_error(2)) is None
+    assert policy.get_wait("GET", 0, graph_error(190)) is None
+    assert policy.get_wait("GET", 0, graph_error(2)) == 1
+    assert policy.get_wait("GET", 1, graph_error(613)) == 2
+    assert policy.get_wait("GET", 2, graph_error(613)) is None
+    # regain access
+    assert policy.get_wait("GET", 0, graph_error(4), regain_seconds=120) == 120
+    assert policy.get_wait("GET", 0, graph_error(4), regain_seconds=1800) is None
+    assert retries == [(1, 1), (2, 2), (1, 120)]
+
+    metrics = policy.metrics
+    assert metrics.retries == 3
+    assert metrics.gave_up == 2
+    assert metrics.wait_seconds == 123
+    assert metrics.retries_by_code == {"2": 1, "613": 1, "4": 1}
+
+    policy = RetryPolicy(backoff_factor=10, max_backoff=20)
+    for retries in range(5):
+        assert 0 <= policy.backoff(retries) <= 20
+
+    policy = RetryPolicy(allowed_methods=["get", "post"])
+    assert policy.get_wait("POST", 0, graph_error(2)) is not None
+
+
+def test_budget():
+    budget = RetryBudget(ratio=0.5, min_tokens=1)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+    policy = RetryPolicy(budget=RetryBudget(ratio=0, min_tokens=1))
+    assert policy.get_wait("GET", 0, graph_error(2)) is not None
+    assert policy.get_wait("GET", 0, graph_error(2)) is None
+    assert policy.metrics.budget_exhausted == 1
+
+
+def test_api_retry(helpers):
+    policy = RetryPolicy(backoff_factor=0)
+    api = GraphAPI(access_token="token", retry_policy=policy)
+    url = f"https://graph.facebook.com/{api.version}/20531316728"
+    transient = {"error": {"message": "An unknown error occurred", "code": 1}}
+
+    with responses.RequestsMock() as m:
+        m.add(method=responses.GET, url=url, json=transient, status=500)
+        m.add(method=responses.GET, url=url, body=requests.ConnectionError("Wrong"))
+        m.add(
+            method=responses.GET,
+            url=url,
+            json=helpers.load_json("testdata/base/object_default.json"),
+        )
+        assert api.get_object(object_id="20531316728")["id"] == "20531316728"
+        assert len(m.calls) == 3
+    assert policy.metrics.retries_by_code == {"1": 1, "connection": 1}
+
+    # permanent error
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=url,
+            json={"error": {"message": "Invalid OAuth access token.", "code": 190}},
+            status=400,
+        )
+        with pytest.raises(FacebookError):
+            api.get_object(object_id="20531316728")
+        assert len(m.calls) == 1
+
+    # post not retried.
+    with responses.RequestsMock() as m:
+        m.add(method=responses.POST, url=url, json=transient, status=500)
+        with pytest.raises(FacebookError):
+            api.post_object(object_id="20531316728", data={"message": "message"})
+        assert len(m.calls) == 1
+
+    # retries exhausted
+    with responses.RequestsMock() as m:
+        m.add(method=responses.GET, url=url, body=requests.ConnectionError("Wrong"))
+        with pytest.raises(requests.ConnectionError):
+            api.get_object(object_id="20531316728")
+        assert len(m.calls) == policy.max_retries + 1
+
+
+def test_api_retry_regain_access():
+    api = GraphAPI(
+        access_token="token",
+        retry_policy=RetryPolicy(backoff_factor=0),
+        sleep_on_rate_limit=False,
+    )
+    url = f"https://graph.facebook.com/{api.version}/19292868552"
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=url,
+            json={"error": {"message": "Application request limit reached", "code": 4}},
+            status=400,
+            headers={
+                "x-business-use-case-usage": '{"19292868552":[{"type":"pages","call_count":100,"total_cputime":1,"total_time":1,"estimated_time_to_regain_access":30}]}'
+            },
+        )
+        # need wait 30 minutes, not retry.
+        with pytest.raises(FacebookError):
+            api.get_object(object_id="19292868552")
+        assert len(m.calls) == 1
@@ -0,0 +1,168 @@
+"""
+tests for token cache.
+"""
+
+import dataclasses
+import time
+
+import pytest
+import responses
+
+from pyfacebook import FacebookError, LibraryError, TokenCache, TokenInfo
+
+
+def debug_data(expires_at: int, is_valid: bool = True, type_: str = "USER") -> dict:
+    return {
+        "data": {
+            "app_id": "123456",
+            "type": type_,
+            "expires_at": expires_at,
+            "data_access_expires_at": expires_at,
+            "is_valid": is_valid,
+            "scopes": ["pages_show_list", "public_profile"],
+            "user_id": "userId",
+        }
+    }
+
+
+def test_token_info(helpers):
+    info = TokenInfo.from_debug_data(
+        token="token",
+        data=helpers.load_json("testdata/base/token_info.json"),
+        checked_at=100,
+    )
+    assert info.is_valid
+    assert info.type == "USER"
+    assert info.expires_at == 1577347200
+    assert info.data_access_expires_at == 1585040349
+    assert info.expires_in(now=1577347100) == 100
+    assert info.has_scopes(["email", "manage_pages"])
+    assert not info.has_scopes(["email", "ads_read"])
+    assert TokenInfo(token="token").expires_in() is None
+
+
+def test_get(pubg_api):
+    now = int(time.time())
+    cache = TokenCache(pubg_api, app_token="app token", ttl=3600)
+    url = f"https://graph.facebook.com/{pubg_api.version}/debug_token"
+
+    with responses.RequestsMock() as m:
+        m.add(method=responses.GET, url=url, json=debug_data(now + 86400))
+        info = cache.get("user token")
+        assert info.expires_at == now + 86400
+        # served from cache.
+        assert cache.get("user token") is info
+        assert cache.check("user token", scopes=["pages_show_list"]) is info
+        assert len(m.calls) == 1
+        assert "input_token=user+token" in m.calls[0].request.url
+        assert "access_token=app+token" in m.calls[0].request.url
+
+        with pytest.raises(LibraryError):
+            cache.check("user token", scopes=["ads_read"])
+
+        # stale after ttl.
+        assert cache.is_fresh(info, now=now + 3000)
+        assert not cache.is_fresh(info, now=info.checked_at + 3600)
+        # check once near expiry.
+        near = dataclasses.replace(info, checked_at=now + 86000)
+        assert cache.is_fresh(near, now=now + 86100)
+        assert not cache.is_fresh(info, now=now + 86000)
+
+        cache.get("user token", force=True)
+        assert len(m.calls) == 2
+
+        cache.invalidate("user token")
+        assert "user token" not in cache
+
+    with responses.RequestsMock() as m:
+        m.add(method=responses.GET, url=url, json=debug_data(now - 10))
+        with pytest.raises(LibraryError):
+            cache.check("expired token")
+        m.add(method=responses.GET, url=url, json=debug_data(0, is_valid=False))
+        with pytest.raises(LibraryError):
+            cache.check("invalid token")
+
+
+def test_refresh(helpers, pubg_api):
+    now = int(time.time())
+    refreshed = []
+    cache = TokenCache(
+        pubg_api,
+        refresh_before=86400 * 7,
+        on_refresh=lambda old, new: refreshed.append((old, new.token)),
+    )
+    debug_url = f"https://graph.facebook.com/{pubg_api.version}/debug_token"
+
+    with responses.RequestsMock() as m:
+        m.add(method=responses.GET, url=debug_url, json=debug_data(now + 86400))
+        m.add(method=responses.GET, url=debug_url, json=debug_data(0, type_="PAGE"))
+        m.add(method=responses.GET, url=debug_url, json=debug_data(now + 86400 * 30))
+        cache.get("user token")
+        cache.get("page token")
+        cache.get("new user token")
+    cache._infos["stale token"] = TokenInfo(
+        token="stale token", is_valid=True, type="PAGE", checked_at=now - 7200
+    )
+
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=pubg_api.access_token_url,
+            json={"access_token": "refreshed token", "expires_in": 5184000},
+        )
+        m.add(method=responses.GET, url=debug_url, json=debug_data(0, type_="PAGE"))
+        updated = cache.refresh_due()
+        assert [info.token for info in updated] == ["refreshed token", "stale token"]
+        assert "fb_exchange_token=user+token" in m.calls[0].request.url
+
+    assert refreshed == [("user token", "refreshed token")]
+    assert "user token" not in cache
+    info = cache.get("refreshed token")
+    assert info.type == "USER"
+    assert 5183990 < info.expires_in() <= 5184000
+
+    # errors are not raised.
+    cache._infos["refreshed token"] = TokenInfo(
+        token="refreshed token", is_valid=True, expires_at=now + 100
+    )
+    with responses.RequestsMock() as m:
+        m.add(
+            method=responses.GET,
+            url=pubg_api.access_token_url,
+            json=helpers.load_json("testdata/base/error_data.json"),
+            status=400,
+        )
+        assert cache.refresh_due() == []
+    with pytest.raises(FacebookError):
+        with responses.RequestsMock() as m:
+            m.add(
+                method=responses.GET,
+                url=pubg_api.access_token_url,
+                json=helpers.load_json("testdata/base/error_data.json"),
+                status=400,
+            )
+            cache.refresh("refreshed token")
+
+
+def test_background(pubg_api):
+    now = int(time.time())
+    cache = TokenCache(pubg_api, ttl=3600)
+    cache._infos["token"] = TokenInfo(
+        token="token", is_valid=True, type="PAGE", checked_at=now - 7200
+    )
+    url = f"https://graph.facebook.com/{pubg_api.version}/debug_token"
+
+    with responses.RequestsMock() as m:
+        m.add(method=responses.GET, url=url, json=debug_data(0, type_="PAGE"))
+        cache.start(interval=0.01)
+        assert cache.running
+        # stale information is used, checked by the background thread.
+        assert cache.get("token").checked_at == now - 7200
+        for _ in range(100):
+            if cache.get("token").checked_at >= now:
+                break
+            time.sleep(0.01)
+        cache.stop()
+        assert not cache.running
+        assert cache.get("token").checked_at >= now
+        assert len(m.calls) == 1
@@ -0,0 +1,124 @@
+"""
+tests for token pool.
+"""
+
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import responses
+from requests.models import CaseInsensitiveDict
+
+from pyfacebook import GraphAPI, LibraryError, TokenPool
+
+
+def business_headers(object_id: str, call_count: int, regain: int = 0):
+    usage = f'{{"{object_id}":[{{"type":"pages","call_count":{call_count},"total_cputime":1,"total_time":1,"estimated_time_to_regain_access":{regain}}}]}}'
+    return CaseInsensitiveDict({"x-business-use-case-usage": usage})
+
+
+def test_tokens():
+    pool = TokenPool(tokens={"token1": ["page1", "page2"]}, default_token="user")
+    pool.add_token("token2", object_ids=["page2"])
+    pool.add_token("token2", object_ids=["page2", "page3"])
+    assert len(pool) == 2
+    assert "token1" in pool
+    assert pool.tokens == ["token1", "token2"]
+    assert pool.get_tokens("page2") == ("token1", "token2")
+    assert pool.get_tokens("page3") == ("token2",)
+
+    assert pool.get_token("page1") == "token1"
+    assert pool.get_token("page3") == "token2"
+    assert pool.get_token("other") == "user"
+    # common token for all objects.
+    assert pool.get_token(object_ids=["page1", "page2"]) == "token1"
+    assert pool.get_token(object_ids=["page2", "page3"]) == "token2"
+    assert pool.get_token(object_ids=["page1", "page3"]) == "user"
+    assert pool.get_token() == "user"
+
+    pool.remove_token("token2")
+    assert pool.get_tokens("page2") == ("token1",)
+    assert pool.get_tokens("page3") == ()
+    assert pool.get_token("page3") == "user"
+    pool.remove_token("unknown")
+    assert len(pool) == 1
+
+
+def test_least_loaded():
+    pool = TokenPool(tokens={"token1": ["page"], "token2": ["page"]})
+    # spread requests for tokens with same usage.
+    assert [pool.get_token("page") for _ in range(4)] == [
+        "token1",
+        "token2",
+        "token1",
+        "token2",
+    ]
+
+    assert pool.set_limit("token1", business_headers("page", 80)) == ["page"]
+    assert pool.set_limit("token2", business_headers("page", 20)) == ["page"]
+    assert pool.get_load("token1", "page") == 80
+    assert pool.get_load("token2", "page") == 20
+    assert pool.get_token("page") == "token2"
+    assert pool.get_rate_limit("token1").get_max_percent("page") == 80
+
+    # throttled token is not used.
+    pool.set_limit("token2", business_headers("page", 10, regain=5))
+    assert pool.get_load("token2", "page") == 100
+    assert pool.get_token("page") == "token1"
+
+    # usage for tokens not in pool is ignored.
+    assert pool.set_limit("unknown", business_headers("page", 10)) == []
+    assert "unknown" not in pool._rate_limits
+
+
+def test_client():
+    pool = TokenPool(tokens={"token1": ["page1"], "token2": ["page2"]})
+    api = GraphAPI(app_secret="xxxxx", token_pool=pool, sleep_on_rate_limit=False)
+    assert api.access_token is None
+
+    with responses.RequestsMock() as m:
+        for object_id in ["page1", "page2", "page1_post"]:
+            m.add(
+                method=responses.GET,
+                url=f"https://graph.facebook.com/{api.version}/{object_id}",
+                json={"id": object_id},
+                headers=dict(business_headers(object_id.split("_")[0], 30)),
+            )
+        api.get_object(object_id="page1")
+        api.get_object(object_id="page2")
+        # post of page1.
+        api.get_object(object_id="page1_post")
+        tokens = [
+            parse_qs(urlparse(call.request.url).query)["access_token"][0]
+            for call in m.calls
+        ]
+        assert tokens == ["token1", "token2", "token1"]
+    assert pool.get_load("token1", "page1") == 30
+    assert pool.get_load("token2", "page2") == 30
+    assert pool.get_load("token2", "page1") == 0
+
+    # objects not in pool use the token of client.
+    api = GraphAPI(access_token="user", token_pool=pool)
+    assert api._append_token({}, url=f"{api.version}/me")["access_token"] == "user"
+    assert api._append_token({}, url=f"{api.version}/page2")["access_token"] == "token2"
+    args = api._append_token({"access_token": "other"}, url="page2")
+    assert args["access_token"] == "other"
+
+    # objects in ids should have a common token.
+    pool.add_token("token1", object_ids=["media1"])
+    url = api.version
+    args = api._append_token({"ids": "page1,page1_post,media1"}, url=url)
+    assert args["access_token"] == "token1"
+    args = api._append_token({"ids": "page1,page2"}, url=url)
+    assert args["access_token"] == "user"
+
+    # no token for the request, and no default token.
+    api = GraphAPI(app_secret="xxxxx", token_pool=pool)
+    with pytest.raises(LibraryError) as ex:
+        api._append_token({}, url=f"{api.version}/comment1")
+    assert "No token in pool for objects comment1" in ex.value.message
+    with responses.RequestsMock():
+        with pytest.raises(LibraryError):
+            api.get_object(object_id="comment1")
+
+    with pytest.raises(LibraryError):
+        GraphAPI()
@@ -0,0 +1,65 @@
+"""
+tests for field utils
+"""
+
+import pytest
+
+from pyfacebook import LibraryError
+from pyfacebook.utils.field_utils import Field, compile_fields, _compile
+
+
+def test_field():
+    comments = Field("comments").summary(True).limit(0)
+    posts = Field("posts", "id", "message").limit(25)
+    assert str(comments) == "comments.summary(true).limit(0)"
+    assert str(posts.fields(comments, "id")) == (
+        "posts.limit(25){id,message,comments.summary(true).limit(0)}"
+    )
+    # fields are not changed.
+    assert str(posts) == "posts.limit(25){id,message}"
+
+    # modifiers are replaced or removed.
+    assert str(posts.limit(10)) == "posts.limit(10){id,message}"
+    assert str(posts.limit(None)) == "posts{id,message}"
+    assert posts.since(None) is posts
+    assert (
+        str(Field("feed").since(1577347200).until("now").after("c1").before("c2"))
+        == "feed.since(1577347200).until(now).after(c1).before(c2)"
+    )
+    assert str(Field("comments").summary("total_count")) == (
+        "comments.summary(total_count)"
+    )
+    assert str(Field("business_discovery", "id").modifier("username", "x")) == (
+        "business_discovery.username(x){id}"
+    )
+
+    # same shape, same field.
+    assert Field("posts", ["id", "message"]).limit(25) == posts
+    assert hash(Field("posts", "id", "message").limit(25)) == hash(posts)
+    assert posts != Field("posts", "message", "id").limit(25)
+    assert posts != "posts"
+    assert repr(comments) == "Field('comments.summary(true).limit(0)')"
+
+    with pytest.raises(LibraryError):
+        Field("")
+    with pytest.raises(LibraryError):
+        Field("posts", 1)
+
+
+def test_compile_fields():
+    posts = Field("posts", "id", Field("comments").summary(True).limit(0)).limit(25)
+    assert compile_fields("id", "name", posts) == (
+        "id,name,posts.limit(25){id,comments.summary(true).limit(0)}"
+    )
+    assert compile_fields(["id", ("name", "id")], posts, "name") == (
+        "id,name,posts.limit(25){id,comments.summary(true).limit(0)}"
+    )
+    assert compile_fields() == ""
+
+    # compiled once for the shape.
+    _compile.cache_clear()
+    for _ in range(3):
+        compile_fields(Field("posts", "id", Field("comments").limit(0)).limit(25))
+    info = _compile.cache_info()
+    assert info.misses == 2
+    assert info.hits == 0
@@ -0,0 +1,60 @@
+"""
+Tests for iter utils.
+"""
+
+import threading
+import time
+
+import pytest
+
+from pyfacebook.utils.iter_utils import prefetch
+
+
+def test_prefetch():
+    assert list(prefetch(iter(range(10)), depth=2)) == list(range(10))
+    assert list(prefetch(iter([]), depth=2)) == []
+
+
+def test_prefetch_bounded():
+    produced = []
+
+    def pages():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    items = prefetch(pages(), depth=2)
+    assert next(items) == 0
+    time.sleep(0.2)
+    # one consumed, two in buffer and one waiting to put.
+    assert len(produced) <= 4
+    items.close()
+
+
+def test_prefetch_close():
+    closed = threading.Event()
+
+    def pages():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    items = prefetch(pages(), depth=1)
+    assert next(items) == 0
+    items.close()
+    assert closed.wait(timeout=1)
+
+
+def test_prefetch_error():
+    def pages():
+        yield 1
+        raise ValueError("wrong")
+
+    items = prefetch(pages(), depth=1)
+    assert next(items) == 1
+    with pytest.raises(ValueError):
+        next(items)
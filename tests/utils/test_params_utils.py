@@ -5,6 +5,7 @@ tests for params utils
 import pytest
 
 from pyfacebook import LibraryError
+from pyfacebook.utils.field_utils import Field
 from pyfacebook.utils.params_utils import enf_comma_separated
 
 
@@ -13,6 +14,11 @@ def test_enf_comma_separated():
     assert enf_comma_separated("fields", ["f1", "f2"]) == "f1,f2"
     assert enf_comma_separated("fields", ["f1", "f2", "f2"]) == "f1,f2"
     assert enf_comma_separated("fields", ("f1", "f2")) == "f1,f2"
+    assert (
+        enf_comma_separated("fields", ["id", Field("posts", "id").limit(5), "id"])
+        == "id,posts.limit(5){id}"
+    )
+    assert enf_comma_separated("fields", Field("posts").limit(5)) == "posts.limit(5)"
 
     with pytest.raises(LibraryError):
         enf_comma_separated("id", 1)